@@ -4,7 +4,7 @@ import os
 from logging.config import fileConfig
 
 import dotenv
-from sqlalchemy import create_engine
+from sqlalchemy import Connection, MetaData, create_engine
 
 from alembic import context
 
@@ -67,21 +67,31 @@ def run_migrations_online() -> None:
     and associate a connection with the context.
 
     """
-    dotenv.load_dotenv()
-    url = os.getenv("DATABASE_URL", "")
-    engine = create_engine(url)
-
     # Unfortunately this is necessary given how
     # the db directory layout works. This was the easiest fix I found
     import_submodules("dicebot.data.db")
     from dicebot.data.db.base import Base
 
     target_metadata = Base.metadata
+
+    # Callers (like the migration tests) can hand us a connection to use
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        _run_migrations(connection, target_metadata)
+        return
+
+    dotenv.load_dotenv()
+    url = os.getenv("DATABASE_URL", "")
+    engine = create_engine(url)
     with engine.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
+        _run_migrations(connection, target_metadata)
+
 
-        with context.begin_transaction():
-            context.run_migrations()
+def _run_migrations(connection: Connection, target_metadata: MetaData) -> None:
+    context.configure(connection=connection, target_metadata=target_metadata)
+
+    with context.begin_transaction():
+        context.run_migrations()
 
 
 if context.is_offline_mode():
@@ -0,0 +1,86 @@
+"""Add indexes matching the hot query shapes
+
+Revision ID: 3f9c2a1d7b54
+Revises: 5e7a1b9c0d42
+Create Date: 2026-10-18 10:12:31.418277
+
+"""
+
+import sqlalchemy as sa
+
+from dicebot.data.migrations import create_index_concurrently, drop_index_concurrently
+
+# revision identifiers, used by Alembic.
+revision = "3f9c2a1d7b54"
+down_revision = "5e7a1b9c0d42"
+branch_labels = None
+depends_on = None
+
+
+# These go onto some of the busiest tables, so they're built without locking
+# out writes
+def upgrade() -> None:
+    create_index_concurrently(
+        "ix_ban_guild_bannee_until",
+        "ban",
+        ["guild_id", "bannee_id", "banned_until"],
+    )
+    create_index_concurrently(
+        "ix_ban_pending_unban",
+        "ban",
+        ["banned_until"],
+        postgresql_where=sa.text("NOT voided AND NOT acknowledged"),
+    )
+    create_index_concurrently(
+        "ix_roll_guild_user_id", "roll", ["guild_id", "discord_user_id", "id"]
+    )
+    create_index_concurrently(
+        "ix_ban_immunity_guild_user_until",
+        "ban_immunity",
+        ["guild_id", "user_id", "immune_until"],
+    )
+    create_index_concurrently(
+        "ix_reacted_message_msg_reaction",
+        "reacted_message",
+        ["msg_id", "reaction_id"],
+    )
+    create_index_concurrently(
+        "ix_pun_punchline", "pun", ["punchline"], postgresql_using="hash"
+    )
+    create_index_concurrently(
+        "ix_scheduled_event_message_id", "scheduled_event", ["message_id"]
+    )
+    create_index_concurrently(
+        "ix_custom_reaction_handler_guild_reaction",
+        "custom_reaction_handler",
+        ["guild_id", "reaction_id", "reaction_name"],
+    )
+    create_index_concurrently(
+        "ix_resolution_due_reminders",
+        "resolution",
+        ["next_reminder_at"],
+        postgresql_where=sa.text("active AND next_reminder_at IS NOT NULL"),
+    )
+    create_index_concurrently(
+        "ix_guild_events_timezone",
+        "guild",
+        ["timezone"],
+        postgresql_where=sa.text(
+            "events_probability IS NOT NULL AND events_channel_id IS NOT NULL"
+        ),
+    )
+
+
+def downgrade() -> None:
+    drop_index_concurrently("ix_guild_events_timezone", "guild")
+    drop_index_concurrently("ix_resolution_due_reminders", "resolution")
+    drop_index_concurrently(
+        "ix_custom_reaction_handler_guild_reaction", "custom_reaction_handler"
+    )
+    drop_index_concurrently("ix_scheduled_event_message_id", "scheduled_event")
+    drop_index_concurrently("ix_pun_punchline", "pun")
+    drop_index_concurrently("ix_reacted_message_msg_reaction", "reacted_message")
+    drop_index_concurrently("ix_ban_immunity_guild_user_until", "ban_immunity")
+    drop_index_concurrently("ix_roll_guild_user_id", "roll")
+    drop_index_concurrently("ix_ban_pending_unban", "ban")
+    drop_index_concurrently("ix_ban_guild_bannee_until", "ban")
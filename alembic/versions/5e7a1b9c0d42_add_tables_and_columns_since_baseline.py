@@ -0,0 +1,62 @@
+"""Add the tables, columns and constraints added to the models since the baseline
+
+Revision ID: 5e7a1b9c0d42
+Revises: 1c0d8e6f2a93
+Create Date: 2026-10-18 11:21:07.902114
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "5e7a1b9c0d42"
+down_revision = "1c0d8e6f2a93"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "youtube_video",
+        sa.Column("video_id", sa.Text(), nullable=False),
+        sa.Column("length_secs", sa.Integer(), nullable=False),
+        sa.Column(
+            "fetched_at",
+            sa.DateTime(),
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("video_id"),
+    )
+    # batch_alter_table is a plain ALTER on Postgres, and lets SQLite (which
+    # can't add constraints to an existing table) run the same migrations
+    with op.batch_alter_table("alias") as batch_op:
+        batch_op.create_unique_constraint("uq_alias_guild_key", ["guild_id", "key"])
+    with op.batch_alter_table("macro") as batch_op:
+        batch_op.create_unique_constraint("uq_macro_guild_key", ["guild_id", "key"])
+    op.add_column("ban", sa.Column("channel_id", sa.BigInteger(), nullable=True))
+    op.add_column("pun", sa.Column("setup_signature", sa.LargeBinary(), nullable=True))
+    op.add_column(
+        "pun", sa.Column("punchline_signature", sa.LargeBinary(), nullable=True)
+    )
+    op.add_column(
+        "resolution", sa.Column("next_reminder_at", sa.DateTime(), nullable=True)
+    )
+    op.add_column("resolution", sa.Column("remind_until", sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("resolution") as batch_op:
+        batch_op.drop_column("remind_until")
+        batch_op.drop_column("next_reminder_at")
+    with op.batch_alter_table("pun") as batch_op:
+        batch_op.drop_column("punchline_signature")
+        batch_op.drop_column("setup_signature")
+    with op.batch_alter_table("ban") as batch_op:
+        batch_op.drop_column("channel_id")
+    with op.batch_alter_table("macro") as batch_op:
+        batch_op.drop_constraint("uq_macro_guild_key", type_="unique")
+    with op.batch_alter_table("alias") as batch_op:
+        batch_op.drop_constraint("uq_alias_guild_key", type_="unique")
+    op.drop_table("youtube_video")
@@ -0,0 +1,30 @@
+"""Add the user_name cache for scoreboard names
+
+Revision ID: 8b2d4e6f1a37
+Revises: 3f9c2a1d7b54
+Create Date: 2026-10-18 13:41:07.215904
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "8b2d4e6f1a37"
+down_revision = "3f9c2a1d7b54"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "user_name",
+        sa.Column("user_id", sa.BigInteger(), autoincrement=False, nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("fetched_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("user_id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("user_name")
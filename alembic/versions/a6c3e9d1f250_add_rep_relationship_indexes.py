@@ -0,0 +1,34 @@
+"""Add covering indexes for the rep relationship summary
+
+Revision ID: a6c3e9d1f250
+Revises: d41f7c2e9b85
+Create Date: 2026-10-18 17:22:48.603115
+
+"""
+
+from dicebot.data.migrations import create_index_concurrently, drop_index_concurrently
+
+# revision identifiers, used by Alembic.
+revision = "a6c3e9d1f250"
+down_revision = "d41f7c2e9b85"
+branch_labels = None
+depends_on = None
+
+
+# rep only grows, so these are built without locking out writes
+def upgrade() -> None:
+    create_index_concurrently(
+        "ix_rep_guild_receiver_giver_amount",
+        "rep",
+        ["guild_id", "receiver_id", "giver_id", "amount"],
+    )
+    create_index_concurrently(
+        "ix_rep_guild_giver_receiver_amount",
+        "rep",
+        ["guild_id", "giver_id", "receiver_id", "amount"],
+    )
+
+
+def downgrade() -> None:
+    drop_index_concurrently("ix_rep_guild_giver_receiver_amount", "rep")
+    drop_index_concurrently("ix_rep_guild_receiver_giver_amount", "rep")
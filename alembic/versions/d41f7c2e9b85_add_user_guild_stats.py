@@ -0,0 +1,43 @@
+"""Add user_guild_stats running totals
+
+Revision ID: d41f7c2e9b85
+Revises: 8b2d4e6f1a37
+Create Date: 2026-10-18 15:02:44.630118
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "d41f7c2e9b85"
+down_revision = "8b2d4e6f1a37"
+branch_labels = None
+depends_on = None
+
+
+# The table starts out empty. Fill it in with `python -m dicebot.data.rebuild_stats`
+# after upgrading.
+def upgrade() -> None:
+    op.create_table(
+        "user_guild_stats",
+        sa.Column("guild_id", sa.BigInteger(), autoincrement=False, nullable=False),
+        sa.Column("user_id", sa.BigInteger(), autoincrement=False, nullable=False),
+        sa.Column("rolls", sa.BigInteger(), nullable=False),
+        sa.Column("roll_wins", sa.BigInteger(), nullable=False),
+        sa.Column("roll_losses", sa.BigInteger(), nullable=False),
+        sa.Column("roll_ones", sa.BigInteger(), nullable=False),
+        sa.Column("best_roll", sa.BigInteger(), nullable=False),
+        sa.Column("last_rolled_at", sa.DateTime(), nullable=True),
+        sa.Column("times_banned", sa.BigInteger(), nullable=False),
+        sa.Column("thanks_given", sa.BigInteger(), nullable=False),
+        sa.Column("thanks_received", sa.BigInteger(), nullable=False),
+        sa.Column("puns_caught", sa.BigInteger(), nullable=False),
+        sa.Column("rep_given", sa.BigInteger(), nullable=False),
+        sa.Column("rep_received", sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint("guild_id", "user_id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("user_guild_stats")
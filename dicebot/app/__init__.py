@@ -47,4 +47,8 @@ celery_app.conf.beat_schedule = {
         "task": "dicebot.tasks.daily_event.check_daily_event",
         "schedule": crontab(minute=0),  # every hour on the hour
     },
+    "send-resolution-reminders": {
+        "task": "dicebot.tasks.resolution_reminder.send_due_reminders",
+        "schedule": crontab(minute="*/10"),
+    },
 }
@@ -6,6 +6,11 @@ import sys
 
 from dicebot.app import engine
 from dicebot.core.client import Client
+from dicebot.core.event_cache import event_cache
+from dicebot.core.http_client import http_client
+from dicebot.core.meme_renderer import meme_renderer
+from dicebot.core.unban_scheduler import unban_scheduler
+from dicebot.core.video_lengths import video_lengths
 from dicebot.logging.colored_log_formatter import ColoredLogFormatter
 
 
@@ -18,9 +23,17 @@ async def main() -> None:
 
     # And start the client
     logging.info("Running client")
-    client = await Client.get_and_login()
-    await client.connect()
-    await engine.dispose()
+    await http_client.start()
+    try:
+        client = await Client.get_and_login()
+        await client.connect()
+    finally:
+        await unban_scheduler.stop()
+        await event_cache.stop()
+        await http_client.close()
+        video_lengths.shutdown()
+        meme_renderer.shutdown()
+        await engine.dispose()
 
 
 if __name__ == "__main__":
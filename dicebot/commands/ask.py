@@ -3,10 +3,15 @@
 import logging
 import os
 
-import aiohttp
 from discord import DMChannel, TextChannel
 
+from dicebot.core.http_client import http_client
 from dicebot.core.register_command import register_command
+from dicebot.core.response_cache import (
+    DEFAULT_RESPONSE_CACHE_TTL_SECS,
+    response_cache,
+    response_cache_key,
+)
 from dicebot.data.types.greedy_str import GreedyStr
 from dicebot.data.types.message_context import MessageContext
 
@@ -28,7 +33,11 @@ class AskOpenAI:
         secret: str | None = None,
         url: str | None = None,
         tool_ids: list[str] | None = None,
+        cache_ttl: float | None = DEFAULT_RESPONSE_CACHE_TTL_SECS,
     ) -> None:
+        """Responses are cached for `cache_ttl` seconds, keyed by the model,
+        temperature, tools and the (whitespace-normalized) messages sent.
+        Callers that want a fresh sample every time should pass None."""
         self.model = model or self._DEFAULT_MODEL
         self.max_tokens = (
             max_tokens if max_tokens is not None else self._DEFAULT_MAX_TOKENS
@@ -39,6 +48,7 @@ class AskOpenAI:
         self._secret = secret or os.getenv("OPENAI_API_KEY")
         self._url = url or self._URL
         self._tools = {"tool_ids": tool_ids or self._DEFAULT_TOOL_IDS}
+        self.cache_ttl = cache_ttl
 
     async def ask(
         self,
@@ -73,44 +83,58 @@ class AskOpenAI:
 
     async def _ask_openai(self, prompt: str, hist: list[str] | None = None) -> str:
         """Ask a question to openai... compatible endpoints"""
-        async with aiohttp.ClientSession() as session:
-            messages = []
-            if hist is not None and len(hist) > 0:
-                hist_text = "\n".join(hist)
-                messages.append(
-                    {
-                        "role": "system",
-                        "content": f"Recent channel history:\n\n{hist_text}",
-                    }
-                )
-            messages.append({"role": "user", "content": prompt})
-            async with session.post(
-                self._url,
-                headers={
-                    "Content-Type": "application/json",
-                    "Authorization": f"Bearer {self._secret}",
-                },
-                json={
-                    "messages": messages,
-                    "model": self.model,
-                    "max_tokens": self.max_tokens,
-                    "temperature": self.temperature,
+        messages = []
+        if hist is not None and len(hist) > 0:
+            hist_text = "\n".join(hist)
+            messages.append(
+                {
+                    "role": "system",
+                    "content": f"Recent channel history:\n\n{hist_text}",
                 }
-                | self._tools,
-            ) as response:
-                json_resp = await response.json()
-                logging.info(f"JSON response from model: {json_resp}")
-                if "choices" in json_resp:
-                    return json_resp["choices"][0]["message"]["content"].strip()
-                else:
-                    return json_resp["error"]["message"]
+            )
+        messages.append({"role": "user", "content": prompt})
+
+        cache_key = None
+        if self.cache_ttl is not None:
+            cache_key = response_cache_key(
+                self.model, messages, self.temperature, self._tools["tool_ids"]
+            )
+            cached = await response_cache.get(cache_key)
+            if cached is not None:
+                logging.info("Using cached response from model")
+                return cached
+
+        async with http_client.session.post(
+            self._url,
+            headers={
+                "Content-Type": "application/json",
+                "Authorization": f"Bearer {self._secret}",
+            },
+            json={
+                "messages": messages,
+                "model": self.model,
+                "max_tokens": self.max_tokens,
+                "temperature": self.temperature,
+            }
+            | self._tools,
+        ) as response:
+            json_resp = await response.json()
+            logging.info(f"JSON response from model: {json_resp}")
+            if "choices" in json_resp:
+                content = json_resp["choices"][0]["message"]["content"].strip()
+                if cache_key is not None and self.cache_ttl is not None:
+                    await response_cache.put(cache_key, content, self.cache_ttl)
+                return content
+            else:
+                return json_resp["error"]["message"]
 
 
 @register_command
 async def ask(ctx: MessageContext, prompt: GreedyStr) -> None:
     """Ask a question to openai"""
     prompt_str = prompt.unwrap()
-    asker = AskOpenAI()
+    # Answers depend on the channel history, so don't bother caching them
+    asker = AskOpenAI(cache_ttl=None)
     response = await asker.ask(
         prompt_str,
         channel=ctx.channel,
@@ -128,4 +152,10 @@ if __name__ == "__main__":
     tool_ids = tools.split(",")
     asker = AskOpenAI(tool_ids=tool_ids)
 
-    print(asyncio.run(asker.ask(prompt)))
+    async def main() -> str:
+        try:
+            return await asker.ask(prompt)
+        finally:
+            await http_client.close()
+
+    print(asyncio.run(main()))
@@ -6,11 +6,14 @@ import time
 from typing import Optional
 
 from dicebot.commands import timezone
+from dicebot.core.event_cache import event_cache
 from dicebot.core.register_command import register_command
-from dicebot.data.db.active_event import ActiveEvent, EventType
+from dicebot.core.unban_scheduler import unban_scheduler
+from dicebot.data.db.active_event import EventType
 from dicebot.data.db.ban import Ban
 from dicebot.data.db.ban_immunity import BanImmunity
 from dicebot.data.db.user import User
+from dicebot.data.db.user_guild_stats import UserGuildStats
 from dicebot.data.types.message_context import MessageContext
 from dicebot.data.types.time import Time
 from dicebot.tasks.unban import unban as unban_task
@@ -36,7 +39,7 @@ async def ban_internal(
             f"{target.as_mention()} has ban immunity until {localized}. Nice try."
         )
         return
-    active_event = await ActiveEvent.get_current(ctx.session, ctx.guild_id)
+    active_event = await event_cache.get_current(ctx.session, ctx.guild_id)
     if active_event is not None:
         if active_event.event_type_enum is EventType.DOUBLE_BAN:
             timer.seconds *= 2
@@ -88,8 +91,10 @@ async def ban_internal(
         banner_id=banner_id,
         reason=reason,
         banned_until=banned_until,
+        channel_id=ctx.channel.id,
     )
     ctx.session.add(new_ban)
+    await UserGuildStats.record_ban(ctx.session, new_ban)
     await ctx.session.commit()
 
     if current_ban is not None and current_ban.banned_until > new_ban.banned_until:
@@ -97,10 +102,11 @@ async def ban_internal(
         await ctx.send(f"Oh... you're already banned until {localized}. Wow...")
     else:
         await ctx.session.refresh(new_ban)
-        unban_task.apply_async(
-            (ctx.channel.id, ctx.guild_id, target.id, new_ban.id),
-            countdown=timer.seconds + 1,
-        )
+        if not unban_scheduler.schedule(new_ban):
+            unban_task.apply_async(
+                (ctx.channel.id, ctx.guild_id, target.id, new_ban.id),
+                countdown=timer.seconds + 1,
+            )
 
 
 @register_command
@@ -8,6 +8,7 @@ import random
 import aiohttp
 
 from dicebot.commands import ban, giffer
+from dicebot.core.http_client import http_client
 from dicebot.core.register_command import register_command
 from dicebot.data.types.greedy_str import GreedyStr
 from dicebot.data.types.message_context import MessageContext
@@ -26,23 +27,22 @@ async def _fileatask_real(ctx: MessageContext, title: str) -> None:
     user = os.getenv("GITHUB_USER", "")
     password = os.getenv("GITHUB_PASS", "")
 
-    async with aiohttp.ClientSession() as session:
-        async with session.post(
-            ISSUES_URL,
-            json={"title": title},
-            headers=headers,
-            auth=aiohttp.BasicAuth(user, password),
-        ) as r:
-            json_resp = await r.json()
-            if r.status == SUCCESS_CODE:
-                response_url = json_resp["html_url"]
-                await ctx.send(f"Your suggestion has been noted: {response_url}")
-            else:
-                logging.error(f"Request to GitHub failed: {json_resp}")
-                await ctx.send(
-                    "Something went wrong submitting the issue "
-                    f"to GitHub (status_code = {r.status})"
-                )
+    async with http_client.session.post(
+        ISSUES_URL,
+        json={"title": title},
+        headers=headers,
+        auth=aiohttp.BasicAuth(user, password),
+    ) as r:
+        json_resp = await r.json()
+        if r.status == SUCCESS_CODE:
+            response_url = json_resp["html_url"]
+            await ctx.send(f"Your suggestion has been noted: {response_url}")
+        else:
+            logging.error(f"Request to GitHub failed: {json_resp}")
+            await ctx.send(
+                "Something went wrong submitting the issue "
+                f"to GitHub (status_code = {r.status})"
+            )
 
 
 async def _ban_helper(ctx: MessageContext, ban_message: str) -> None:
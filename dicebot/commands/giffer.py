@@ -5,8 +5,7 @@ import os
 import random
 from typing import List, Optional
 
-import aiohttp
-
+from dicebot.core.http_client import http_client
 from dicebot.core.register_command import register_command
 from dicebot.data.types.greedy_str import GreedyStr
 from dicebot.data.types.message_context import MessageContext
@@ -17,6 +16,9 @@ class KlipyGifRetriever:
         self.api_key = api_key or os.getenv("KLIPY_API_KEY")
 
     async def get(self, q: str) -> List[str]:
+        if self.api_key is None:
+            logging.warning("KLIPY_API_KEY isn't set, so there are no GIFs")
+            return []
         url = f"https://api.klipy.com/api/v1/{self.api_key}/gifs/search"
         params = {
             "q": q,
@@ -26,11 +28,10 @@ class KlipyGifRetriever:
             "content_filter": "low",
         }
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, params=params) as response:
-                    json_resp = await response.json()
-                    top_gifs = json_resp["data"]["data"]
-                    return [res["file"]["hd"]["gif"]["url"] for res in top_gifs]
+            async with http_client.session.get(url, params=params) as response:
+                json_resp = await response.json()
+                top_gifs = json_resp["data"]["data"]
+                return [res["file"]["hd"]["gif"]["url"] for res in top_gifs]
         except Exception:
             return []
 
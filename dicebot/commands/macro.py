@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 
+from dicebot.core.command_table import command_tables
 from dicebot.core.register_command import register_command
 from dicebot.data.types.greedy_str import GreedyStr
 from dicebot.data.types.message_context import MessageContext
@@ -36,8 +37,8 @@ async def macro_del(ctx: MessageContext, name: str) -> None:
 @register_command
 async def m(ctx: MessageContext, name: str) -> None:
     """Retrieve the value for a saved macro in this server"""
-    macro = await ctx.guild.get_macro(ctx.session, name)
+    macro = await command_tables.resolve_macro(ctx.session, ctx.guild, name)
     if macro is not None:
-        await ctx.send(macro.value)
+        await ctx.send(macro)
     else:
         await ctx.send(f"There's no macro defined for {name}.")
@@ -1,8 +1,11 @@
 #!/usr/bin/env python3
 
+import io
+
 import discord
-from MemePy import MemeFactory, MemeGenerator
+from MemePy import MemeFactory
 
+from dicebot.core.meme_renderer import MemeRendererBusy, meme_renderer
 from dicebot.core.register_command import register_command
 from dicebot.data.types.greedy_str import GreedyStr
 from dicebot.data.types.message_context import MessageContext
@@ -30,6 +33,12 @@ async def meme(ctx: MessageContext, q: GreedyStr) -> None:
         await ctx.send(f"Unknown template '{template_str}'")
         return
 
-    image_bytes = MemeGenerator.get_meme_image_bytes(template_str, args)
+    try:
+        image_bytes = await meme_renderer.render(template_str, args)
+    except MemeRendererBusy:
+        await ctx.send("I'm still drawing the last few memes, try again in a bit")
+        return
     fmt = template.image_file_path.split(".")[-1]
-    await ctx.channel.send(file=discord.File(image_bytes, f"meme.{fmt}"), silent=True)
+    await ctx.channel.send(
+        file=discord.File(io.BytesIO(image_bytes), f"meme.{fmt}"), silent=True
+    )
@@ -53,7 +53,8 @@ async def _parse_reminder(
         user_text=text,
     )
 
-    response = await AskOpenAI().ask(prompt)
+    # The prompt has the current time in it, so it would never hit the cache
+    response = await AskOpenAI(cache_ttl=None).ask(prompt)
     try:
         data = json.loads(response)
         seconds_until = int(data["seconds_until"])
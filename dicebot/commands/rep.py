@@ -3,6 +3,7 @@
 from dicebot.core.register_command import register_command
 from dicebot.data.db.rep import Rep
 from dicebot.data.db.user import User
+from dicebot.data.db.user_guild_stats import UserGuildStats
 from dicebot.data.types.message_context import MessageContext
 
 
@@ -28,7 +29,9 @@ async def rep(ctx: MessageContext, amount: int, target: User) -> None:
         amount=amount,
     )
 
-    total = await Rep.get_total_received(ctx.session, ctx.guild_id, target.id)
+    # The running total was just bumped by Rep.give, so it's one row to read
+    stats = await UserGuildStats.get(ctx.session, ctx.guild_id, target.id)
+    total = stats.rep_received if stats is not None else 0
     await ctx.send(
         f"You gave {amount:+d} rep to {target.as_mention()}. "
         f"Their total rep is now {total:+d}."
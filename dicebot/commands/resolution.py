@@ -1,16 +1,12 @@
 #!/usr/bin/env python3
 
-import random
-
 from dicebot.commands import timezone
 from dicebot.core.register_command import register_command
 from dicebot.data.db.resolution import Resolution
 from dicebot.data.types.greedy_str import GreedyStr
 from dicebot.data.types.message_context import MessageContext
-from dicebot.tasks.resolution_reminder import remind as remind_task
 
 SUPPORTED_FREQUENCIES = ["daily", "weekly", "monthly", "quarterly", "yearly", "random"]
-SECONDS_IN_DAY = 86400
 
 
 @register_command
@@ -28,7 +24,8 @@ async def resolution(ctx: MessageContext, frequency: str, msg: GreedyStr) -> Non
         await ctx.send(response)
         return
 
-    resolution = Resolution(
+    # Reminders get sent by the periodic send_due_reminders task
+    resolution = Resolution.new(
         guild_id=ctx.guild_id,
         author_id=ctx.author_id,
         channel_id=ctx.channel.id,
@@ -44,33 +41,6 @@ async def resolution(ctx: MessageContext, frequency: str, msg: GreedyStr) -> Non
         f"`!delete_resolution {resolution.id}`"
     )
 
-    if frequency == "daily":
-        for i in range(1, 365 + 1):
-            seconds = SECONDS_IN_DAY * i
-            remind_task.apply_async((resolution.id,), countdown=seconds)
-    elif frequency == "weekly":
-        for i in range(1, 52 + 1):
-            seconds = SECONDS_IN_DAY * 7 * i
-            remind_task.apply_async((resolution.id,), countdown=seconds)
-    elif frequency == "monthly":
-        for i in range(1, 12 + 1):
-            # Just... assume there are 31 days in a month. Close enough.
-            seconds = SECONDS_IN_DAY * 31 * i
-            remind_task.apply_async((resolution.id,), countdown=seconds)
-    elif frequency == "quarterly":
-        for i in range(1, 4 + 1):
-            # Just... assume there are 31 days in a month. Close enough.
-            seconds = SECONDS_IN_DAY * 31 * 4 * i
-            remind_task.apply_async((resolution.id,), countdown=seconds)
-    elif frequency == "yearly":
-        seconds = SECONDS_IN_DAY * 365
-        remind_task.apply_async((resolution.id,), countdown=seconds)
-    elif frequency == "random":
-        # Just pick 10 random days to send the reminder
-        for i in range(10):
-            seconds = SECONDS_IN_DAY * random.randint(1, 365)
-            remind_task.apply_async((resolution.id,), countdown=seconds)
-
     await ctx.send(response)
 
 
@@ -105,6 +75,8 @@ async def delete_resolution(ctx: MessageContext, resolution_id: int) -> None:
         return
 
     r.active = False
+    # No reminder is queued anywhere, so this is all it takes to stop them
+    r.next_reminder_at = None
     await ctx.session.commit()
 
     localized = timezone.localize_dt(r.created_at, ctx.guild.timezone)
@@ -15,7 +15,7 @@ async def generate_roast(ctx: MessageContext, roll: int, die_size: int) -> None:
             f"who just rolled a {roll} on a d{die_size} in a Discord dice game. "
             "Be creative and mean-spirited but keep it PG-13."
         )
-        response = await AskOpenAI().ask(prompt, channel=ctx.channel)
+        response = await AskOpenAI(cache_ttl=None).ask(prompt, channel=ctx.channel)
         await ctx.send(response)
     except Exception as e:
         logging.warning(f"Failed to generate roast: {e}")
@@ -6,9 +6,11 @@ import random
 
 from dicebot.commands import ban, roast, timezone
 from dicebot.commands.admin import requires_admin
+from dicebot.core.event_cache import event_cache
 from dicebot.core.register_command import register_command
-from dicebot.data.db.active_event import ActiveEvent, EventType
+from dicebot.data.db.active_event import EventType
 from dicebot.data.db.roll import Roll
+from dicebot.data.db.user_guild_stats import UserGuildStats
 from dicebot.data.types.greedy_str import GreedyStr
 from dicebot.data.types.message_context import MessageContext
 from dicebot.data.types.time import Time
@@ -24,7 +26,7 @@ async def roll(ctx: MessageContext, num_rolls: GreedyStr) -> None:
     next_roll = ctx.guild.current_roll
     name = ctx.message.author.name
 
-    active_event = await ActiveEvent.get_current(ctx.session, ctx.guild_id)
+    active_event = await event_cache.get_current(ctx.session, ctx.guild_id)
     event_type = active_event.event_type_enum if active_event is not None else None
 
     last_roll = await Roll.get_last_roll(ctx.session, ctx.guild, ctx.author)
@@ -110,6 +112,7 @@ async def roll(ctx: MessageContext, num_rolls: GreedyStr) -> None:
             target_roll=next_roll,
         )
         ctx.session.add(roll_obj)
+        await UserGuildStats.record_roll(ctx.session, roll_obj)
         await ctx.session.commit()
 
         # Apply event modifiers
@@ -54,7 +54,8 @@ async def _parse_schedule(text: str, ctx: MessageContext) -> tuple[int, str, str
         user_text=text,
     )
 
-    response = await AskOpenAI().ask(prompt)
+    # The prompt has the current time in it, so it would never hit the cache
+    response = await AskOpenAI(cache_ttl=None).ask(prompt)
     try:
         data = json.loads(response)
         seconds_until = int(data["seconds_until"])
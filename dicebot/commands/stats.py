@@ -2,40 +2,24 @@
 
 from __future__ import annotations
 
-from typing import Optional
+import datetime
+from typing import Optional, Tuple
 
 import discord
-from sqlalchemy import case, func, select
-from sqlalchemy.ext.asyncio import AsyncSession
 
 from dicebot.commands import timezone
 from dicebot.core.register_command import register_command
 from dicebot.data.db.ban import Ban
-from dicebot.data.db.pun import Pun
-from dicebot.data.db.rep import Rep
-from dicebot.data.db.roll import Roll
-from dicebot.data.db.thanks import Thanks
+from dicebot.data.db.ban_immunity import BanImmunity
+from dicebot.data.db.rep import Rep, RepSummary
 from dicebot.data.db.user import User
+from dicebot.data.db.user_guild_stats import UserGuildStats
+from dicebot.data.db.user_name import UserName
 from dicebot.data.types.message_context import MessageContext
 
 
-async def get_roll_stats(
-    session: AsyncSession, guild, user: User
-) -> dict:
-    result = await session.execute(
-        select(
-            func.count(Roll.id).label("total"),
-            func.sum(
-                case((Roll.actual_roll >= Roll.target_roll, 1), else_=0)
-            ).label("wins"),
-            func.max(Roll.actual_roll).label("best"),
-            func.max(Roll.rolled_at).label("last_rolled_at"),
-        ).filter_by(guild_id=guild.id, discord_user_id=user.id)
-    )
-    row = result.one()
-
-    total = row.total or 0
-    if total == 0:
+def get_roll_stats(summary: Optional[UserGuildStats]) -> dict:
+    if summary is None or summary.rolls == 0:
         return {
             "total": 0,
             "wins": 0,
@@ -45,11 +29,16 @@ async def get_roll_stats(
             "last_roll": "Never",
         }
 
-    wins = row.wins or 0
+    total = summary.rolls
+    wins = summary.roll_wins
     losses = total - wins
     win_rate = f"{100 * wins / total:.1f}%"
-    best = row.best or 0
-    last_roll = row.last_rolled_at.strftime("%b %d, %Y")
+    best = summary.best_roll
+    # Nullable, and clear_stats sets it back to NULL
+    if summary.last_rolled_at is not None:
+        last_roll = summary.last_rolled_at.strftime("%b %d, %Y")
+    else:
+        last_roll = "Never"
 
     return {
         "total": total,
@@ -61,25 +50,21 @@ async def get_roll_stats(
     }
 
 
-async def get_ban_stats(
-    session: AsyncSession, guild, user: User
+def get_ban_stats(
+    guild,
+    summary: Optional[UserGuildStats],
+    latest_ban: Optional[Ban],
+    immunity: Optional[BanImmunity],
 ) -> dict:
-    result = await session.scalars(
-        select(Ban).filter_by(guild_id=guild.id, bannee_id=user.id)
-    )
-    bans = result.all()
-    times_banned = len(bans)
+    times_banned = summary.times_banned if summary is not None else 0
 
-    is_banned = await user.is_currently_banned(session, guild)
-    if is_banned:
-        latest = await Ban.get_latest_unvoided_ban(session, guild, user)
-        until_str = timezone.localize_dt(latest.banned_until, guild.timezone)
+    if latest_ban is not None and latest_ban.banned_until > datetime.datetime.now():
+        until_str = timezone.localize_dt(latest_ban.banned_until, guild.timezone)
         currently_banned = f"Yes (until {until_str})"
     else:
         currently_banned = "No"
 
-    is_immune = await user.is_currently_immune(session, guild)
-    immune = "Yes" if is_immune else "No"
+    immune = "Yes" if immunity is not None else "No"
 
     return {
         "times_banned": times_banned,
@@ -88,74 +73,32 @@ async def get_ban_stats(
     }
 
 
-async def get_social_stats(
-    session: AsyncSession, guild, user: User
-) -> dict:
-    thanks_given_result = await session.execute(
-        select(func.count()).select_from(Thanks).filter_by(
-            guild_id=guild.id, thanker_id=user.id
-        )
-    )
-    thanks_given = thanks_given_result.scalar() or 0
-
-    thanks_received_result = await session.execute(
-        select(func.count()).select_from(Thanks).filter_by(
-            guild_id=guild.id, thankee_id=user.id
-        )
-    )
-    thanks_received = thanks_received_result.scalar() or 0
-
-    puns_caught_result = await session.execute(
-        select(func.count()).select_from(Pun).filter_by(
-            guild_id=guild.id, first_poster_id=user.id
-        )
-    )
-    puns_caught = puns_caught_result.scalar() or 0
+def get_social_stats(summary: Optional[UserGuildStats]) -> dict:
+    if summary is None:
+        return {"thanks_given": 0, "thanks_received": 0, "puns_caught": 0}
 
     return {
-        "thanks_given": thanks_given,
-        "thanks_received": thanks_received,
-        "puns_caught": puns_caught,
+        "thanks_given": summary.thanks_given,
+        "thanks_received": summary.thanks_received,
+        "puns_caught": summary.puns_caught,
     }
 
 
-async def get_rep_stats(
-    session: AsyncSession, guild, user: User
-) -> dict:
-    received = await Rep.get_total_received(session, guild.id, user.id)
-    given = await Rep.get_total_given(session, guild.id, user.id)
-
-    biggest_fan_data = await Rep.get_biggest_fan(session, guild.id, user.id)
-    biggest_fan = "No one yet"
-    if biggest_fan_data is not None:
-        fan_id, fan_total = biggest_fan_data
-        biggest_fan = f"<@{fan_id}> ({fan_total:+d})"
-
-    hater_data = await Rep.get_hater(session, guild.id, user.id)
-    hater = "No haters yet"
-    if hater_data is not None:
-        hater_id, hater_total = hater_data
-        hater = f"<@{hater_id}> ({hater_total:+d})"
-
-    best_friend_data = await Rep.get_best_friend(session, guild.id, user.id)
-    best_friend = "No one yet"
-    if best_friend_data is not None:
-        friend_id, friend_total = best_friend_data
-        best_friend = f"<@{friend_id}> ({friend_total:+d})"
-
-    nemesis_data = await Rep.get_nemesis(session, guild.id, user.id)
-    nemesis = "No nemesis yet"
-    if nemesis_data is not None:
-        nemesis_id, nemesis_total = nemesis_data
-        nemesis = f"<@{nemesis_id}> ({nemesis_total:+d})"
+def _describe_rep(data: Optional[Tuple[int, int]], default: str) -> str:
+    if data is None:
+        return default
+    user_id, total = data
+    return f"<@{user_id}> ({total:+d})"
 
+
+def get_rep_stats(summary: Optional[UserGuildStats], rep: RepSummary) -> dict:
     return {
-        "received": received,
-        "given": given,
-        "biggest_fan": biggest_fan,
-        "hater": hater,
-        "best_friend": best_friend,
-        "nemesis": nemesis,
+        "received": summary.rep_received if summary is not None else 0,
+        "given": summary.rep_given if summary is not None else 0,
+        "biggest_fan": _describe_rep(rep.biggest_fan, "No one yet"),
+        "hater": _describe_rep(rep.hater, "No haters yet"),
+        "best_friend": _describe_rep(rep.best_friend, "No one yet"),
+        "nemesis": _describe_rep(rep.nemesis, "No nemesis yet"),
     }
 
 
@@ -165,20 +108,27 @@ async def stats(ctx: MessageContext, target: Optional[User] = None) -> None:
     if target is None:
         target = ctx.author
 
-    roll_stats = await get_roll_stats(ctx.session, ctx.guild, target)
-    ban_stats = await get_ban_stats(ctx.session, ctx.guild, target)
-    social_stats = await get_social_stats(ctx.session, ctx.guild, target)
-    rep_stats = await get_rep_stats(ctx.session, ctx.guild, target)
+    # None of these depend on each other, so they all run at once. The counts
+    # come from the running totals, so that part is a single row.
+    summary, latest_ban, immunity, rep = await ctx.parallel_reads().gather(
+        lambda s: UserGuildStats.get(s, ctx.guild_id, target.id),
+        lambda s: Ban.get_latest_unvoided_ban(s, ctx.guild, target),
+        lambda s: BanImmunity.get_active(s, ctx.guild, target),
+        lambda s: Rep.get_relationship_summary(s, ctx.guild_id, target.id),
+    )
+    roll_stats = get_roll_stats(summary)
+    ban_stats = get_ban_stats(ctx.guild, summary, latest_ban, immunity)
+    social_stats = get_social_stats(summary)
+    rep_stats = get_rep_stats(summary, rep)
 
     is_banned = ban_stats["currently_banned"] != "No"
     color = discord.Color.red() if is_banned else discord.Color.blue()
 
-    # Try to get a display name from the Discord guild
-    display_name = f"<@{target.id}>"
-    if ctx.discord_guild is not None:
-        member = ctx.discord_guild.get_member(target.id)
-        if member is not None:
-            display_name = member.display_name
+    # A mention still renders for users Discord won't tell us about
+    names = await UserName.resolve(
+        ctx.session, ctx.client, ctx.guild_id, [target.id], unknown_format="<@{}>"
+    )
+    display_name = names[target.id]
 
     embed = discord.Embed(
         title=f"Stats for {display_name}",
@@ -1,8 +1,9 @@
 #!/usr/bin/env python3
 
-from unittest.mock import patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 from dicebot.commands import ask
+from dicebot.core.response_cache import InMemoryResponseCache
 from dicebot.data.types.greedy_str import GreedyStr
 from dicebot.test.utils import DicebotTestCase, TestMessageContext
 
@@ -38,3 +39,45 @@ class TestAsk(DicebotTestCase):
         ):
             await ask.ask(ctx, GreedyStr("a b c"))
             ctx.quote_reply.assert_awaited_once_with(expected_response)
+
+    async def test_ask_openai_cache(self) -> None:
+        cache = InMemoryResponseCache()
+        response = MagicMock()
+        response.json = AsyncMock(
+            return_value={"choices": [{"message": {"content": " yes "}}]}
+        )
+        post = MagicMock()
+        post.return_value.__aenter__ = AsyncMock(return_value=response)
+        post.return_value.__aexit__ = AsyncMock(return_value=False)
+
+        with patch("dicebot.commands.ask.response_cache", new=cache), patch(
+            "dicebot.commands.ask.http_client"
+        ) as mock_http_client:
+            mock_http_client.session.post = post
+
+            with self.subTest("Repeated prompt is served from the cache"):
+                asker = ask.AskOpenAI(cache_ttl=60)
+                self.assertEqual("yes", await asker.ask("Is this a pun?"))
+                self.assertEqual("yes", await asker.ask("Is  this a pun?\n"))
+                post.assert_called_once()
+
+            with self.subTest("Different temperature is a different key"):
+                post.reset_mock()
+                asker = ask.AskOpenAI(temperature=0, cache_ttl=60)
+                self.assertEqual("yes", await asker.ask("Is this a pun?"))
+                post.assert_called_once()
+
+            with self.subTest("Opting out always asks"):
+                post.reset_mock()
+                asker = ask.AskOpenAI(cache_ttl=None)
+                await asker.ask("Is this a pun?")
+                await asker.ask("Is this a pun?")
+                self.assertEqual(2, post.call_count)
+
+            with self.subTest("Errors aren't cached"):
+                post.reset_mock()
+                response.json.return_value = {"error": {"message": "rate limited"}}
+                asker = ask.AskOpenAI(cache_ttl=60)
+                self.assertEqual("rate limited", await asker.ask("Another prompt"))
+                self.assertEqual("rate limited", await asker.ask("Another prompt"))
+                self.assertEqual(2, post.call_count)
@@ -15,10 +15,10 @@ from dicebot.test.utils import DicebotTestCase, TestMessageContext
 class TestBan(DicebotTestCase):
     async def asyncSetUp(self) -> None:
         await super().asyncSetUp()
-        # Patch ActiveEvent.get_current to return None (no active event) for all ban tests
+        # Patch event_cache.get_current to return None (no active event) for all ban tests
         # unless a specific test overrides it
         self._active_event_patcher = patch(
-            "dicebot.commands.ban.ActiveEvent.get_current",
+            "dicebot.commands.ban.event_cache.get_current",
             new_callable=AsyncMock,
             return_value=None,
         )
@@ -135,7 +135,7 @@ class TestBan(DicebotTestCase):
         assert "ban immunity" in call_args.args[0]
         ctx.session.add.assert_not_called()
 
-    @patch("dicebot.commands.ban.ActiveEvent.get_current", new_callable=AsyncMock)
+    @patch("dicebot.commands.ban.event_cache.get_current", new_callable=AsyncMock)
     @patch("dicebot.commands.ban.BanImmunity.get_active", autospec=True)
     @patch("dicebot.commands.ban.unban_task", autospec=True)
     @patch("dicebot.commands.ban.Ban.get_latest_unvoided_ban", autospec=True)
@@ -159,7 +159,7 @@ class TestBan(DicebotTestCase):
         # Assert — timer should have been doubled
         self.assertEqual(original_seconds * 2, timer.seconds)
 
-    @patch("dicebot.commands.ban.ActiveEvent.get_current", new_callable=AsyncMock)
+    @patch("dicebot.commands.ban.event_cache.get_current", new_callable=AsyncMock)
     @patch("dicebot.commands.ban.BanImmunity.get_active", autospec=True)
     @patch("dicebot.commands.ban.unban_task", autospec=True)
     @patch("dicebot.commands.ban.Ban.get_latest_unvoided_ban", autospec=True)
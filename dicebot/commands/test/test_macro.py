@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 
-from unittest.mock import AsyncMock, create_autospec
+from unittest.mock import AsyncMock, create_autospec, patch
 
 from dicebot.commands import macro
 from dicebot.data.db.macro import Macro
@@ -53,11 +53,12 @@ class TestMacro(DicebotTestCase):
             ctx.session.commit.assert_awaited_once()
             ctx.channel.send.assert_awaited_once()
 
-    async def test_m(self) -> None:
+    @patch("dicebot.commands.macro.command_tables.resolve_macro")
+    async def test_m(self, mock_resolve_macro: AsyncMock) -> None:
         with self.subTest("new macro"):
             # Arrange
             ctx = TestMessageContext.get()
-            ctx.guild.get_macro = AsyncMock(return_value=None)
+            mock_resolve_macro.return_value = None
             # Act
             await macro.m(ctx, "key")
             # Assert
@@ -65,9 +66,8 @@ class TestMacro(DicebotTestCase):
         with self.subTest("macro exists"):
             # Arrange
             ctx = TestMessageContext.get()
-            mock_macro = create_autospec(Macro)
-            ctx.guild.get_macro = AsyncMock(return_value=mock_macro)
+            mock_resolve_macro.return_value = "value"
             # Act
             await macro.m(ctx, "key")
             # Assert
-            ctx.channel.send.assert_awaited_once_with(mock_macro.value, silent=True)
+            ctx.channel.send.assert_awaited_once_with("value", silent=True)
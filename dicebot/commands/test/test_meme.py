@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
+
+from dicebot.core.meme_renderer import MemeRendererBusy
 
 from dicebot.commands import meme
 from dicebot.data.types.greedy_str import GreedyStr
@@ -8,40 +10,51 @@ from dicebot.test.utils import DicebotTestCase, TestMessageContext
 
 
 class TestMeme(DicebotTestCase):
-    @patch("dicebot.commands.meme.MemeGenerator")
-    async def test_meme_simple(self, mock_memegenerator) -> None:
+    @patch("dicebot.commands.meme.meme_renderer")
+    async def test_meme_simple(self, mock_renderer) -> None:
         # Arrange
         ctx = TestMessageContext.get()
+        mock_renderer.render = AsyncMock(return_value=b"png")
         expected_template = "template"
         expected_args = ["arg1", "arg2", "arg3"]
         # Act
         with patch("dicebot.commands.meme.MemeFactory"):
             await meme.meme(ctx, GreedyStr("template arg1 arg2 arg3"))
         # Assert
-        mock_memegenerator.get_meme_image_bytes.assert_called_once_with(
-            expected_template, expected_args
-        )
+        mock_renderer.render.assert_awaited_once_with(expected_template, expected_args)
+        ctx.channel.send.assert_awaited_once()
+
+    @patch("dicebot.commands.meme.meme_renderer")
+    async def test_meme_busy(self, mock_renderer) -> None:
+        # Arrange
+        ctx = TestMessageContext.get()
+        mock_renderer.render = AsyncMock(side_effect=MemeRendererBusy)
+        # Act
+        with patch("dicebot.commands.meme.MemeFactory"):
+            await meme.meme(ctx, GreedyStr("template arg1"))
+        # Assert
         ctx.channel.send.assert_awaited_once()
+        self.assertNotIn("file", ctx.channel.send.await_args.kwargs)
 
-    @patch("dicebot.commands.meme.MemeGenerator")
-    async def test_meme_list(self, mock_memegenerator) -> None:
+    @patch("dicebot.commands.meme.meme_renderer")
+    async def test_meme_list(self, mock_renderer) -> None:
         # Arrange
         ctx = TestMessageContext.get()
         # Act
         with patch("dicebot.commands.meme.MemeFactory"):
             await meme.meme(ctx, GreedyStr("list"))
         # Assert
-        mock_memegenerator.get_meme_image_bytes.assert_not_called()
+        mock_renderer.render.assert_not_called()
         ctx.channel.send.assert_awaited_once()
 
     @patch("dicebot.commands.meme.MemeFactory")
-    @patch("dicebot.commands.meme.MemeGenerator")
-    async def test_meme_unknown(self, mock_memegenerator, mock_memefactory) -> None:
+    @patch("dicebot.commands.meme.meme_renderer")
+    async def test_meme_unknown(self, mock_renderer, mock_memefactory) -> None:
         # Arrange
         ctx = TestMessageContext.get()
         mock_memefactory.MemeLib.get.return_value = None
         # Act
         await meme.meme(ctx, GreedyStr("list"))
         # Assert
-        mock_memegenerator.get_meme_image_bytes.assert_not_called()
+        mock_renderer.render.assert_not_called()
         ctx.channel.send.assert_awaited_once()
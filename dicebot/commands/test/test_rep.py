@@ -3,14 +3,14 @@
 from unittest.mock import AsyncMock, create_autospec, patch
 
 from dicebot.commands import rep as rep_cmd
-from dicebot.data.db.rep import Rep
 from dicebot.data.db.user import User
+from dicebot.data.db.user_guild_stats import UserGuildStats
 from dicebot.test.utils import DicebotTestCase, TestMessageContext
 
 
 class TestRep(DicebotTestCase):
     @patch("dicebot.commands.rep.Rep.give", new_callable=AsyncMock)
-    @patch("dicebot.commands.rep.Rep.get_total_received", new_callable=AsyncMock)
+    @patch("dicebot.commands.rep.UserGuildStats.get", new_callable=AsyncMock)
     async def test_rep_success(self, mock_total, mock_give):
         ctx = TestMessageContext.get()
         ctx.author.id = 1
@@ -18,8 +18,9 @@ class TestRep(DicebotTestCase):
         target.id = 2
         target.as_mention.return_value = "<@2>"
         mock_give.return_value = None
-        mock_total.return_value = 15
+        mock_total.return_value = UserGuildStats(rep_received=15)
         await rep_cmd.rep(ctx, 5, target)
+        mock_total.assert_awaited_once_with(ctx.session, ctx.guild_id, 2)
         mock_give.assert_awaited_once_with(
             ctx.session, guild_id=ctx.guild_id, giver_id=1, receiver_id=2, amount=5
         )
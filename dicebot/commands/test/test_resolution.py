@@ -11,29 +11,28 @@ from dicebot.test.utils import DicebotTestCase, TestMessageContext
 
 class TestResolution(DicebotTestCase):
     @patch("dicebot.commands.resolution.Resolution")
-    @patch("dicebot.commands.resolution.remind_task")
-    async def test_resolution(self, mock_remind_task, mock_resolution) -> None:
+    async def test_resolution(self, mock_resolution) -> None:
         with self.subTest("simple"):
             # Arrange
             ctx = TestMessageContext.get()
             # Act
             await resolution.resolution(ctx, "yearly", GreedyStr("my resolution"))
             # Assert
-            mock_resolution.assert_called_once()
-            mock_remind_task.apply_async.assert_called_once()
+            mock_resolution.new.assert_called_once()
+            new_kwargs = mock_resolution.new.call_args.kwargs
+            self.assertEqual("yearly", new_kwargs["frequency"])
+            ctx.session.add.assert_called_once_with(mock_resolution.new.return_value)
             ctx.session.commit.assert_awaited_once()
             ctx.session.refresh.assert_awaited_once()
             ctx.channel.send.assert_awaited_once()
         with self.subTest("invalid"):
             # Arrange
             mock_resolution.reset_mock()
-            mock_remind_task.reset_mock()
             ctx = TestMessageContext.get()
             # Act
             await resolution.resolution(ctx, "whenever", GreedyStr("my resolution"))
             # Assert
-            mock_resolution.assert_not_called()
-            mock_remind_task.apply_async.assert_not_called()
+            mock_resolution.new.assert_not_called()
             ctx.channel.send.assert_awaited_once()
 
     @patch("dicebot.commands.resolution.Resolution")
@@ -80,6 +79,7 @@ class TestResolution(DicebotTestCase):
             # Assert
             mock_resolution.get_or_none.assert_awaited_once()
             self.assertFalse(mock_res.active)
+            self.assertIsNone(mock_res.next_reminder_at)
             ctx.session.commit.assert_awaited_once()
             ctx.channel.send.assert_awaited_once()
         with self.subTest("bad resolution id"):
@@ -13,10 +13,10 @@ from dicebot.test.utils import DicebotTestCase, TestMessageContext
 class TestRoll(DicebotTestCase):
     async def asyncSetUp(self) -> None:
         await super().asyncSetUp()
-        # Patch ActiveEvent.get_current to return None (no active event) for all roll tests
+        # Patch event_cache.get_current to return None (no active event) for all roll tests
         # unless a specific test overrides it
         self._active_event_patcher = patch(
-            "dicebot.commands.roll.ActiveEvent.get_current",
+            "dicebot.commands.roll.event_cache.get_current",
             new_callable=AsyncMock,
             return_value=None,
         )
@@ -218,7 +218,7 @@ class TestRoll(DicebotTestCase):
     @patch("dicebot.commands.roll.roast", autospec=True)
     @patch("dicebot.commands.roll.Roll", autospec=True)
     @patch("dicebot.commands.roll.ban", autospec=True)
-    @patch("dicebot.commands.roll.ActiveEvent.get_current", new_callable=AsyncMock, return_value=None)
+    @patch("dicebot.commands.roll.event_cache.get_current", new_callable=AsyncMock, return_value=None)
     async def test_roll_critical_fail_calls_roast(self, mock_event, mock_ban, mock_roll, mock_roast):
         # Arrange
         ctx = TestMessageContext.get()
@@ -262,7 +262,7 @@ class TestRollEvents(DicebotTestCase):
 
     @patch("dicebot.commands.roll.Roll", autospec=True)
     @patch("dicebot.commands.roll.ban", autospec=True)
-    @patch("dicebot.commands.roll.ActiveEvent.get_current", new_callable=AsyncMock)
+    @patch("dicebot.commands.roll.event_cache.get_current", new_callable=AsyncMock)
     async def test_roll_curse_day_under_5(self, mock_get_current, mock_ban, mock_roll) -> None:
         """CURSE_DAY: roll=3 should be treated as a critical fail (ban triggered)"""
         # Arrange
@@ -281,7 +281,7 @@ class TestRollEvents(DicebotTestCase):
 
     @patch("dicebot.commands.roll.Roll", autospec=True)
     @patch("dicebot.commands.roll.ban", autospec=True)
-    @patch("dicebot.commands.roll.ActiveEvent.get_current", new_callable=AsyncMock)
+    @patch("dicebot.commands.roll.event_cache.get_current", new_callable=AsyncMock)
     async def test_roll_curse_day_exactly_1(self, mock_get_current, mock_ban, mock_roll) -> None:
         """CURSE_DAY: roll=1 should still be a normal critical fail (ban triggered, no double effect)"""
         # Arrange
@@ -300,7 +300,7 @@ class TestRollEvents(DicebotTestCase):
 
     @patch("dicebot.commands.roll.Roll", autospec=True)
     @patch("dicebot.commands.roll.ban", autospec=True)
-    @patch("dicebot.commands.roll.ActiveEvent.get_current", new_callable=AsyncMock)
+    @patch("dicebot.commands.roll.event_cache.get_current", new_callable=AsyncMock)
     async def test_roll_blessing_day_near_max(self, mock_get_current, mock_ban, mock_roll) -> None:
         """BLESSING_DAY: roll=next_roll-1 (one off) should be treated as a win"""
         # Arrange
@@ -321,7 +321,7 @@ class TestRollEvents(DicebotTestCase):
 
     @patch("dicebot.commands.roll.Roll", autospec=True)
     @patch("dicebot.commands.roll.ban", autospec=True)
-    @patch("dicebot.commands.roll.ActiveEvent.get_current", new_callable=AsyncMock)
+    @patch("dicebot.commands.roll.event_cache.get_current", new_callable=AsyncMock)
     async def test_roll_no_event(self, mock_get_current, mock_ban, mock_roll) -> None:
         """No event: roll=3 should be a normal no-match (no ban, no rename)"""
         # Arrange
@@ -4,12 +4,26 @@ import datetime
 from unittest.mock import AsyncMock, MagicMock, create_autospec, patch
 
 import discord
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from dicebot.commands import stats
+from dicebot.data.db.ban import Ban
+from dicebot.data.db.ban_immunity import BanImmunity
+from dicebot.data.db.rep import RepSummary
 from dicebot.data.db.user import User
+from dicebot.data.db.user_guild_stats import UserGuildStats
 from dicebot.test.utils import DicebotTestCase, TestMessageContext
 
 
+def _stub_reads(ctx: TestMessageContext) -> list:
+    """Makes ctx.parallel_reads() return one mock per query stats runs"""
+    results = [MagicMock(name=f"result{i}") for i in range(4)]
+    reads = MagicMock()
+    reads.gather = AsyncMock(return_value=results)
+    ctx.parallel_reads = MagicMock(return_value=reads)
+    return results
+
+
 class TestStats(DicebotTestCase):
     _default_rep_stats = {
         "received": 0,
@@ -30,6 +44,7 @@ class TestStats(DicebotTestCase):
         """!stats with no arg shows stats for the invoking user"""
         # Arrange
         ctx = TestMessageContext.get()
+        results = _stub_reads(ctx)
         mock_roll.return_value = {"total": 0, "wins": 0, "losses": 0, "win_rate": "0%", "best": 0, "last_roll": "Never"}
         mock_ban.return_value = {"times_banned": 0, "currently_banned": "No", "immune": "No"}
         mock_social.return_value = {"thanks_given": 0, "thanks_received": 0, "puns_caught": 0}
@@ -37,10 +52,11 @@ class TestStats(DicebotTestCase):
         # Act
         await stats.stats(ctx, target=None)
         # Assert
-        mock_roll.assert_awaited_once_with(ctx.session, ctx.guild, ctx.author)
-        mock_ban.assert_awaited_once_with(ctx.session, ctx.guild, ctx.author)
-        mock_social.assert_awaited_once_with(ctx.session, ctx.guild, ctx.author)
-        mock_rep.assert_awaited_once_with(ctx.session, ctx.guild, ctx.author)
+        summary, latest_ban, immunity, rep = results
+        mock_roll.assert_called_once_with(summary)
+        mock_ban.assert_called_once_with(ctx.guild, summary, latest_ban, immunity)
+        mock_social.assert_called_once_with(summary)
+        mock_rep.assert_called_once_with(summary, rep)
         ctx.channel.send.assert_awaited_once()
         # The embed should have been passed
         call_kwargs = ctx.channel.send.call_args.kwargs
@@ -56,6 +72,7 @@ class TestStats(DicebotTestCase):
         """!stats @someone shows stats for that user"""
         # Arrange
         ctx = TestMessageContext.get()
+        results = _stub_reads(ctx)
         other_user = create_autospec(User)
         other_user.id = 99999
         mock_roll.return_value = {"total": 10, "wins": 7, "losses": 3, "win_rate": "70%", "best": 95, "last_roll": "Apr 12, 2026"}
@@ -65,10 +82,19 @@ class TestStats(DicebotTestCase):
         # Act
         await stats.stats(ctx, target=other_user)
         # Assert
-        mock_roll.assert_awaited_once_with(ctx.session, ctx.guild, other_user)
-        mock_ban.assert_awaited_once_with(ctx.session, ctx.guild, other_user)
-        mock_social.assert_awaited_once_with(ctx.session, ctx.guild, other_user)
-        mock_rep.assert_awaited_once_with(ctx.session, ctx.guild, other_user)
+        summary, latest_ban, immunity, rep = results
+        mock_roll.assert_called_once_with(summary)
+        mock_ban.assert_called_once_with(ctx.guild, summary, latest_ban, immunity)
+        mock_social.assert_called_once_with(summary)
+        mock_rep.assert_called_once_with(summary, rep)
+        # The queries are all for the target
+        queries = ctx.parallel_reads.return_value.gather.call_args.args
+        self.assertEqual(4, len(queries))
+        session = create_autospec(AsyncSession)
+        await queries[0](session)
+        session.get.assert_awaited_once_with(
+            UserGuildStats, (ctx.guild_id, 99999), populate_existing=True
+        )
         ctx.channel.send.assert_awaited_once()
 
     @patch("dicebot.commands.stats.get_rep_stats", autospec=True)
@@ -81,6 +107,7 @@ class TestStats(DicebotTestCase):
         """Embed color is red when the user is currently banned"""
         # Arrange
         ctx = TestMessageContext.get()
+        results = _stub_reads(ctx)
         mock_roll.return_value = {"total": 5, "wins": 2, "losses": 3, "win_rate": "40%", "best": 60, "last_roll": "Apr 10, 2026"}
         mock_ban.return_value = {"times_banned": 3, "currently_banned": "Yes (until Apr 15, 2026 12:00 PM UTC)", "immune": "No"}
         mock_social.return_value = {"thanks_given": 1, "thanks_received": 1, "puns_caught": 0}
@@ -102,6 +129,7 @@ class TestStats(DicebotTestCase):
         """Embed color is blue when the user is not currently banned"""
         # Arrange
         ctx = TestMessageContext.get()
+        results = _stub_reads(ctx)
         mock_roll.return_value = {"total": 0, "wins": 0, "losses": 0, "win_rate": "0%", "best": 0, "last_roll": "Never"}
         mock_ban.return_value = {"times_banned": 0, "currently_banned": "No", "immune": "No"}
         mock_social.return_value = {"thanks_given": 0, "thanks_received": 0, "puns_caught": 0}
@@ -115,20 +143,10 @@ class TestStats(DicebotTestCase):
 
 
 class TestGetRollStats(DicebotTestCase):
-    async def test_get_roll_stats_no_rolls(self) -> None:
+    def test_get_roll_stats_no_rolls(self) -> None:
         """Returns zeroed stats when user has no rolls"""
-        # Arrange
-        ctx = TestMessageContext.get()
-        mock_row = MagicMock()
-        mock_row.total = 0
-        mock_row.wins = 0
-        mock_row.best = None
-        mock_row.last_rolled_at = None
-        mock_result = MagicMock()
-        mock_result.one.return_value = mock_row
-        ctx.session.execute = AsyncMock(return_value=mock_result)
         # Act
-        result = await stats.get_roll_stats(ctx.session, ctx.guild, ctx.author)
+        result = stats.get_roll_stats(None)
         # Assert
         assert result["total"] == 0
         assert result["wins"] == 0
@@ -137,21 +155,17 @@ class TestGetRollStats(DicebotTestCase):
         assert result["best"] == 0
         assert result["last_roll"] == "Never"
 
-    async def test_get_roll_stats_with_rolls(self) -> None:
+    def test_get_roll_stats_with_rolls(self) -> None:
         """Returns correct aggregated stats when user has rolls"""
         # Arrange
-        ctx = TestMessageContext.get()
-        mock_row = MagicMock()
-        mock_row.total = 10
-        mock_row.wins = 7
-        mock_row.best = 95
-        mock_row.last_rolled_at = MagicMock()
-        mock_row.last_rolled_at.strftime.return_value = "Apr 27, 2026"
-        mock_result = MagicMock()
-        mock_result.one.return_value = mock_row
-        ctx.session.execute = AsyncMock(return_value=mock_result)
+        summary = UserGuildStats(
+            rolls=10,
+            roll_wins=7,
+            best_roll=95,
+            last_rolled_at=datetime.datetime(2026, 4, 27, 12, 0),
+        )
         # Act
-        result = await stats.get_roll_stats(ctx.session, ctx.guild, ctx.author)
+        result = stats.get_roll_stats(summary)
         # Assert
         assert result["total"] == 10
         assert result["wins"] == 7
@@ -160,55 +174,93 @@ class TestGetRollStats(DicebotTestCase):
         assert result["best"] == 95
         assert result["last_roll"] == "Apr 27, 2026"
 
+    def test_get_roll_stats_without_last_roll(self) -> None:
+        """Shows "Never" if the row doesn't know when the last roll was"""
+        # Arrange
+        summary = UserGuildStats(rolls=2, roll_wins=1, best_roll=5)
+        # Act
+        result = stats.get_roll_stats(summary)
+        # Assert
+        assert result["total"] == 2
+        assert result["last_roll"] == "Never"
+
 
 class TestGetBanStats(DicebotTestCase):
-    async def test_get_ban_stats_never_banned(self) -> None:
+    def test_get_ban_stats_never_banned(self) -> None:
         """Returns zeroed stats when user has never been banned"""
         # Arrange
         ctx = TestMessageContext.get()
-        mock_result = MagicMock()
-        mock_result.all.return_value = []
-        ctx.session.scalars = AsyncMock(return_value=mock_result)
-        ctx.author.is_currently_banned = AsyncMock(return_value=False)
-        ctx.author.is_currently_immune = AsyncMock(return_value=False)
         # Act
-        result = await stats.get_ban_stats(ctx.session, ctx.guild, ctx.author)
+        result = stats.get_ban_stats(ctx.guild, None, None, None)
         # Assert
         assert result["times_banned"] == 0
         assert result["currently_banned"] == "No"
         assert result["immune"] == "No"
 
+    def test_get_ban_stats_counts_from_summary(self) -> None:
+        """times_banned comes from the running totals"""
+        # Arrange
+        ctx = TestMessageContext.get()
+        summary = UserGuildStats(times_banned=4)
+        an_hour_ago = datetime.datetime.now() - datetime.timedelta(hours=1)
+        expired = Ban(banned_until=an_hour_ago)
+        # Act
+        result = stats.get_ban_stats(ctx.guild, summary, expired, BanImmunity())
+        # Assert
+        assert result["times_banned"] == 4
+        assert result["currently_banned"] == "No"
+        assert result["immune"] == "Yes"
+
+    @patch("dicebot.commands.stats.timezone.localize_dt", return_value="soon")
+    def test_get_ban_stats_currently_banned(self, mock_localize) -> None:
+        # Arrange
+        ctx = TestMessageContext.get()
+        until = datetime.datetime.now() + datetime.timedelta(hours=1)
+        # Act
+        result = stats.get_ban_stats(ctx.guild, None, Ban(banned_until=until), None)
+        # Assert
+        assert result["currently_banned"] == "Yes (until soon)"
+        mock_localize.assert_called_once_with(until, ctx.guild.timezone)
+
 
 class TestGetSocialStats(DicebotTestCase):
-    async def test_get_social_stats_no_activity(self) -> None:
+    def test_get_social_stats_no_activity(self) -> None:
         """Returns zeroed stats when user has no social activity"""
-        # Arrange
-        ctx = TestMessageContext.get()
-        mock_execute_result = MagicMock()
-        mock_execute_result.scalar.return_value = 0
-        ctx.session.execute = AsyncMock(return_value=mock_execute_result)
         # Act
-        result = await stats.get_social_stats(ctx.session, ctx.guild, ctx.author)
+        result = stats.get_social_stats(None)
         # Assert
         assert result["thanks_given"] == 0
         assert result["thanks_received"] == 0
         assert result["puns_caught"] == 0
 
+    def test_get_social_stats(self) -> None:
+        # Act
+        result = stats.get_social_stats(
+            UserGuildStats(thanks_given=1, thanks_received=2, puns_caught=3)
+        )
+        # Assert
+        assert result["thanks_given"] == 1
+        assert result["thanks_received"] == 2
+        assert result["puns_caught"] == 3
+
 
 class TestGetRepStats(DicebotTestCase):
-    @patch("dicebot.commands.stats.Rep.get_total_received", new_callable=AsyncMock, return_value=10)
-    @patch("dicebot.commands.stats.Rep.get_total_given", new_callable=AsyncMock, return_value=5)
-    @patch("dicebot.commands.stats.Rep.get_biggest_fan", new_callable=AsyncMock, return_value=(99, 10))
-    @patch("dicebot.commands.stats.Rep.get_hater", new_callable=AsyncMock, return_value=None)
-    @patch("dicebot.commands.stats.Rep.get_best_friend", new_callable=AsyncMock, return_value=(88, 5))
-    @patch("dicebot.commands.stats.Rep.get_nemesis", new_callable=AsyncMock, return_value=None)
-    async def test_get_rep_stats(self, mock_nemesis, mock_friend, mock_hater, mock_fan, mock_given, mock_received):
-        from dicebot.commands.stats import get_rep_stats
-        ctx = TestMessageContext.get()
-        result = await get_rep_stats(ctx.session, ctx.guild, ctx.author)
+    def test_get_rep_stats(self) -> None:
+        summary = UserGuildStats(rep_received=10, rep_given=5)
+        rep = RepSummary(biggest_fan=(99, 10), best_friend=(88, 5))
+        result = stats.get_rep_stats(summary, rep)
         assert result["received"] == 10
         assert result["given"] == 5
-        assert "<@99>" in result["biggest_fan"]
+        assert result["biggest_fan"] == "<@99> (+10)"
         assert result["hater"] == "No haters yet"
-        assert "<@88>" in result["best_friend"]
+        assert result["best_friend"] == "<@88> (+5)"
         assert result["nemesis"] == "No nemesis yet"
+
+    def test_get_rep_stats_no_rep(self) -> None:
+        result = stats.get_rep_stats(
+            None, RepSummary(hater=(7, -3), nemesis=(7, -3))
+        )
+        assert result["received"] == 0
+        assert result["given"] == 0
+        assert result["hater"] == "<@7> (-3)"
+        assert result["nemesis"] == "<@7> (-3)"
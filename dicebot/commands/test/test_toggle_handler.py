@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+
+from dicebot.commands import toggle_handler
+from dicebot.core.handler_registry import disabled_handler_feature
+from dicebot.test.utils import DicebotTestCase, TestMessageContext
+
+
+class TestToggleHandler(DicebotTestCase):
+    async def test_handlers(self) -> None:
+        # Arrange
+        ctx = TestMessageContext.get()
+        ctx.guild.features = []
+        # Act
+        await toggle_handler.handlers(ctx)
+        # Assert
+        ctx.channel.send.assert_awaited_once()
+        text = ctx.channel.send.await_args.args[0]
+        self.assertIn("pun: **on**", text)
+        self.assertNotIn("command", text)
+
+    async def test_toggle_handler(self) -> None:
+        with self.subTest("turn off"):
+            # Arrange
+            ctx = TestMessageContext.get()
+            ctx.guild.has_feature.return_value = False
+            # Act
+            await toggle_handler.toggle_handler(ctx, "Pun")
+            # Assert
+            ctx.guild.add_feature.assert_awaited_once_with(
+                ctx.session, disabled_handler_feature("pun")
+            )
+            ctx.session.commit.assert_awaited_once()
+        with self.subTest("turn on"):
+            # Arrange
+            ctx = TestMessageContext.get()
+            ctx.guild.has_feature.return_value = True
+            # Act
+            await toggle_handler.toggle_handler(ctx, "pun")
+            # Assert
+            ctx.guild.remove_feature.assert_called_once_with(
+                disabled_handler_feature("pun")
+            )
+            ctx.session.commit.assert_awaited_once()
+        with self.subTest("required handler"):
+            # Arrange
+            ctx = TestMessageContext.get()
+            # Act
+            await toggle_handler.toggle_handler(ctx, "command")
+            # Assert
+            ctx.guild.add_feature.assert_not_awaited()
+            ctx.session.commit.assert_not_awaited()
+            ctx.channel.send.assert_awaited_once()
@@ -5,6 +5,7 @@ from typing import List
 
 from dicebot.core.register_command import register_command
 from dicebot.data.db.thanks import Thanks
+from dicebot.data.db.user_guild_stats import UserGuildStats
 from dicebot.data.types.greedy_str import GreedyStr
 from dicebot.data.types.message_context import MessageContext
 
@@ -48,6 +49,8 @@ async def thanks(
             )
         )
     ctx.session.add_all(thanks)
+    for row in thanks:
+        await UserGuildStats.record_thanks(ctx.session, row)
     await ctx.session.commit()
 
     msg = "Woohoo! Your `!thanks` has been recorded."
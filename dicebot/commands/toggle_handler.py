@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+
+from dicebot.commands.admin import requires_admin
+from dicebot.core.handler_registry import (
+    disabled_handler_feature,
+    disabled_handler_names,
+)
+from dicebot.core.register_command import register_command
+from dicebot.data.types.message_context import MessageContext
+
+
+def _optional_handler_names() -> list[str]:
+    # Imported here since the registry pulls in the CommandHandler, which in
+    # turn imports every command module (including this one)
+    from dicebot.handlers.registry import MESSAGE_HANDLERS, REACTION_HANDLERS
+
+    return MESSAGE_HANDLERS.optional_names() + REACTION_HANDLERS.optional_names()
+
+
+@register_command
+async def handlers(ctx: MessageContext) -> None:
+    """List the message/reaction handlers that can be toggled in this server"""
+    disabled = disabled_handler_names(ctx.guild)
+    lines = []
+    for name in _optional_handler_names():
+        status = "off" if name in disabled else "on"
+        lines.append(f"{name}: **{status}**")
+    await ctx.send("\n".join(lines))
+
+
+@requires_admin
+@register_command
+async def toggle_handler(ctx: MessageContext, name: str) -> None:
+    """Turn one of the bot's message/reaction handlers on or off for this server"""
+    name = name.lower()
+    if name not in _optional_handler_names():
+        await ctx.send(f"Unknown handler '{name}'. Use !handlers to list them.")
+        return
+
+    feature_name = disabled_handler_feature(name)
+    if ctx.guild.has_feature(feature_name):
+        ctx.guild.remove_feature(feature_name)
+        status = "on"
+    else:
+        await ctx.guild.add_feature(ctx.session, feature_name)
+        status = "**off**"
+    await ctx.session.commit()
+    await ctx.send(f"Turned the {name} handler {status} for this server.")
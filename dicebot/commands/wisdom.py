@@ -30,7 +30,7 @@ class WisdomGiver:
 
     def __init__(self, person_to_roleplay: str) -> None:
         self._person = person_to_roleplay
-        self._asker = AskOpenAI()
+        self._asker = AskOpenAI(cache_ttl=None)
 
     @classmethod
     def get_random_wisdom_giver(cls) -> "WisdomGiver":
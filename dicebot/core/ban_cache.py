@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+
+import datetime
+import itertools
+from typing import Any, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import ORMExecuteState, Session
+
+from dicebot.core.commit_invalidation import CommitInvalidator
+from dicebot.core.ttl_cache import TTLCache
+from dicebot.data.db.ban import Ban
+from dicebot.data.db.guild import Guild
+from dicebot.data.db.user import User
+
+DEFAULT_BAN_CACHE_SIZE = 16384
+# Nobody else creates bans (and their entries are dropped again once the ban
+# is committed), so "not banned" only goes stale within the TTL
+DEFAULT_NOT_BANNED_TTL_SECS = 300
+# ...but long bans are acknowledged by the Celery unban task, which this
+# process never hears about, so keep bans short-lived
+DEFAULT_BANNED_TTL_SECS = 60
+
+
+class BanStateCache:
+    """Remembers when each user's latest ban ends so the handlers that run on
+    every message (shame) don't have to query the ban table every time."""
+
+    def __init__(
+        self,
+        maxsize: int = DEFAULT_BAN_CACHE_SIZE,
+        not_banned_ttl: float = DEFAULT_NOT_BANNED_TTL_SECS,
+        banned_ttl: float = DEFAULT_BANNED_TTL_SECS,
+    ) -> None:
+        self.banned_ttl = banned_ttl
+        # Values are wrapped in a tuple so "not banned" (None) is cacheable
+        self.entries: TTLCache[Tuple[int, int], Tuple[Optional[datetime.datetime]]] = (
+            TTLCache(maxsize, not_banned_ttl)
+        )
+
+    async def is_currently_banned(
+        self, session: AsyncSession, guild: Guild, user: User
+    ) -> bool:
+        key = (guild.id, user.id)
+        cached = self.entries.get(key)
+        if cached is None:
+            latest_ban = await Ban.get_latest_unvoided_ban(session, guild, user)
+            banned_until = latest_ban.banned_until if latest_ban is not None else None
+            ttl = self.banned_ttl if banned_until is not None else None
+            cached = (banned_until,)
+            self.entries.put(key, cached, ttl=ttl)
+
+        (banned_until,) = cached
+        return banned_until is not None and banned_until > datetime.datetime.now()
+
+    def invalidate(self, guild_id: int, user_id: int) -> None:
+        self.entries.invalidate((guild_id, user_id))
+
+    def clear(self) -> None:
+        self.entries.clear()
+
+
+ban_cache = BanStateCache()
+_invalidate_user: CommitInvalidator[Tuple[int, int]] = CommitInvalidator(
+    "ban_cache", lambda key: ban_cache.invalidate(*key)
+)
+_invalidate_all: CommitInvalidator[None] = CommitInvalidator(
+    "ban_cache.all", lambda _: ban_cache.clear()
+)
+
+
+@event.listens_for(Session, "after_flush")
+def _invalidate_flushed(session: Session, flush_context: Any) -> None:
+    for obj in itertools.chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, Ban):
+            _invalidate_user(session, (obj.guild_id, obj.bannee_id))
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _invalidate_bulk_update(orm_execute_state: ORMExecuteState) -> None:
+    # Ban.unban is a bulk UPDATE, which never shows up in a flush
+    mapper = orm_execute_state.bind_mapper
+    if orm_execute_state.is_update and mapper is not None and mapper.class_ is Ban:
+        _invalidate_all(orm_execute_state.session, None)
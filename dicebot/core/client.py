@@ -12,7 +12,9 @@ import discord
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from dicebot.app import app_sessionmaker
+from dicebot.core.event_cache import event_cache
 from dicebot.core.server_manager import ServerManager
+from dicebot.core.unban_scheduler import unban_scheduler
 from dicebot.data.db.user import User
 
 TEST_PREFIX = "tt "
@@ -83,7 +85,7 @@ class Client(discord.Client):
                 return
 
         async with self.sessionmaker() as session:
-            mgr = ServerManager(session)
+            mgr = ServerManager(session, self.sessionmaker)
             await mgr.handle_message(self, message, self.is_test)
 
     async def on_reaction_add(
@@ -105,7 +107,7 @@ class Client(discord.Client):
                 return
 
         async with self.sessionmaker() as session:
-            mgr = ServerManager(session)
+            mgr = ServerManager(session, self.sessionmaker)
             await mgr.handle_reaction_add(self, reaction, user, self.is_test)
 
     async def on_ready(self) -> None:
@@ -113,6 +115,8 @@ class Client(discord.Client):
         # Ensure our bot is in the db
         async with self.sessionmaker() as session:
             await User.get_or_create(session, self.user.id)
+        await unban_scheduler.start(self, self.sessionmaker)
+        await event_cache.start()
 
     @classmethod
     async def get_and_login(cls) -> Client:
@@ -1,16 +1,14 @@
 #!/usr/bin/env python3
 
 import logging
-from typing import Any, Awaitable, Callable, Dict, List, Optional, get_type_hints
+from typing import Any, Dict, List, Optional
 
+from dicebot.core.command_signature import CommandFunc, get_signature
+from dicebot.core.command_table import command_tables
 from dicebot.core.help_context import HelpContext
 from dicebot.core.import_witchcraft import import_submodules
 from dicebot.core.register_command import REGISTERED_COMMANDS
-from dicebot.data.types.greedy_str import GreedyStr
 from dicebot.data.types.message_context import MessageContext
-from dicebot.data.types.protocols import typify_str
-
-CommandFunc = Callable[..., Awaitable[None]]
 
 # This is how we trick Python into loading *all* of the registered commands
 # from the commands/ subdir. Is there a better way to do this? Probably.
@@ -22,59 +20,36 @@ class CommandRunner:
     def __init__(self, cmds: Optional[List[CommandFunc]] = None) -> None:
         self.logger = logging.getLogger(__name__)
         cmds = cmds or REGISTERED_COMMANDS
-        self.cmds = {cmd.__name__: cmd for cmd in cmds}
+        self.cmds: Dict[str, CommandFunc] = {}
+        # Precomputed !help output, keyed by command name
+        self.help_index: Dict[str, str] = {}
+        self._command_list: Optional[str] = None
+        for cmd in cmds:
+            self.register(cmd)
 
     def register(self, cmd: CommandFunc) -> None:
         self.cmds[cmd.__name__] = cmd
+        # Compile the signature up front so calling the command only has to
+        # run the prepared converters
+        try:
+            self.help_index[cmd.__name__] = self.helptext(cmd)
+        except Exception as e:
+            self.logger.error(f"Failed to compile signature of {cmd.__name__}: {e}")
+            self.help_index.pop(cmd.__name__, None)
+        self._command_list = None
+
+    def command_list(self) -> str:
+        if self._command_list is None:
+            cmds = sorted(self.cmds.keys())
+            self._command_list = "Available commands: " + ", ".join(
+                f"!{c}" for c in cmds
+            )
+        return self._command_list
 
     async def typify_all(
         self, ctx: MessageContext, f: CommandFunc, args: List[str]
     ) -> Dict[str, Any]:
-        types = get_type_hints(f)
-
-        # Validate that this is a function taking a MessageContext
-        ctx_param = None
-        for k, v in types.items():
-            if v is MessageContext:
-                ctx_param = k
-                break
-
-        if ctx_param is None:
-            error = "Can only typify function with signature like:\n\t"
-            error += "async def func(MessageContext, ...)"
-            raise TypeError(error)
-
-        # Remove those specialized arguments now
-        del types[ctx_param]
-
-        # TODO - Currently only handles GreedyStr as last arg
-        # To handle in another position, we'd need to use something like
-        # a regex matcher algorithm; not worth it currently
-        argc = f.__code__.co_argcount
-        parameters = list(f.__code__.co_varnames[:argc])
-        for i in range(len(parameters)):
-            if parameters[i] == ctx_param:
-                del parameters[i]
-                break
-
-        # Also check if there are bot params we should disable
-        parameters = [param for param in parameters]
-
-        if len(parameters) > 0 and types[parameters[-1]] is GreedyStr:
-            # This is -1 because the last argument will be part of the glob
-            n = len(parameters) - 1
-            args, glob = args[:n], args[n:]
-            greedy_arg = " ".join(glob)
-            args.append(GreedyStr(greedy_arg))
-
-        # Make sure *all* arguments are kwargs now
-        typed_args = {
-            k: await typify_str(ctx, types[k], v)
-            # TODO: We implicitly rely on ctx being the first param here,
-            # which isn't good style... it could break a function
-            for k, v in zip(parameters, args)
-        }
-        return typed_args
+        return await get_signature(f).typify(ctx, args)
 
     async def call(self, ctx: MessageContext) -> None:
         # Split args to prepare for dynamic dispatch
@@ -90,9 +65,9 @@ class CommandRunner:
             funcname = "roll"
 
         # Resolve aliases first
-        alias = await ctx.guild.get_alias(ctx.session, funcname)
+        alias = await command_tables.resolve_alias(ctx.session, ctx.guild, funcname)
         if alias is not None:
-            funcname = alias.value
+            funcname = alias
 
         # If this is a built-in or aliased command, invoke it
         if funcname in self.cmds:
@@ -112,13 +87,15 @@ class CommandRunner:
 
         # Fallback: if no command found, try macros
         try:
-            macro = await ctx.guild.get_macro(ctx.session, funcname)
+            macro = await command_tables.resolve_macro(
+                ctx.session, ctx.guild, funcname
+            )
         except Exception as e:
             self.logger.error(f"Error retrieving macro '{funcname}': {e}")
             macro = None
         if macro is not None:
             # Send macro value directly
-            await ctx.send(macro.value)
+            await ctx.send(macro)
             return
 
         # Unknown command: log and raise to trigger help response
@@ -127,23 +104,18 @@ class CommandRunner:
 
     @classmethod
     def help_context(cls, f: CommandFunc, limit: Optional[int] = None) -> HelpContext:
-        types = get_type_hints(f)
-        argc = f.__code__.co_argcount
-        args = list(f.__code__.co_varnames[:argc])
-
-        if len(args) > 0 and types[args[0]] is MessageContext:
-            args = args[1:]
+        sig = get_signature(f)
 
         usage = ""
-        if f.__doc__ and len(f.__doc__) > 0:
-            doc = f.__doc__
+        if sig.doc and len(sig.doc) > 0:
+            doc = sig.doc
             if limit and len(doc) > limit:
                 doc = doc[:limit] + "..."
                 usage = doc
             else:
                 usage = f"\n{doc}"
 
-        return HelpContext(f.__name__, args, types, usage)
+        return HelpContext(sig.name, sig.param_names, sig.types, usage)
 
     @classmethod
     def helptext(cls, f: CommandFunc, limit: Optional[int] = None) -> str:
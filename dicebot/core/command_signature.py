@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    get_type_hints,
+)
+
+from dicebot.data.types.greedy_str import GreedyStr
+from dicebot.data.types.message_context import MessageContext
+from dicebot.data.types.protocols import Converter, converter_for
+
+CommandFunc = Callable[..., Awaitable[None]]
+
+
+@dataclass(frozen=True)
+class CommandParam:
+    name: str
+    converter: Converter
+
+
+@dataclass(frozen=True)
+class CommandSignature:
+    """Everything needed to turn a command's string arguments into kwargs,
+    worked out once per command instead of on every invocation"""
+
+    name: str
+    doc: Optional[str]
+    # Raw type hints, which is what the help text wants to show
+    types: Dict[str, Any]
+    ctx_param: Optional[str]
+    params: Tuple[CommandParam, ...]
+    # TODO - Currently only handles GreedyStr as last arg
+    # To handle in another position, we'd need to use something like
+    # a regex matcher algorithm; not worth it currently
+    greedy_last: bool
+
+    @property
+    def param_names(self) -> List[str]:
+        return [param.name for param in self.params]
+
+    @classmethod
+    def compile(cls, f: CommandFunc) -> CommandSignature:
+        types = get_type_hints(f)
+
+        ctx_param = None
+        for k, v in types.items():
+            if v is MessageContext:
+                ctx_param = k
+                break
+
+        argc = f.__code__.co_argcount
+        names = [name for name in f.__code__.co_varnames[:argc] if name != ctx_param]
+        # Every param needs a type hint to know what to convert its string to
+        params = tuple(CommandParam(name, converter_for(types[name])) for name in names)
+        return cls(
+            name=f.__name__,
+            doc=f.__doc__,
+            types=types,
+            ctx_param=ctx_param,
+            params=params,
+            greedy_last=len(names) > 0 and types.get(names[-1]) is GreedyStr,
+        )
+
+    async def typify(self, ctx: MessageContext, args: List[str]) -> Dict[str, Any]:
+        if self.ctx_param is None:
+            error = "Can only typify function with signature like:\n\t"
+            error += "async def func(MessageContext, ...)"
+            raise TypeError(error)
+
+        if self.greedy_last:
+            # This is -1 because the last argument will be part of the glob
+            n = len(self.params) - 1
+            args, glob = args[:n], args[n:]
+            args.append(GreedyStr(" ".join(glob)))
+
+        # Make sure *all* arguments are kwargs now
+        return {
+            param.name: await param.converter(ctx, value)
+            for param, value in zip(self.params, args)
+        }
+
+
+_SIGNATURES: Dict[CommandFunc, CommandSignature] = {}
+
+
+def get_signature(f: CommandFunc) -> CommandSignature:
+    res = _SIGNATURES.get(f)
+    if res is None:
+        res = CommandSignature.compile(f)
+        _SIGNATURES[f] = res
+    return res
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+
+import itertools
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from dicebot.core.commit_invalidation import CommitInvalidator
+from dicebot.core.ttl_cache import TTLCache
+from dicebot.data.db.alias import Alias
+from dicebot.data.db.guild import Guild
+from dicebot.data.db.macro import Macro
+
+DEFAULT_COMMAND_TABLE_CACHE_SIZE = 1024
+# Aliases and macros only change through the bot itself (which invalidates
+# the table on flush and commit), so this is just a safety net
+DEFAULT_COMMAND_TABLE_TTL_SECS = 3600
+
+
+@dataclass(frozen=True)
+class GuildCommandTable:
+    aliases: Dict[str, str]
+    macros: Dict[str, str]
+
+
+class CommandTableCache:
+    """Per-guild alias and macro lookup tables so resolving a command doesn't
+    need to query the database. A guild's table is loaded on its first
+    command and dropped whenever one of its aliases or macros is flushed (and
+    again once that's committed)."""
+
+    def __init__(
+        self,
+        maxsize: int = DEFAULT_COMMAND_TABLE_CACHE_SIZE,
+        ttl: float = DEFAULT_COMMAND_TABLE_TTL_SECS,
+    ) -> None:
+        self.tables: TTLCache[int, GuildCommandTable] = TTLCache(maxsize, ttl)
+
+    async def get(self, session: AsyncSession, guild: Guild) -> GuildCommandTable:
+        res = self.tables.get(guild.id)
+        if res is None:
+            res = GuildCommandTable(
+                aliases=await Alias.get_key_values(session, guild),
+                macros=await Macro.get_key_values(session, guild),
+            )
+            self.tables.put(guild.id, res)
+        return res
+
+    async def resolve_alias(
+        self, session: AsyncSession, guild: Guild, key: str
+    ) -> Optional[str]:
+        table = await self.get(session, guild)
+        return table.aliases.get(key)
+
+    async def resolve_macro(
+        self, session: AsyncSession, guild: Guild, key: str
+    ) -> Optional[str]:
+        table = await self.get(session, guild)
+        return table.macros.get(key)
+
+    def invalidate(self, guild_id: int) -> None:
+        self.tables.invalidate(guild_id)
+
+    def clear(self) -> None:
+        self.tables.clear()
+
+
+command_tables = CommandTableCache()
+_invalidate_guild: CommitInvalidator[int] = CommitInvalidator(
+    "command_tables", command_tables.invalidate
+)
+
+
+@event.listens_for(Session, "after_flush")
+def _invalidate_flushed(session: Session, flush_context: Any) -> None:
+    for obj in itertools.chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, (Alias, Macro)):
+            _invalidate_guild(session, obj.guild_id)
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+
+from typing import Any, Callable, Generic, Hashable, Set, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, SessionTransaction
+
+K = TypeVar("K", bound=Hashable)
+
+
+class CommitInvalidator(Generic[K]):
+    """Invalidates a cache entry now and again once the transaction that
+    changed it ends.
+
+    Caches drop entries on flush, but the change isn't visible to anyone else
+    until it's committed. A lookup from another session in between reads the
+    old row and puts it right back, where it would stay until the TTL runs
+    out. Remembering the keys in session.info and dropping them again after
+    commit (or rollback) closes that window."""
+
+    def __init__(self, name: str, invalidate: Callable[[K], None]) -> None:
+        self.info_key = f"dicebot.{name}.invalidated"
+        self.invalidate = invalidate
+        event.listen(Session, "after_commit", self._after_commit)
+        event.listen(Session, "after_soft_rollback", self._after_soft_rollback)
+
+    def __call__(self, session: Session, key: K) -> None:
+        self.invalidate(key)
+        keys: Set[K] = session.info.setdefault(self.info_key, set())
+        keys.add(key)
+
+    def _flush_pending(self, session: Session) -> None:
+        for key in session.info.pop(self.info_key, ()):
+            self.invalidate(key)
+
+    def _after_commit(self, session: Session) -> None:
+        self._flush_pending(session)
+
+    def _after_soft_rollback(
+        self, session: Session, previous_transaction: SessionTransaction
+    ) -> None:
+        # Rolling back a savepoint leaves the outer transaction going, and
+        # whatever it flushed before the savepoint still needs dropping at
+        # the end of it
+        if previous_transaction.parent is None:
+            self._flush_pending(session)
+        else:
+            keys: Any = session.info.get(self.info_key, ())
+            for key in keys:
+                self.invalidate(key)
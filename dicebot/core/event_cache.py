@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+
+import asyncio
+import datetime
+import logging
+import os
+from typing import Any, Iterable, Optional, Tuple
+
+import redis.asyncio as aioredis
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from dicebot.core.ttl_cache import TTLCache
+from dicebot.data.db.active_event import ActiveEvent
+
+DEFAULT_EVENT_CACHE_SIZE = 4096
+# Events are only started by the daily event task, which runs in a Celery
+# worker. Without redis to hear about them from, "no event" can only be
+# trusted for this long...
+DEFAULT_NO_EVENT_TTL_SECS = 300
+# ...but while subscribed it only needs to cover lost messages
+DEFAULT_SUBSCRIBED_NO_EVENT_TTL_SECS = 3600
+EVENT_STARTED_CHANNEL = "dicebot:active_event:started"
+RESUBSCRIBE_DELAY_SECS = 5
+
+
+def _detached_copy(event: ActiveEvent) -> ActiveEvent:
+    # The cached event is shared between sessions, so it can't belong to any
+    # of them (a rollback would expire it out from under everyone else)
+    return ActiveEvent(
+        id=event.id,
+        guild_id=event.guild_id,
+        event_type=event.event_type,
+        started_at=event.started_at,
+        expires_at=event.expires_at,
+    )
+
+
+async def _close(client: Any) -> None:
+    # redis<5 only has close(), which 5.x deprecated for aclose()
+    close = getattr(client, "aclose", None) or client.close
+    await close()
+
+
+class ActiveEventCache:
+    """Each guild's current event (or lack of one) for the roll and ban
+    paths, which would otherwise look it up several times per action.
+
+    An event is cached until it expires, since nothing replaces a running
+    one. "No event" is cached until the daily event task starts one, which
+    it announces on EVENT_STARTED_CHANNEL for every process to drop that
+    guild's entry. The bot subscribes on startup if there's a redis URL."""
+
+    def __init__(
+        self,
+        maxsize: int = DEFAULT_EVENT_CACHE_SIZE,
+        no_event_ttl: float = DEFAULT_NO_EVENT_TTL_SECS,
+        subscribed_no_event_ttl: float = DEFAULT_SUBSCRIBED_NO_EVENT_TTL_SECS,
+        redis_url: Optional[str] = None,
+    ) -> None:
+        self.no_event_ttl = no_event_ttl
+        self.subscribed_no_event_ttl = subscribed_no_event_ttl
+        self.redis_url = redis_url
+        # Values are wrapped in a tuple so "no event" (None) is cacheable
+        self.entries: TTLCache[int, Tuple[Optional[ActiveEvent]]] = TTLCache(
+            maxsize, no_event_ttl
+        )
+        # Bumped on every invalidation, so a lookup that raced with one
+        # doesn't put back what it read from before the new event
+        self._generation = 0
+        self._subscribed = False
+        self._task: Optional[asyncio.Task[None]] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def get_current(
+        self, session: AsyncSession, guild_id: int
+    ) -> Optional[ActiveEvent]:
+        cached = self.entries.get(guild_id)
+        if cached is not None:
+            return cached[0]
+
+        generation = self._generation
+        event = await ActiveEvent.get_current(session, guild_id)
+        if event is not None:
+            event = _detached_copy(event)
+            now = datetime.datetime.now()
+            ttl = (event.expires_at - now).total_seconds()
+        elif self._subscribed:
+            ttl = self.subscribed_no_event_ttl
+        else:
+            ttl = self.no_event_ttl
+        if generation == self._generation:
+            self.entries.put(guild_id, (event,), ttl=ttl)
+        return event
+
+    def invalidate(self, guild_id: int) -> None:
+        self._generation += 1
+        self.entries.invalidate(guild_id)
+
+    def clear(self) -> None:
+        self._generation += 1
+        self.entries.clear()
+
+    async def publish_started(self, guild_ids: Iterable[int]) -> None:
+        """Drop these guilds' entries, here and in every subscribed process.
+        Call this once the new events are committed."""
+        guild_ids = list(guild_ids)
+        for guild_id in guild_ids:
+            self.invalidate(guild_id)
+        if self.redis_url is None or len(guild_ids) == 0:
+            return
+
+        try:
+            client = aioredis.Redis.from_url(self.redis_url)
+            try:
+                await client.publish(
+                    EVENT_STARTED_CHANNEL, " ".join(str(g) for g in guild_ids)
+                )
+            finally:
+                await _close(client)
+        except Exception:
+            logging.exception("Failed to publish newly started events")
+
+    async def start(self) -> None:
+        # on_ready fires again on every reconnect
+        if self.redis_url is None or self.running:
+            return
+        self._task = asyncio.create_task(self._listen(), name="event_cache")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        self._subscribed = False
+
+    def handle_message(self, data: str) -> None:
+        try:
+            guild_ids = [int(guild_id) for guild_id in data.split()]
+        except ValueError:
+            logging.warning(f"Bad active event message {data!r}, clearing cache")
+            self.clear()
+            return
+        for guild_id in guild_ids:
+            self.invalidate(guild_id)
+
+    async def _listen(self) -> None:
+        assert self.redis_url is not None
+        while True:
+            try:
+                client = aioredis.Redis.from_url(self.redis_url, decode_responses=True)
+                pubsub = client.pubsub()
+                try:
+                    await pubsub.subscribe(EVENT_STARTED_CHANNEL)
+                    # Whatever was published while we weren't listening is lost
+                    self.clear()
+                    self._subscribed = True
+                    logging.info("Listening for newly started events")
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            self.handle_message(message["data"])
+                finally:
+                    self._subscribed = False
+                    await _close(pubsub)
+                    await _close(client)
+            except Exception:
+                logging.exception("Lost the active event subscription")
+            await asyncio.sleep(RESUBSCRIBE_DELAY_SECS)
+
+
+def event_cache_from_env() -> ActiveEventCache:
+    return ActiveEventCache(redis_url=os.getenv("EVENT_CACHE_REDIS_URL") or None)
+
+
+event_cache = event_cache_from_env()
@@ -1,55 +1,44 @@
 #!/usr/bin/env python3
 
+import asyncio
+import dataclasses
 import logging
+from typing import Dict, Sequence, Type
 
 import discord
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+from dicebot.core.identity_cache import identity_cache, merge_into
 from dicebot.data.db.guild import Guild
-from dicebot.data.db.user import User
 from dicebot.data.types.message_context import MessageContext
-
-# on_message handlers
-from dicebot.handlers.message.ban_handler import BanHandler
-from dicebot.handlers.message.birthday_handler import BirthdayHandler
-from dicebot.handlers.message.command_handler import CommandHandler
-from dicebot.handlers.message.fool_handler import FoolHandler
-from dicebot.handlers.message.hbd_handler import HbdHandler
-from dicebot.handlers.message.leeroy_handler import LeeRoyHandler
-from dicebot.handlers.message.pun_handler import PunHandler
-from dicebot.handlers.message.log_message_handler import (
-    LogMessageHandler,
-    LogMessageHandlerSource,
+from dicebot.handlers.message.abstract_handler import AbstractHandler
+from dicebot.handlers.message.triggers import TriggerInput
+from dicebot.handlers.registry import (
+    DM_HANDLERS,
+    MESSAGE_HANDLERS,
+    REACTION_HANDLERS,
 )
-from dicebot.handlers.message.long_message_handler import LongMessageHandler
-from dicebot.handlers.message.shame_handler import ShameHandler
-from dicebot.handlers.message.tldrwl_handler import TldrwlHandler
-from dicebot.handlers.message.youtube_handler import YoutubeHandler
-from dicebot.handlers.message.repost_handler import RepostHandler
-from dicebot.handlers.message.thanks_nudge_handler import ThanksNudgeHandler
-
-# on_reaction handlers
-from dicebot.handlers.reaction.ban_handler import BanReactionHandler
-from dicebot.handlers.reaction.eyes_handler import EyesReactionHandler
-from dicebot.handlers.reaction.generic_gif_handler import GenericGifReactionHandler
-from dicebot.handlers.reaction.kekw_handler import KekwReactionHandler
-from dicebot.handlers.reaction.shrek_handler import ShrekReactionHandler
 
 
 class GuildContext:
     def __init__(
-        self, client: discord.Client, guild: Guild, session: AsyncSession
+        self,
+        client: discord.Client,
+        guild: Guild,
+        session: AsyncSession,
+        sessionmaker: async_sessionmaker[AsyncSession],
     ) -> None:
         self.client = client
         self.guild = guild
         self.session = session
+        self.sessionmaker = sessionmaker
 
     async def handle_message(
         self,
         message: discord.Message,
         is_test: bool,
     ) -> None:
-        author = await User.get_or_create(self.session, message.author.id)
+        author = await identity_cache.get_user(self.session, message.author.id)
         ctx = MessageContext(
             client=self.client,
             session=self.session,
@@ -60,32 +49,19 @@ class GuildContext:
             reactor=None,
             reaction=None,
             is_test=is_test,
+            sessionmaker=self.sessionmaker,
         )
 
-        # TODO: Build handlers from set of handlers defined on guild features
+        # Run every handler's cheap triggers up front so handlers that can't
+        # possibly match never get their (possibly I/O heavy) should_handle awaited
+        trigger_input = TriggerInput.from_message(message, self.client.user)
         handlers = [
-            # NOTE: Explicitly run the LogMessageHandler first
-            LogMessageHandler(),
-            BanHandler(),
-            BirthdayHandler(),
-            CommandHandler(),
-            HbdHandler(),
-            LeeRoyHandler(),
-            LongMessageHandler(),
-            FoolHandler(),
-            ShameHandler(),
-            YoutubeHandler(),
-            ThanksNudgeHandler(),
-            # These can be slow, so keep them at the end of the list
-            TldrwlHandler(),
-            PunHandler(),
-            RepostHandler(),
+            handler
+            for handler in MESSAGE_HANDLERS.for_guild(self.guild)
+            if handler.is_triggered_by(trigger_input)
         ]
 
-        for handler in handlers:
-            if await handler.should_handle_no_throw(ctx):
-                logging.debug(f"Running handler: {handler.__class__.__name__}")
-                await handler.handle_no_throw(ctx)
+        await self._run_concurrently(ctx, handlers)
 
     async def handle_reaction_add(
         self,
@@ -93,8 +69,8 @@ class GuildContext:
         user: discord.User,
         is_test: bool,
     ) -> None:
-        author = await User.get_or_create(self.session, reaction.message.author.id)
-        reactor = await User.get_or_create(self.session, user.id)
+        author = await identity_cache.get_user(self.session, reaction.message.author.id)
+        reactor = await identity_cache.get_user(self.session, user.id)
         ctx = MessageContext(
             client=self.client,
             session=self.session,
@@ -105,17 +81,10 @@ class GuildContext:
             reactor=reactor,
             reaction=reaction,
             is_test=is_test,
+            sessionmaker=self.sessionmaker,
         )
 
-        # TODO: Build handlers from set of handlers defined on guild features
-        handlers = [
-            EyesReactionHandler(),
-            BanReactionHandler(),
-            GenericGifReactionHandler(),
-            KekwReactionHandler(),
-            ShrekReactionHandler(),
-        ]
-        for handler in handlers:
+        for handler in REACTION_HANDLERS.for_guild(self.guild):
             await handler.handle_and_record_no_throw(ctx)
 
     async def handle_dm(
@@ -123,7 +92,7 @@ class GuildContext:
         message: discord.Message,
         is_test: bool,
     ) -> None:
-        author = await User.get_or_create(self.session, message.author.id)
+        author = await identity_cache.get_user(self.session, message.author.id)
         ctx = MessageContext(
             client=self.client,
             session=self.session,
@@ -134,15 +103,63 @@ class GuildContext:
             reactor=None,
             reaction=None,
             is_test=is_test,
+            sessionmaker=self.sessionmaker,
         )
 
-        # TODO: Build handlers from set of handlers defined on guild features
-        handlers = [
-            # NOTE: Explicitly run the LogMessageHandler first
-            LogMessageHandler(source=LogMessageHandlerSource.DM),
-            CommandHandler(),
-        ]
-
-        for handler in handlers:
+        trigger_input = TriggerInput.from_message(message, self.client.user)
+        for handler in DM_HANDLERS.for_guild(self.guild):
+            if not handler.is_triggered_by(trigger_input):
+                continue
             if await handler.should_handle_no_throw(ctx):
                 await handler.handle_no_throw(ctx)
+
+    async def _run_concurrently(
+        self, ctx: MessageContext, handlers: Sequence[AbstractHandler]
+    ) -> None:
+        """Run each handler in its own task so a slow (LLM-backed) handler
+        doesn't hold up the rest. A handler only waits for the handlers listed
+        in its runs_after, e.g. the RepostHandler reading the PunHandler's
+        WAS_PUN state. Handlers marked runs_first (the LogMessageHandler) are
+        done before any of the others start."""
+        for handler in handlers:
+            if handler.runs_first:
+                await self._run_handler(ctx, handler, [])
+
+        tasks: Dict[Type[AbstractHandler], asyncio.Task] = {}
+        for handler in handlers:
+            if handler.runs_first:
+                continue
+            deps = [tasks[dep] for dep in handler.runs_after if dep in tasks]
+            tasks[type(handler)] = asyncio.create_task(
+                self._run_handler(ctx, handler, deps)
+            )
+        await asyncio.gather(*tasks.values())
+
+    async def _run_handler(
+        self,
+        ctx: MessageContext,
+        handler: AbstractHandler,
+        deps: Sequence[asyncio.Task],
+    ) -> None:
+        if deps:
+            await asyncio.wait(deps)
+
+        # An AsyncSession can't be shared between concurrent tasks, so every
+        # handler gets its own. ctx.state is still shared between them.
+        async with self.sessionmaker() as session:
+            try:
+                handler_ctx = dataclasses.replace(
+                    ctx,
+                    session=session,
+                    guild=await merge_into(session, ctx.guild),
+                    author=await merge_into(session, ctx.author),
+                )
+            except Exception as e:
+                logging.exception(
+                    f"Failed to set up session for {handler.__class__.__name__}: {e}"
+                )
+                return
+
+            if await handler.should_handle_no_throw(handler_ctx):
+                logging.debug(f"Running handler: {handler.__class__.__name__}")
+                await handler.handle_no_throw(handler_ctx)
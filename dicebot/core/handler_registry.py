@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Generic, List, Sequence, TypeVar
+
+from dicebot.data.db.guild import Guild
+
+# A guild has a handler turned off when it has a Feature with this name
+DISABLED_HANDLER_PREFIX = "disable_handler:"
+
+H = TypeVar("H")
+
+
+def disabled_handler_feature(name: str) -> str:
+    return f"{DISABLED_HANDLER_PREFIX}{name}"
+
+
+def disabled_handler_names(guild: Guild) -> FrozenSet[str]:
+    return frozenset(
+        f.feature_name.removeprefix(DISABLED_HANDLER_PREFIX)
+        for f in guild.features
+        if f.feature_name.startswith(DISABLED_HANDLER_PREFIX)
+    )
+
+
+@dataclass(frozen=True)
+class RegisteredHandler(Generic[H]):
+    name: str
+    handler: H
+    # Required handlers can't be turned off (otherwise disabling commands
+    # would leave a guild with no way to turn them back on)
+    required: bool = False
+
+
+class HandlerRegistry(Generic[H]):
+    """An ordered list of handler instances that is built once at startup.
+    Guilds can turn individual handlers off through their features."""
+
+    def __init__(self, entries: Sequence[RegisteredHandler[H]]) -> None:
+        names = [entry.name for entry in entries]
+        if len(names) != len(set(names)):
+            raise ValueError(f"Duplicate handler names in registry: {names}")
+        self.entries = list(entries)
+        # There are only ever a handful of distinct configurations, so keep
+        # the filtered list for each one around
+        self._by_disabled: Dict[FrozenSet[str], List[H]] = {}
+
+    def optional_names(self) -> List[str]:
+        return [entry.name for entry in self.entries if not entry.required]
+
+    def for_guild(self, guild: Guild) -> List[H]:
+        disabled = disabled_handler_names(guild)
+        res = self._by_disabled.get(disabled)
+        if res is None:
+            res = [
+                entry.handler
+                for entry in self.entries
+                if entry.required or entry.name not in disabled
+            ]
+            self._by_disabled[disabled] = res
+        return res
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+import asyncio
+import os
+from typing import Optional
+
+import aiohttp
+
+DEFAULT_CONNECT_TIMEOUT_SECS = 5.0
+# LLM responses can take a while to start streaming back
+DEFAULT_READ_TIMEOUT_SECS = 120.0
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_CONNECTIONS_PER_HOST = 10
+DEFAULT_KEEPALIVE_SECS = 60.0
+DEFAULT_DNS_CACHE_SECS = 300
+
+
+class HttpClient:
+    """A single pooled aiohttp session shared by all outbound HTTP calls
+    (LLM, GIF search, GitHub) so connections and TLS sessions get reused.
+
+    The bot starts and closes it alongside the discord client. Anything else
+    (Celery tasks, scripts) gets a session lazily; since aiohttp sessions are
+    bound to an event loop, a new one is made if the running loop changed."""
+
+    def __init__(
+        self,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT_SECS,
+        read_timeout: float = DEFAULT_READ_TIMEOUT_SECS,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_connections_per_host: int = DEFAULT_MAX_CONNECTIONS_PER_HOST,
+        keepalive: float = DEFAULT_KEEPALIVE_SECS,
+    ) -> None:
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_connections = max_connections
+        self.max_connections_per_host = max_connections_per_host
+        self.keepalive = keepalive
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @classmethod
+    def from_env(cls) -> HttpClient:
+        return cls(
+            connect_timeout=float(
+                os.getenv("HTTP_CONNECT_TIMEOUT_SECS", DEFAULT_CONNECT_TIMEOUT_SECS)
+            ),
+            read_timeout=float(
+                os.getenv("HTTP_READ_TIMEOUT_SECS", DEFAULT_READ_TIMEOUT_SECS)
+            ),
+            max_connections_per_host=int(
+                os.getenv(
+                    "HTTP_MAX_CONNECTIONS_PER_HOST", DEFAULT_MAX_CONNECTIONS_PER_HOST
+                )
+            ),
+        )
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            self._session = self._new_session()
+            self._loop = loop
+        return self._session
+
+    async def start(self) -> None:
+        self.session
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._loop = None
+
+    def _new_session(self) -> aiohttp.ClientSession:
+        connector = aiohttp.TCPConnector(
+            limit=self.max_connections,
+            limit_per_host=self.max_connections_per_host,
+            keepalive_timeout=self.keepalive,
+            ttl_dns_cache=DEFAULT_DNS_CACHE_SECS,
+        )
+        # sock_connect rather than connect, which would also count time spent
+        # waiting for a free connection when a host is at its limit
+        timeout = aiohttp.ClientTimeout(
+            total=None,
+            sock_connect=self.connect_timeout,
+            sock_read=self.read_timeout,
+        )
+        return aiohttp.ClientSession(connector=connector, timeout=timeout)
+
+
+http_client = HttpClient.from_env()
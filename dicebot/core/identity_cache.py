@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+
+import itertools
+from typing import Any, Optional, TypeVar
+
+from sqlalchemy import event, inspect
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from dicebot.core.commit_invalidation import CommitInvalidator
+from dicebot.core.ttl_cache import TTLCache
+from dicebot.data.db.guild import Guild
+from dicebot.data.db.user import User
+
+DEFAULT_GUILD_CACHE_SIZE = 1024
+DEFAULT_USER_CACHE_SIZE = 16384
+DEFAULT_IDENTITY_TTL_SECS = 300
+
+T = TypeVar("T", Guild, User)
+
+
+def _is_fully_loaded(obj: Any) -> bool:
+    # Touching an unloaded attribute means a lazy load, which doesn't work
+    # under asyncio. This happens for freshly created rows (server defaults
+    # haven't been read back) and for anything expired by a rollback.
+    if inspect(obj).unloaded:
+        return False
+    if isinstance(obj, Guild):
+        return all(_is_fully_loaded(o) for o in [*obj.admins, *obj.features])
+    return True
+
+
+async def merge_into(session: AsyncSession, obj: T) -> T:
+    """Attach a Guild/User loaded by another session to this one, without a
+    query whenever the instance is fully loaded."""
+    if _is_fully_loaded(obj):
+        try:
+            return await session.merge(obj, load=False)
+        except InvalidRequestError:
+            pass
+    return await session.merge(obj)
+
+
+class IdentityCache:
+    """In-memory cache of Guild and User rows for the message/reaction hot path.
+
+    Cached instances are merged into the caller's session with load=False, so a
+    hit costs zero queries. Any flush that touches a Guild or User (admin
+    commands, rolls, birthdays, ...) drops the entry, and so does the commit
+    after it; the TTL bounds how stale an entry can get if the row is changed
+    outside of this process."""
+
+    def __init__(
+        self,
+        guild_cache_size: int = DEFAULT_GUILD_CACHE_SIZE,
+        user_cache_size: int = DEFAULT_USER_CACHE_SIZE,
+        ttl: float = DEFAULT_IDENTITY_TTL_SECS,
+    ) -> None:
+        self.guilds: TTLCache[int, Guild] = TTLCache(guild_cache_size, ttl)
+        self.users: TTLCache[int, User] = TTLCache(user_cache_size, ttl)
+
+    async def get_guild(
+        self, session: AsyncSession, guild_id: int, owner_id: int, is_dm: bool
+    ) -> Guild:
+        cached = self.guilds.get(guild_id)
+        if cached is not None:
+            merged = await self._merge(session, cached)
+            if merged is not None:
+                return merged
+            self.guilds.invalidate(guild_id)
+
+        res = await Guild.get_or_create(
+            session=session, guild_id=guild_id, owner_id=owner_id, is_dm=is_dm
+        )
+        if _is_fully_loaded(res):
+            self.guilds.put(guild_id, res)
+        return res
+
+    async def get_user(self, session: AsyncSession, discord_id: int) -> User:
+        cached = self.users.get(discord_id)
+        if cached is not None:
+            merged = await self._merge(session, cached)
+            if merged is not None:
+                return merged
+            self.users.invalidate(discord_id)
+
+        res = await User.get_or_create(session, discord_id)
+        if _is_fully_loaded(res):
+            self.users.put(discord_id, res)
+        return res
+
+    def invalidate_guild(self, guild_id: int) -> None:
+        self.guilds.invalidate(guild_id)
+
+    def invalidate_user(self, discord_id: int) -> None:
+        self.users.invalidate(discord_id)
+
+    def clear(self) -> None:
+        self.guilds.clear()
+        self.users.clear()
+
+    async def _merge(self, session: AsyncSession, cached: T) -> Optional[T]:
+        if not _is_fully_loaded(cached):
+            return None
+        try:
+            return await session.merge(cached, load=False)
+        except InvalidRequestError:
+            # merge(load=False) refuses instances with pending changes
+            return None
+
+
+identity_cache = IdentityCache()
+_invalidate_guild: CommitInvalidator[int] = CommitInvalidator(
+    "identity_cache.guilds", identity_cache.invalidate_guild
+)
+_invalidate_user: CommitInvalidator[int] = CommitInvalidator(
+    "identity_cache.users", identity_cache.invalidate_user
+)
+
+
+@event.listens_for(Session, "after_flush")
+def _invalidate_flushed(session: Session, flush_context: Any) -> None:
+    for obj in itertools.chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, Guild):
+            _invalidate_guild(session, obj.id)
+        elif isinstance(obj, User):
+            _invalidate_user(session, obj.id)
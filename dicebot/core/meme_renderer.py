@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import multiprocessing
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Sequence
+
+from MemePy import MemeGenerator
+
+DEFAULT_RENDER_WORKERS = 2
+# Past this many memes waiting on a worker, new requests are turned away
+DEFAULT_MAX_PENDING_RENDERS = 8
+DEFAULT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+
+class MemeRendererBusy(Exception):
+    pass
+
+
+def render_meme(template: str, args: Sequence[str]) -> bytes:
+    """Render a meme to bytes. This is what runs in the worker processes."""
+    return MemeGenerator.get_meme_image_bytes(template, list(args)).getvalue()
+
+
+def meme_cache_key(template: str, args: Sequence[str]) -> str:
+    payload = json.dumps([template, list(args)]).encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
+
+class ByteLRUCache:
+    """An LRU cache bounded by the total size of its values rather than how
+    many there are, since one animated meme can outweigh a hundred stills"""
+
+    def __init__(self, max_bytes: int) -> None:
+        if max_bytes <= 0:
+            raise ValueError(f"max_bytes must be positive, got {max_bytes}")
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+
+    def get(self, key: str) -> Optional[bytes]:
+        res = self._entries.get(key)
+        if res is not None:
+            self._entries.move_to_end(key)
+        return res
+
+    def put(self, key: str, value: bytes) -> None:
+        if len(value) > self.max_bytes:
+            # Would just evict everything else and then itself
+            return
+        self.invalidate(key)
+        self._entries[key] = value
+        self.size += len(value)
+        while self.size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size -= len(evicted)
+
+    def invalidate(self, key: str) -> None:
+        res = self._entries.pop(key, None)
+        if res is not None:
+            self.size -= len(res)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.size = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class MemeRenderer:
+    """Renders memes in a pool of worker processes so PIL doesn't hold up the
+    event loop (and the GIL) while it draws.
+
+    Rendered images are cached by a hash of the template and its arguments,
+    so asking for the same meme twice is free. The pool is created on first
+    use so importing the command doesn't fork a bunch of processes."""
+
+    def __init__(
+        self,
+        workers: int = DEFAULT_RENDER_WORKERS,
+        max_pending: int = DEFAULT_MAX_PENDING_RENDERS,
+        cache_max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+    ) -> None:
+        self.workers = workers
+        self.max_pending = max_pending
+        self.cache = ByteLRUCache(cache_max_bytes)
+        self.pending = 0
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @classmethod
+    def from_env(cls) -> MemeRenderer:
+        return cls(
+            workers=int(os.getenv("MEME_RENDER_WORKERS", DEFAULT_RENDER_WORKERS)),
+            max_pending=int(
+                os.getenv("MEME_RENDER_MAX_PENDING", DEFAULT_MAX_PENDING_RENDERS)
+            ),
+            cache_max_bytes=int(
+                os.getenv("MEME_CACHE_MAX_BYTES", DEFAULT_CACHE_MAX_BYTES)
+            ),
+        )
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # Forking would copy the bot's event loop, sockets, and whatever
+            # locks other threads hold into every worker
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("forkserver"),
+            )
+        return self._executor
+
+    async def render(self, template: str, args: Sequence[str]) -> bytes:
+        key = meme_cache_key(template, args)
+        res = self.cache.get(key)
+        if res is not None:
+            return res
+
+        if self.pending >= self.max_pending:
+            raise MemeRendererBusy(f"{self.pending} memes are already rendering")
+
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            res = await loop.run_in_executor(
+                self.executor, render_meme, template, tuple(args)
+            )
+        finally:
+            self.pending -= 1
+
+        self.cache.put(key, res)
+        return res
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        self._executor = None
+
+
+meme_renderer = MemeRenderer.from_env()
+
+
+if __name__ == "__main__":
+    # Benchmark how long each template takes to render in-process
+    import argparse
+    import statistics
+    import time
+
+    from MemePy import MemeFactory
+
+    parser = argparse.ArgumentParser(description="Benchmark meme rendering")
+    parser.add_argument("-n", "--iterations", type=int, default=20)
+    parser.add_argument("templates", nargs="*")
+    opts = parser.parse_args()
+    if opts.iterations < 2:
+        parser.error("need at least 2 iterations for a p99")
+
+    print(f"{'template':<24} {'p50 ms':>8} {'p99 ms':>8} {'KiB':>8}")
+    for name in opts.templates or sorted(MemeFactory.MemeLib):
+        template = MemeFactory.MemeLib[name]
+        args = [f"benchmark text {i}" for i in range(len(template.text_zones))]
+        timings = []
+        size = 0
+        for _ in range(opts.iterations):
+            start = time.perf_counter()
+            size = len(render_meme(name, args))
+            timings.append((time.perf_counter() - start) * 1000)
+        p50 = statistics.median(timings)
+        p99 = statistics.quantiles(timings, n=100, method="inclusive")[98]
+        print(f"{name:<24} {p50:>8.1f} {p99:>8.1f} {size / 1024:>8.0f}")
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+
+import itertools
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, DefaultDict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstanceState, Session, SessionTransaction
+
+from dicebot.core.commit_invalidation import CommitInvalidator
+from dicebot.core.ttl_cache import TTLCache
+from dicebot.data.db.pun import Pun
+from dicebot.data.types.minhash import MinHash
+
+DEFAULT_PUN_INDEX_CACHE_SIZE = 256
+# Puns only get added through the bot (which adds them to the index once
+# they're committed)
+DEFAULT_PUN_INDEX_TTL_SECS = 24 * 60 * 60
+# Above this, setups and punchlines are close enough to call it a repost
+# without asking anyone
+REPOST_SIMILARITY = 0.8
+# Below this, it's not worth asking the LLM to compare
+BORDERLINE_SIMILARITY = 0.4
+
+_Bucket = Tuple[int, Tuple[int, ...]]
+
+
+@dataclass(frozen=True)
+class PunMatch:
+    pun: Pun
+    setup_score: float
+    punchline_score: float
+
+    @property
+    def is_repost(self) -> bool:
+        return (
+            self.setup_score >= REPOST_SIMILARITY
+            and self.punchline_score >= REPOST_SIMILARITY
+        )
+
+    @property
+    def is_borderline(self) -> bool:
+        # The same punchline with a reworded setup is exactly the kind of thing
+        # the LLM is good at, so always let it take a look
+        return not self.is_repost and (
+            self.punchline_score >= REPOST_SIMILARITY
+            or min(self.setup_score, self.punchline_score) >= BORDERLINE_SIMILARITY
+        )
+
+
+class GuildPunIndex:
+    """MinHash signatures of every pun in a guild, bucketed LSH-style so a
+    lookup only scores the puns that share at least one band with the new
+    setup or punchline"""
+
+    def __init__(self, puns: Iterable[Pun] = ()) -> None:
+        self.entries: List[Tuple[Pun, MinHash, MinHash]] = []
+        self.setup_buckets: DefaultDict[_Bucket, Set[int]] = defaultdict(set)
+        self.punchline_buckets: DefaultDict[_Bucket, Set[int]] = defaultdict(set)
+        for pun in puns:
+            self.add(pun)
+
+    def add(self, pun: Pun) -> None:
+        setup, punchline = pun.signatures()
+        idx = len(self.entries)
+        self.entries.append((pun, setup, punchline))
+        for band in setup.bands():
+            self.setup_buckets[band].add(idx)
+        for band in punchline.bands():
+            self.punchline_buckets[band].add(idx)
+
+    def best_match(self, setup: str, punchline: str) -> Optional[PunMatch]:
+        setup_sig = MinHash.of(setup)
+        punchline_sig = MinHash.of(punchline)
+
+        candidates: Set[int] = set()
+        for band in setup_sig.bands():
+            candidates |= self.setup_buckets.get(band, set())
+        for band in punchline_sig.bands():
+            candidates |= self.punchline_buckets.get(band, set())
+
+        best = None
+        for idx in candidates:
+            pun, pun_setup, pun_punchline = self.entries[idx]
+            match = PunMatch(
+                pun=pun,
+                setup_score=setup_sig.similarity(pun_setup),
+                punchline_score=punchline_sig.similarity(pun_punchline),
+            )
+            if match.is_repost or match.is_borderline:
+                key = (match.is_repost, match.punchline_score + match.setup_score)
+                if best is None or key > best[0]:
+                    best = (key, match)
+        return best[1] if best is not None else None
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+
+class PunIndex:
+    """Per-guild similarity indexes over the pun table, so likely reposts can
+    be found locally instead of by exact punchline match plus an LLM call.
+    A guild's index is built on its first pun. New puns are added to it once
+    they're committed, and it's dropped if an existing one changes."""
+
+    def __init__(
+        self,
+        maxsize: int = DEFAULT_PUN_INDEX_CACHE_SIZE,
+        ttl: float = DEFAULT_PUN_INDEX_TTL_SECS,
+    ) -> None:
+        self.indexes: TTLCache[int, GuildPunIndex] = TTLCache(maxsize, ttl)
+        # Bumped whenever a pun is added or an index dropped, so an index that
+        # was loading at the time (and might be missing it) isn't kept
+        self._generation = 0
+
+    async def get(self, session: AsyncSession, guild_id: int) -> GuildPunIndex:
+        res = self.indexes.get(guild_id)
+        if res is None:
+            generation = self._generation
+            puns = await Pun.get_all_for_guild(session, guild_id)
+            # Detach them so whatever happens to this session later can't
+            # expire the copies the index holds on to
+            for pun in puns:
+                session.expunge(pun)
+            res = GuildPunIndex(puns)
+            if generation == self._generation:
+                self.indexes.put(guild_id, res)
+        return res
+
+    def add(self, pun: Pun) -> None:
+        """Add a newly committed pun to its guild's index, if that's loaded"""
+        self._generation += 1
+        index = self.indexes.get(pun.guild_id)
+        if index is not None:
+            index.add(pun)
+
+    async def find_match(
+        self, session: AsyncSession, guild_id: int, setup: str, punchline: str
+    ) -> Optional[PunMatch]:
+        index = await self.get(session, guild_id)
+        return index.best_match(setup, punchline)
+
+    def invalidate(self, guild_id: int) -> None:
+        self._generation += 1
+        self.indexes.invalidate(guild_id)
+
+    def clear(self) -> None:
+        self._generation += 1
+        self.indexes.clear()
+
+
+pun_index = PunIndex()
+_invalidate_guild: CommitInvalidator[int] = CommitInvalidator(
+    "pun_index", pun_index.invalidate
+)
+_PENDING_PUNS_KEY = "dicebot.pun_index.pending"
+
+
+def _detached_copy(pun: Pun) -> Pun:
+    # The session's copy can be expired or lazy load later, and the index is
+    # shared by every session. posted_at is a server default, so it isn't
+    # loaded yet.
+    state: InstanceState[Pun] = inspect(pun)
+    return Pun(
+        **{
+            attr.key: getattr(pun, attr.key)
+            for attr in state.mapper.column_attrs
+            if attr.key not in state.unloaded
+        }
+    )
+
+
+@event.listens_for(Session, "after_flush")
+def _track_flushed(session: Session, flush_context: Any) -> None:
+    for obj in session.new:
+        if isinstance(obj, Pun):
+            pending: List[Pun] = session.info.setdefault(_PENDING_PUNS_KEY, [])
+            pending.append(_detached_copy(obj))
+    for obj in itertools.chain(session.dirty, session.deleted):
+        if isinstance(obj, Pun):
+            _invalidate_guild(session, obj.guild_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _index_committed(session: Session) -> None:
+    for pun in session.info.pop(_PENDING_PUNS_KEY, ()):
+        pun_index.add(pun)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _forget_rolled_back(
+    session: Session, previous_transaction: SessionTransaction
+) -> None:
+    # Even if only a savepoint went, there's no telling which of these it took
+    # with it, so start their guilds over
+    for pun in session.info.pop(_PENDING_PUNS_KEY, ()):
+        pun_index.invalidate(pun.guild_id)
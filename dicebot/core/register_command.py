@@ -1,10 +1,13 @@
 #!/usr/bin/env python3
 
 import functools
+from typing import List
+
+from dicebot.core.command_signature import CommandFunc
 
 # This will get populated with the register_command
 # decorator below
-REGISTERED_COMMANDS = []
+REGISTERED_COMMANDS: List[CommandFunc] = []
 
 
 def register_command(coro):
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+import abc
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+from typing import Any, Optional
+
+import redis.asyncio as aioredis
+
+from dicebot.core.ttl_cache import TTLCache
+
+DEFAULT_RESPONSE_CACHE_SIZE = 2048
+DEFAULT_RESPONSE_CACHE_TTL_SECS = 3600
+RESPONSE_CACHE_KEY_PREFIX = "dicebot:ask:"
+
+_WHITESPACE_REGEX = re.compile(r"\s+")
+
+
+def normalize_prompt(prompt: str) -> str:
+    # Discord users are inconsistent about trailing newlines and double spaces,
+    # neither of which changes what we'd get back from the model
+    return _WHITESPACE_REGEX.sub(" ", prompt).strip()
+
+
+def response_cache_key(
+    model: str,
+    messages: list[dict[str, str]],
+    temperature: float,
+    tool_ids: Optional[list[str]] = None,
+) -> str:
+    payload = {
+        "model": model,
+        "messages": [
+            {"role": m["role"], "content": normalize_prompt(m["content"])}
+            for m in messages
+        ],
+        "temperature": temperature,
+        "tool_ids": sorted(tool_ids or []),
+    }
+    digest = hashlib.sha256(
+        json.dumps(payload, sort_keys=True).encode("utf-8")
+    ).hexdigest()
+    return f"{RESPONSE_CACHE_KEY_PREFIX}{digest}"
+
+
+class ResponseCache(abc.ABC):
+    """Somewhere to keep LLM responses so asking the same question twice
+    doesn't mean paying for it twice. Backend failures must never break the
+    caller, so implementations treat errors as a miss."""
+
+    @abc.abstractmethod
+    async def get(self, key: str) -> Optional[str]:
+        pass
+
+    @abc.abstractmethod
+    async def put(self, key: str, value: str, ttl: float) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+
+class InMemoryResponseCache(ResponseCache):
+    def __init__(self, maxsize: int = DEFAULT_RESPONSE_CACHE_SIZE) -> None:
+        self.entries: TTLCache[str, str] = TTLCache(
+            maxsize, DEFAULT_RESPONSE_CACHE_TTL_SECS
+        )
+
+    async def get(self, key: str) -> Optional[str]:
+        return self.entries.get(key)
+
+    async def put(self, key: str, value: str, ttl: float) -> None:
+        self.entries.put(key, value, ttl=ttl)
+
+    def clear(self) -> None:
+        self.entries.clear()
+
+
+class RedisResponseCache(ResponseCache):
+    """Shares responses between the bot and the Celery workers. Like the
+    aiohttp session, a redis.asyncio client is bound to the loop it was made
+    on, so a new one is made if the running loop changed."""
+
+    def __init__(self, url: str) -> None:
+        self.url = url
+        self._client: Optional[Any] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def client(self) -> Any:
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            self._client = aioredis.Redis.from_url(self.url, decode_responses=True)
+            self._loop = loop
+        return self._client
+
+    async def get(self, key: str) -> Optional[str]:
+        try:
+            return await self.client.get(key)
+        except Exception:
+            logging.exception("Failed to read response cache from redis")
+            return None
+
+    async def put(self, key: str, value: str, ttl: float) -> None:
+        try:
+            await self.client.set(key, value, px=int(ttl * 1000))
+        except Exception:
+            logging.exception("Failed to write response cache to redis")
+
+    async def close(self) -> None:
+        if self._client is not None:
+            # redis<5 only has close(), which 5.x deprecated for aclose()
+            close = getattr(self._client, "aclose", None) or self._client.close
+            await close()
+        self._client = None
+        self._loop = None
+
+
+def response_cache_from_env() -> ResponseCache:
+    url = os.getenv("ASK_CACHE_REDIS_URL")
+    if url:
+        return RedisResponseCache(url)
+    return InMemoryResponseCache(
+        int(os.getenv("ASK_CACHE_SIZE", DEFAULT_RESPONSE_CACHE_SIZE))
+    )
+
+
+response_cache = response_cache_from_env()
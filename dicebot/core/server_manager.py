@@ -1,10 +1,10 @@
 #!/usr/bin/env python3
 
 import discord
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from dicebot.core.guild_context import GuildContext
-from dicebot.data.db.guild import Guild
+from dicebot.core.identity_cache import identity_cache
 
 
 class UnsupportedChannelException(ValueError):
@@ -12,8 +12,11 @@ class UnsupportedChannelException(ValueError):
 
 
 class ServerManager:
-    def __init__(self, session: AsyncSession) -> None:
+    def __init__(
+        self, session: AsyncSession, sessionmaker: async_sessionmaker[AsyncSession]
+    ) -> None:
         self.session = session
+        self.sessionmaker = sessionmaker
 
     async def handle_message(
         self,
@@ -23,13 +26,13 @@ class ServerManager:
     ) -> None:
         if isinstance(message.channel, discord.DMChannel):
             # For a DM, the person who sent it is the owner
-            guild = await Guild.get_or_create(
+            guild = await identity_cache.get_guild(
                 session=self.session,
                 guild_id=message.channel.id,
                 owner_id=message.author.id,
                 is_dm=True,
             )
-            ctx = GuildContext(client, guild, self.session)
+            ctx = GuildContext(client, guild, self.session, self.sessionmaker)
             await ctx.handle_dm(message, is_test)
         else:
             if message.channel.guild is None:
@@ -40,13 +43,13 @@ class ServerManager:
                 raise UnsupportedChannelException(
                     "The bot is not available in guilds without an owner"
                 )
-            guild = await Guild.get_or_create(
+            guild = await identity_cache.get_guild(
                 session=self.session,
                 guild_id=message.channel.guild.id,
                 owner_id=message.channel.guild.owner.id,
                 is_dm=False,
             )
-            ctx = GuildContext(client, guild, self.session)
+            ctx = GuildContext(client, guild, self.session, self.sessionmaker)
             await ctx.handle_message(message, is_test)
 
     async def handle_reaction_add(
@@ -58,7 +61,7 @@ class ServerManager:
     ) -> None:
         if isinstance(reaction.message.channel, discord.DMChannel):
             # For a DM, the person who sent it is the owner
-            guild = await Guild.get_or_create(
+            guild = await identity_cache.get_guild(
                 session=self.session,
                 guild_id=reaction.message.channel.id,
                 owner_id=reaction.message.author.id,
@@ -73,12 +76,12 @@ class ServerManager:
                 raise UnsupportedChannelException(
                     "The bot is not available in guilds without an owner"
                 )
-            guild = await Guild.get_or_create(
+            guild = await identity_cache.get_guild(
                 session=self.session,
                 guild_id=reaction.message.channel.guild.id,
                 owner_id=reaction.message.channel.guild.owner.id,
                 is_dm=False,
             )
 
-        ctx = GuildContext(client, guild, self.session)
+        ctx = GuildContext(client, guild, self.session, self.sessionmaker)
         await ctx.handle_reaction_add(reaction, user, is_test)
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+
+import datetime
+import unittest
+from unittest.mock import AsyncMock, patch
+
+from dicebot.core.ban_cache import BanStateCache, ban_cache
+from dicebot.data.db.ban import Ban
+from dicebot.data.db.guild import Guild
+from dicebot.data.db.user import User
+from dicebot.test.utils import DatabaseTestCase
+
+GUILD_ID = 1
+OWNER_ID = 101
+USER_ID = 102
+
+
+class TestBanStateCache(DatabaseTestCase):
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        async with self.sessionmaker() as session:
+            self.guild = await Guild.get_or_create(session, GUILD_ID, OWNER_ID, False)
+            self.user = await User.get_or_create(session, USER_ID)
+
+    async def asyncTearDown(self):
+        ban_cache.clear()
+        await super().asyncTearDown()
+
+    async def _ban(self, hours: int) -> None:
+        async with self.sessionmaker() as session:
+            session.add(
+                Ban(
+                    guild_id=GUILD_ID,
+                    bannee_id=USER_ID,
+                    banner_id=OWNER_ID,
+                    reason="test",
+                    banned_until=datetime.datetime.now()
+                    + datetime.timedelta(hours=hours),
+                )
+            )
+            await session.commit()
+
+    async def test_not_banned_is_cached(self):
+        """Only the first check for a user who isn't banned hits the database."""
+        cache = BanStateCache()
+        get_latest = AsyncMock(side_effect=Ban.get_latest_unvoided_ban)
+        with patch(
+            "dicebot.core.ban_cache.Ban.get_latest_unvoided_ban", new=get_latest
+        ):
+            for _ in range(3):
+                async with self.sessionmaker() as session:
+                    banned = await cache.is_currently_banned(
+                        session, self.guild, self.user
+                    )
+                    self.assertFalse(banned)
+        get_latest.assert_awaited_once()
+
+    async def test_new_ban_invalidates(self):
+        """Inserting a ban drops the cached "not banned" entry."""
+        async with self.sessionmaker() as session:
+            self.assertFalse(
+                await ban_cache.is_currently_banned(session, self.guild, self.user)
+            )
+        await self._ban(hours=1)
+        async with self.sessionmaker() as session:
+            self.assertTrue(
+                await ban_cache.is_currently_banned(session, self.guild, self.user)
+            )
+
+    async def test_commit_invalidates_entry_cached_since_flush(self):
+        """A "not banned" read between the flush and the commit of a new ban
+        doesn't outlive the commit."""
+        async with self.sessionmaker() as session:
+            session.add(
+                Ban(
+                    guild_id=GUILD_ID,
+                    bannee_id=USER_ID,
+                    banner_id=OWNER_ID,
+                    reason="test",
+                    banned_until=datetime.datetime.now() + datetime.timedelta(hours=1),
+                )
+            )
+            await session.flush()
+            # What another session would have seen before the commit
+            ban_cache.entries.put((GUILD_ID, USER_ID), (None,))
+            await session.commit()
+        self.assertIsNone(ban_cache.entries.get((GUILD_ID, USER_ID)))
+
+    async def test_unban_invalidates(self):
+        """The bulk UPDATE in Ban.unban clears the cache."""
+        await self._ban(hours=1)
+        async with self.sessionmaker() as session:
+            self.assertTrue(
+                await ban_cache.is_currently_banned(session, self.guild, self.user)
+            )
+        async with self.sessionmaker() as session:
+            await Ban.unban(session, self.guild, self.user)
+            await session.commit()
+        async with self.sessionmaker() as session:
+            self.assertFalse(
+                await ban_cache.is_currently_banned(session, self.guild, self.user)
+            )
+
+    async def test_expired_ban(self):
+        """A cached ban that has run out no longer counts."""
+        cache = BanStateCache()
+        cache.entries.put(
+            (GUILD_ID, USER_ID),
+            (datetime.datetime.now() - datetime.timedelta(seconds=1),),
+        )
+        async with self.sessionmaker() as session:
+            self.assertFalse(
+                await cache.is_currently_banned(session, self.guild, self.user)
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
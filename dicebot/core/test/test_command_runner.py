@@ -2,14 +2,24 @@
 Unit tests for CommandRunner in dicebot.core.command_runner
 """
 import unittest
-from unittest.mock import AsyncMock
+from typing import Optional
+from unittest.mock import AsyncMock, patch
 
 from dicebot.core.command_runner import CommandRunner
+from dicebot.core.command_signature import CommandSignature, get_signature
+from dicebot.data.types.greedy_str import GreedyStr
 from dicebot.data.types.message_context import MessageContext
 from dicebot.test.utils import TestMessageContext
 
 
 class TestCommandRunner(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        patcher = patch("dicebot.core.command_runner.command_tables")
+        self.tables = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.tables.resolve_alias = AsyncMock(return_value=None)
+        self.tables.resolve_macro = AsyncMock(return_value=None)
+
     async def test_builtin_command(self):
         """A registered command should be called when invoked"""
         # Define a dummy command
@@ -22,7 +32,6 @@ class TestCommandRunner(unittest.IsolatedAsyncioTestCase):
         # Prepare context for '!dummy'
         ctx = TestMessageContext.get("!dummy")
         ctx.send = AsyncMock()
-        ctx.guild.get_alias = AsyncMock(return_value=None)
 
         # Invoke
         await runner.call(ctx)
@@ -37,10 +46,7 @@ class TestCommandRunner(unittest.IsolatedAsyncioTestCase):
         # Prepare context for '!foobar'
         ctx = TestMessageContext.get("!foobar")
         ctx.send = AsyncMock()
-        ctx.guild.get_alias = AsyncMock(return_value=None)
-        # Simulate a macro object with a value attribute
-        macro_obj = type("Macro", (), {"value": "macro value"})()
-        ctx.guild.get_macro = AsyncMock(return_value=macro_obj)
+        self.tables.resolve_macro.return_value = "macro value"
 
         # Invoke
         await runner.call(ctx)
@@ -55,9 +61,64 @@ class TestCommandRunner(unittest.IsolatedAsyncioTestCase):
         # Prepare context for '!unknown'
         ctx = TestMessageContext.get("!unknown")
         ctx.send = AsyncMock()
-        ctx.guild.get_alias = AsyncMock(return_value=None)
-        ctx.guild.get_macro = AsyncMock(return_value=None)
 
         # Invoke and expect KeyError
         with self.assertRaises(KeyError):
-            await runner.call(ctx)
\ No newline at end of file
+            await runner.call(ctx)
+
+    async def test_typify_all_greedy_and_optional(self):
+        """The compiled plan converts args, globs GreedyStr and unwraps Optional"""
+
+        async def cmd(ctx: MessageContext, n: Optional[int], rest: GreedyStr) -> None:
+            pass
+
+        runner = CommandRunner(cmds=[cmd])
+        ctx = TestMessageContext.get("!cmd 3 a b c")
+        res = await runner.typify_all(ctx, cmd, ["3", "a", "b", "c"])
+        self.assertEqual(3, res["n"])
+        self.assertIsInstance(res["rest"], GreedyStr)
+        self.assertEqual("a b c", res["rest"].unwrap())
+
+    async def test_typify_all_requires_ctx(self):
+        """Commands without a MessageContext param still fail when called"""
+
+        async def no_ctx(n: int) -> None:
+            pass
+
+        runner = CommandRunner(cmds=[no_ctx])
+        ctx = TestMessageContext.get("!no_ctx 1")
+        with self.assertRaises(TypeError):
+            await runner.typify_all(ctx, no_ctx, ["1"])
+
+    async def test_signature_compiled_once(self):
+        """Dispatching a command doesn't re-inspect its signature"""
+
+        async def once(ctx: MessageContext, n: int) -> None:
+            pass
+
+        runner = CommandRunner(cmds=[once])
+        self.assertIs(get_signature(once), get_signature(once))
+        with patch.object(CommandSignature, "compile") as mock_compile:
+            ctx = TestMessageContext.get("!once 1")
+            await runner.typify_all(ctx, once, ["1"])
+            mock_compile.assert_not_called()
+        self.assertEqual("__!once__ <n>", runner.help_index["once"])
+        self.assertEqual("Available commands: !once", runner.command_list())
+
+    async def test_alias_resolution(self):
+        """Aliases are resolved from the guild's command table"""
+
+        async def target(ctx: MessageContext) -> None:
+            await ctx.send("target called")
+
+        runner = CommandRunner(cmds=[target])
+        ctx = TestMessageContext.get("!shortcut")
+        ctx.send = AsyncMock()
+        self.tables.resolve_alias.return_value = "target"
+
+        await runner.call(ctx)
+
+        self.tables.resolve_alias.assert_awaited_once_with(
+            ctx.session, ctx.guild, "shortcut"
+        )
+        ctx.send.assert_awaited_once_with("target called")
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+
+import unittest
+from unittest.mock import AsyncMock, patch
+
+from sqlalchemy.exc import IntegrityError
+
+from dicebot.core.command_table import CommandTableCache, command_tables
+from dicebot.data.db.alias import Alias
+from dicebot.data.db.guild import Guild
+from dicebot.data.db.macro import Macro
+from dicebot.data.db.user import User
+from dicebot.test.utils import DatabaseTestCase
+
+GUILD_ID = 1
+OWNER_ID = 101
+
+
+class TestCommandTableCache(DatabaseTestCase):
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        async with self.sessionmaker() as session:
+            self.guild = await Guild.get_or_create(session, GUILD_ID, OWNER_ID, False)
+            self.owner = await User.get_or_create(session, OWNER_ID)
+            await self.guild.add_alias(session, "r", "roll", self.owner)
+            await self.guild.add_macro(session, "hi", "hello there", self.owner)
+            await session.commit()
+
+    async def asyncTearDown(self):
+        command_tables.clear()
+        await super().asyncTearDown()
+
+    async def test_table_loaded_once(self):
+        """Resolving commands after the first lookup doesn't hit the database."""
+        cache = CommandTableCache()
+        get_aliases = AsyncMock(side_effect=Alias.get_key_values)
+        with patch("dicebot.core.command_table.Alias.get_key_values", new=get_aliases):
+            async with self.sessionmaker() as session:
+                self.assertEqual(
+                    "roll", await cache.resolve_alias(session, self.guild, "r")
+                )
+                self.assertEqual(
+                    "hello there", await cache.resolve_macro(session, self.guild, "hi")
+                )
+                self.assertIsNone(await cache.resolve_alias(session, self.guild, "x"))
+        get_aliases.assert_awaited_once()
+
+    async def test_add_and_delete_invalidate(self):
+        """Adding, changing or deleting a macro keeps the table coherent."""
+        async with self.sessionmaker() as session:
+            self.assertIsNone(
+                await command_tables.resolve_macro(session, self.guild, "bye")
+            )
+            await self.guild.add_macro(session, "bye", "see ya", self.owner)
+            await session.commit()
+            self.assertEqual(
+                "see ya", await command_tables.resolve_macro(session, self.guild, "bye")
+            )
+
+            macro = await Macro.get(session, self.guild, "bye")
+            await session.delete(macro)
+            await session.commit()
+            self.assertIsNone(
+                await command_tables.resolve_macro(session, self.guild, "bye")
+            )
+
+    async def test_commit_invalidates_table_cached_since_flush(self):
+        """A table loaded between the flush and the commit doesn't outlive it."""
+        async with self.sessionmaker() as session:
+            await self.guild.add_macro(session, "bye", "see ya", self.owner)
+            await session.flush()
+            # What another session would have loaded before the commit
+            async with self.sessionmaker() as other:
+                await command_tables.get(other, self.guild)
+            self.assertIsNotNone(command_tables.tables.get(GUILD_ID))
+            await session.commit()
+        self.assertIsNone(command_tables.tables.get(GUILD_ID))
+
+    async def test_alias_unique_per_guild(self):
+        """The (guild_id, key) constraint rejects duplicate aliases."""
+        async with self.sessionmaker() as session:
+            session.add(
+                Alias(guild_id=GUILD_ID, added_by=OWNER_ID, key="r", value="ban")
+            )
+            with self.assertRaises(IntegrityError):
+                await session.commit()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+
+import datetime
+import time
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from sqlalchemy import inspect
+
+from dicebot.core.event_cache import EVENT_STARTED_CHANNEL, ActiveEventCache
+from dicebot.data.db.active_event import ActiveEvent, EventType
+from dicebot.data.db.guild import Guild
+from dicebot.test.utils import DatabaseTestCase
+
+GUILD_ID = 1
+OWNER_ID = 101
+
+
+class TestActiveEventCache(DatabaseTestCase):
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        async with self.sessionmaker() as session:
+            await Guild.get_or_create(session, GUILD_ID, OWNER_ID, False)
+        self.get_current = AsyncMock(side_effect=ActiveEvent.get_current)
+        patcher = patch(
+            "dicebot.core.event_cache.ActiveEvent.get_current", new=self.get_current
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def _start_event(self, hours: int) -> None:
+        now = datetime.datetime.now()
+        async with self.sessionmaker() as session:
+            await ActiveEvent.start_many(
+                session,
+                {GUILD_ID: EventType.TURBO_DAY},
+                now,
+                now + datetime.timedelta(hours=hours),
+            )
+            await session.commit()
+
+    async def _get(self, cache: ActiveEventCache):
+        async with self.sessionmaker() as session:
+            return await cache.get_current(session, GUILD_ID)
+
+    async def test_no_event_is_cached(self):
+        """Only the first lookup for a guild without an event hits the database."""
+        cache = ActiveEventCache()
+        for _ in range(3):
+            self.assertIsNone(await self._get(cache))
+        self.get_current.assert_awaited_once()
+
+    async def test_event_is_cached_until_it_expires(self):
+        await self._start_event(hours=2)
+        cache = ActiveEventCache()
+
+        event = await self._get(cache)
+        self.assertIs(EventType.TURBO_DAY, event.event_type_enum)
+        # Not tied to the session that loaded it
+        self.assertTrue(inspect(event).transient)
+        self.assertIs(event, await self._get(cache))
+        self.get_current.assert_awaited_once()
+
+        later = time.monotonic() + 2 * 60 * 60 + 1
+        with patch("dicebot.core.ttl_cache.time") as mock_time:
+            mock_time.monotonic.return_value = later
+            await self._get(cache)
+        self.assertEqual(2, self.get_current.await_count)
+
+    async def test_publish_started_invalidates(self):
+        """Starting an event drops the cached "no event" for the guild."""
+        cache = ActiveEventCache()
+        self.assertIsNone(await self._get(cache))
+
+        await self._start_event(hours=24)
+        await cache.publish_started([GUILD_ID])
+
+        event = await self._get(cache)
+        self.assertIsNotNone(event)
+        self.assertIs(EventType.TURBO_DAY, event.event_type_enum)
+
+    async def test_invalidation_during_lookup(self):
+        """A lookup that raced with an invalidation isn't cached."""
+        cache = ActiveEventCache()
+
+        async def get_current(session, guild_id):
+            cache.invalidate(guild_id)
+            return None
+
+        self.get_current.side_effect = get_current
+        self.assertIsNone(await self._get(cache))
+        self.assertIsNone(await self._get(cache))
+        self.assertEqual(2, self.get_current.await_count)
+
+    def test_handle_message(self):
+        cache = ActiveEventCache()
+        for guild_id in (1, 2, 3):
+            cache.entries.put(guild_id, (None,))
+
+        cache.handle_message("1 3")
+        self.assertEqual([False, True, False], [g in cache.entries for g in (1, 2, 3)])
+
+        with patch("dicebot.core.event_cache.logging") as mock_logging:
+            cache.handle_message("not a guild")
+        mock_logging.warning.assert_called_once()
+        self.assertEqual(0, len(cache.entries))
+
+    async def test_publish_started(self):
+        cache = ActiveEventCache(redis_url="redis://localhost:1")
+        client = MagicMock()
+        client.publish = AsyncMock()
+        client.aclose = AsyncMock()
+        with patch(
+            "dicebot.core.event_cache.aioredis.Redis.from_url", return_value=client
+        ):
+            await cache.publish_started([1, 2])
+        client.publish.assert_awaited_once_with(EVENT_STARTED_CHANNEL, "1 2")
+        client.aclose.assert_awaited_once()
+
+    async def test_publish_errors_are_logged(self):
+        cache = ActiveEventCache(redis_url="redis://localhost:1")
+        cache.entries.put(GUILD_ID, (None,))
+        client = MagicMock()
+        client.publish = AsyncMock(side_effect=ConnectionError)
+        client.aclose = AsyncMock()
+        with patch(
+            "dicebot.core.event_cache.aioredis.Redis.from_url", return_value=client
+        ), patch("dicebot.core.event_cache.logging") as mock_logging:
+            await cache.publish_started([GUILD_ID])
+        mock_logging.exception.assert_called_once()
+        # The local copy still goes
+        self.assertNotIn(GUILD_ID, cache.entries)
+
+
+if __name__ == "__main__":
+    unittest.main()
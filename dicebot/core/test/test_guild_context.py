@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+
+import asyncio
+from typing import List
+from unittest.mock import AsyncMock, MagicMock, create_autospec, patch
+
+import discord
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from dicebot.core.guild_context import GuildContext
+from dicebot.data.db.guild import Guild
+from dicebot.data.db.user import User
+from dicebot.data.types.message_context import MessageContext
+from dicebot.handlers.message.abstract_handler import AbstractHandler
+from dicebot.handlers.message.ban_handler import BanHandler
+from dicebot.handlers.message.command_handler import CommandHandler
+from dicebot.handlers.message.log_message_handler import LogMessageHandler
+from dicebot.handlers.message.shame_handler import ShameHandler
+from dicebot.test.utils import DicebotTestCase
+
+
+class _RecordingHandler(AbstractHandler):
+    def __init__(self, log: List[str]) -> None:
+        self.log = log
+        self.sessions: List[AsyncSession] = []
+
+    async def should_handle(self, ctx: MessageContext) -> bool:
+        self.sessions.append(ctx.session)
+        return True
+
+    async def handle(self, ctx: MessageContext) -> None:
+        self.log.append(type(self).__name__)
+
+
+class _SlowHandler(_RecordingHandler):
+    async def handle(self, ctx: MessageContext) -> None:
+        await asyncio.sleep(0.05)
+        ctx.state["slow"] = True
+        await super().handle(ctx)
+
+
+class _FastHandler(_RecordingHandler):
+    pass
+
+
+class _FirstHandler(_RecordingHandler):
+    runs_first = True
+
+    async def handle(self, ctx: MessageContext) -> None:
+        await asyncio.sleep(0.05)
+        await super().handle(ctx)
+
+
+class _DependentHandler(_RecordingHandler):
+    runs_after = [_SlowHandler]
+
+    async def handle(self, ctx: MessageContext) -> None:
+        assert ctx.state.get("slow")
+        await super().handle(ctx)
+
+
+def _sessionmaker() -> MagicMock:
+    def new_session():
+        cm = MagicMock()
+        cm.__aenter__ = AsyncMock(return_value=create_autospec(AsyncSession))
+        cm.__aexit__ = AsyncMock(return_value=False)
+        return cm
+
+    return MagicMock(side_effect=new_session)
+
+
+class TestGuildContext(DicebotTestCase):
+    async def _handle(self, handlers: List[AbstractHandler]) -> None:
+        message = create_autospec(discord.Message)
+        message.content = "hello"
+        message.embeds = []
+        message.reference = None
+        gctx = GuildContext(
+            create_autospec(discord.Client),
+            create_autospec(Guild),
+            create_autospec(AsyncSession),
+            _sessionmaker(),
+        )
+        with patch(
+            "dicebot.core.guild_context.identity_cache.get_user",
+            new=AsyncMock(return_value=create_autospec(User)),
+        ), patch(
+            "dicebot.core.guild_context.merge_into",
+            new=AsyncMock(side_effect=lambda session, obj: obj),
+        ), patch(
+            "dicebot.core.guild_context.MESSAGE_HANDLERS"
+        ) as mock_registry:
+            mock_registry.for_guild.return_value = handlers
+            await gctx.handle_message(message, is_test=True)
+
+    async def test_independent_handlers_run_concurrently(self) -> None:
+        log: List[str] = []
+        slow = _SlowHandler(log)
+        fast = _FastHandler(log)
+        await self._handle([slow, fast])
+        # The fast handler didn't have to wait for the slow one
+        self.assertEqual(["_FastHandler", "_SlowHandler"], log)
+
+    async def test_dependent_handler_waits(self) -> None:
+        log: List[str] = []
+        await self._handle(
+            [_SlowHandler(log), _DependentHandler(log), _FastHandler(log)]
+        )
+        self.assertEqual(["_FastHandler", "_SlowHandler", "_DependentHandler"], log)
+
+    async def test_runs_first_handler_finishes_before_others_start(self) -> None:
+        log: List[str] = []
+        # Even though it yields, nothing else starts until it's done
+        await self._handle([_FastHandler(log), _FirstHandler(log)])
+        self.assertEqual(["_FirstHandler", "_FastHandler"], log)
+
+    def test_message_handler_ordering(self) -> None:
+        # These used to hold only because the handlers ran one at a time in
+        # registry order, so they have to be declared now
+        self.assertTrue(LogMessageHandler.runs_first)
+        self.assertIn(BanHandler, CommandHandler.runs_after)
+        self.assertIn(CommandHandler, ShameHandler.runs_after)
+
+    async def test_each_handler_gets_own_session(self) -> None:
+        log: List[str] = []
+        slow = _SlowHandler(log)
+        fast = _FastHandler(log)
+        await self._handle([slow, fast])
+        self.assertEqual(1, len(slow.sessions))
+        self.assertEqual(1, len(fast.sessions))
+        self.assertIsNot(slow.sessions[0], fast.sessions[0])
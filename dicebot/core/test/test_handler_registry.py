@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+
+import unittest
+from unittest.mock import MagicMock
+
+from dicebot.core.handler_registry import (
+    HandlerRegistry,
+    RegisteredHandler,
+    disabled_handler_feature,
+)
+from dicebot.data.db.feature import Feature
+
+
+def _guild_with_features(*names: str) -> MagicMock:
+    guild = MagicMock()
+    guild.features = [Feature(feature_name=name) for name in names]
+    return guild
+
+
+class TestHandlerRegistry(unittest.TestCase):
+    def setUp(self) -> None:
+        self.registry = HandlerRegistry(
+            [
+                RegisteredHandler("log", "log_handler", required=True),
+                RegisteredHandler("pun", "pun_handler"),
+                RegisteredHandler("repost", "repost_handler"),
+            ]
+        )
+
+    def test_no_features(self) -> None:
+        guild = _guild_with_features()
+        self.assertEqual(
+            ["log_handler", "pun_handler", "repost_handler"],
+            self.registry.for_guild(guild),
+        )
+
+    def test_disabled_handler_is_skipped(self) -> None:
+        guild = _guild_with_features(disabled_handler_feature("pun"), "unrelated")
+        self.assertEqual(
+            ["log_handler", "repost_handler"], self.registry.for_guild(guild)
+        )
+
+    def test_required_handler_cannot_be_disabled(self) -> None:
+        guild = _guild_with_features(disabled_handler_feature("log"))
+        self.assertIn("log_handler", self.registry.for_guild(guild))
+        self.assertEqual(["pun", "repost"], self.registry.optional_names())
+
+    def test_filtered_list_is_reused(self) -> None:
+        first = self.registry.for_guild(_guild_with_features())
+        second = self.registry.for_guild(_guild_with_features())
+        self.assertIs(first, second)
+
+    def test_duplicate_names(self) -> None:
+        with self.assertRaises(ValueError):
+            HandlerRegistry(
+                [RegisteredHandler("pun", "a"), RegisteredHandler("pun", "b")]
+            )
+
+    def test_shared_command_handler(self) -> None:
+        from dicebot.handlers.registry import DM_HANDLERS, MESSAGE_HANDLERS
+
+        guild = _guild_with_features()
+        message_handlers = MESSAGE_HANDLERS.for_guild(guild)
+        dm_handlers = DM_HANDLERS.for_guild(guild)
+        # Should be the exact same CommandHandler (and CommandRunner) instance
+        self.assertIs(message_handlers[3], dm_handlers[1])
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+
+import asyncio
+import unittest
+
+from dicebot.core.http_client import HttpClient
+
+
+class TestHttpClient(unittest.IsolatedAsyncioTestCase):
+    async def test_session_is_shared(self):
+        """Every caller gets the same pooled session until it's closed."""
+        client = HttpClient(
+            connect_timeout=1, read_timeout=2, max_connections_per_host=3
+        )
+        await client.start()
+        session = client.session
+        self.assertIs(session, client.session)
+        self.assertEqual(3, session.connector.limit_per_host)
+        self.assertEqual(1, session.timeout.sock_connect)
+        self.assertEqual(2, session.timeout.sock_read)
+
+        await client.close()
+        self.assertTrue(session.closed)
+
+        # Using it again after close gets a fresh session
+        new_session = client.session
+        self.assertIsNot(session, new_session)
+        self.assertFalse(new_session.closed)
+        await client.close()
+
+    async def test_new_session_per_loop(self):
+        """Sessions are bound to a loop, so a different loop gets its own."""
+        client = HttpClient()
+        session = client.session
+
+        def other_loop_session():
+            async def get():
+                res = client.session
+                await res.close()
+                return res
+
+            return asyncio.run(get())
+
+        other = await asyncio.to_thread(other_loop_session)
+        self.assertIsNot(session, other)
+        await session.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+
+import datetime
+import unittest
+from unittest.mock import AsyncMock, patch
+
+from dicebot.core.identity_cache import IdentityCache, identity_cache, merge_into
+from dicebot.data.db.guild import Guild
+from dicebot.data.db.user import User
+from dicebot.test.utils import DatabaseTestCase
+
+GUILD_ID = 1
+OWNER_ID = 101
+USER_ID = 102
+
+
+class TestIdentityCache(DatabaseTestCase):
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        # Create the rows up front so they're fully loaded on the next lookup
+        async with self.sessionmaker() as session:
+            await Guild.get_or_create(session, GUILD_ID, OWNER_ID, is_dm=False)
+            await User.get_or_create(session, USER_ID)
+        self.cache = IdentityCache()
+
+    async def asyncTearDown(self):
+        identity_cache.clear()
+        await super().asyncTearDown()
+
+    async def test_guild_served_from_cache(self):
+        """A second lookup in a new session doesn't hit the database."""
+        get_or_create = AsyncMock(side_effect=Guild.get_or_create)
+        with patch(
+            "dicebot.core.identity_cache.Guild.get_or_create", new=get_or_create
+        ):
+            async with self.sessionmaker() as session:
+                first = await self.cache.get_guild(session, GUILD_ID, OWNER_ID, False)
+            async with self.sessionmaker() as session:
+                second = await self.cache.get_guild(session, GUILD_ID, OWNER_ID, False)
+                self.assertIn(second, session)
+                self.assertEqual(OWNER_ID, second.admins[0].id)
+
+        get_or_create.assert_awaited_once()
+        self.assertIsNot(first, second)
+        self.assertEqual(first.id, second.id)
+
+    async def test_user_served_from_cache(self):
+        """Users merged from the cache share identity with the guild's admins."""
+        get_or_create = AsyncMock(side_effect=User.get_or_create)
+        async with self.sessionmaker() as session:
+            await self.cache.get_guild(session, GUILD_ID, OWNER_ID, False)
+            await self.cache.get_user(session, OWNER_ID)
+
+        with patch("dicebot.core.identity_cache.User.get_or_create", new=get_or_create):
+            async with self.sessionmaker() as session:
+                guild = await self.cache.get_guild(session, GUILD_ID, OWNER_ID, False)
+                owner = await self.cache.get_user(session, OWNER_ID)
+                self.assertTrue(owner.is_admin_of(guild))
+
+        get_or_create.assert_not_awaited()
+
+    async def test_flush_invalidates_guild(self):
+        """Committing a change to a guild drops it from the global cache."""
+        async with self.sessionmaker() as session:
+            await identity_cache.get_guild(session, GUILD_ID, OWNER_ID, False)
+        self.assertIsNotNone(identity_cache.guilds.get(GUILD_ID))
+
+        async with self.sessionmaker() as session:
+            guild = await identity_cache.get_guild(session, GUILD_ID, OWNER_ID, False)
+            guild.timezone = "UTC"
+            await session.commit()
+        self.assertIsNone(identity_cache.guilds.get(GUILD_ID))
+
+        async with self.sessionmaker() as session:
+            guild = await identity_cache.get_guild(session, GUILD_ID, OWNER_ID, False)
+            self.assertEqual("UTC", guild.timezone)
+
+    async def test_commit_invalidates_guild_cached_since_flush(self):
+        """A lookup between the flush and the commit can't leave the old row
+        cached."""
+        async with self.sessionmaker() as session:
+            stale = await identity_cache.get_guild(session, GUILD_ID, OWNER_ID, False)
+
+        async with self.sessionmaker() as session:
+            guild = await identity_cache.get_guild(session, GUILD_ID, OWNER_ID, False)
+            guild.timezone = "UTC"
+            await session.flush()
+            self.assertIsNone(identity_cache.guilds.get(GUILD_ID))
+            # What another session would have read before the commit
+            identity_cache.guilds.put(GUILD_ID, stale)
+            await session.commit()
+        self.assertIsNone(identity_cache.guilds.get(GUILD_ID))
+
+    async def test_rollback_invalidates_user_cached_since_flush(self):
+        async with self.sessionmaker() as session:
+            stale = await identity_cache.get_user(session, USER_ID)
+
+        async with self.sessionmaker() as session:
+            user = await identity_cache.get_user(session, USER_ID)
+            user.birthday = datetime.datetime(2000, 1, 1)
+            await session.flush()
+            identity_cache.users.put(USER_ID, stale)
+            await session.rollback()
+        self.assertIsNone(identity_cache.users.get(USER_ID))
+
+    async def test_flush_invalidates_admin_change(self):
+        """Adding an admin invalidates the guild entry."""
+        async with self.sessionmaker() as session:
+            await identity_cache.get_guild(session, GUILD_ID, OWNER_ID, False)
+
+        async with self.sessionmaker() as session:
+            guild = await identity_cache.get_guild(session, GUILD_ID, OWNER_ID, False)
+            user = await identity_cache.get_user(session, USER_ID)
+            guild.admins.append(user)
+            await session.commit()
+        self.assertIsNone(identity_cache.guilds.get(GUILD_ID))
+
+        async with self.sessionmaker() as session:
+            guild = await identity_cache.get_guild(session, GUILD_ID, OWNER_ID, False)
+            self.assertEqual({OWNER_ID, USER_ID}, {a.id for a in guild.admins})
+
+    async def test_new_rows_not_cached_until_loaded(self):
+        """A freshly created guild has unloaded attributes, so it isn't cached."""
+        async with self.sessionmaker() as session:
+            await self.cache.get_guild(session, GUILD_ID + 1, OWNER_ID, False)
+        self.assertIsNone(self.cache.guilds.get(GUILD_ID + 1))
+
+        async with self.sessionmaker() as session:
+            await self.cache.get_guild(session, GUILD_ID + 1, OWNER_ID, False)
+        self.assertIsNotNone(self.cache.guilds.get(GUILD_ID + 1))
+
+    async def test_merge_into(self):
+        """Rows loaded in one session can be used from another one."""
+        async with self.sessionmaker() as session:
+            guild = await Guild.get_or_none(session, GUILD_ID)
+            owner = await User.get_or_none(session, OWNER_ID)
+
+        async with self.sessionmaker() as session:
+            merged_guild = await merge_into(session, guild)
+            merged_owner = await merge_into(session, owner)
+            self.assertIn(merged_guild, session)
+            self.assertTrue(merged_owner.is_admin_of(merged_guild))
+
+
+if __name__ == "__main__":
+    unittest.main()
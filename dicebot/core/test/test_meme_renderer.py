@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+
+import asyncio
+import unittest
+from unittest.mock import patch
+
+from dicebot.core.meme_renderer import (
+    ByteLRUCache,
+    MemeRenderer,
+    MemeRendererBusy,
+    meme_cache_key,
+)
+
+
+class TestByteLRUCache(unittest.TestCase):
+    def test_evicts_by_size(self) -> None:
+        cache = ByteLRUCache(max_bytes=10)
+        cache.put("a", b"1234")
+        cache.put("b", b"1234")
+        # Touch a so b is the least recently used
+        self.assertEqual(b"1234", cache.get("a"))
+        cache.put("c", b"1234")
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(b"1234", cache.get("a"))
+        self.assertEqual(8, cache.size)
+
+    def test_replace_and_oversized(self) -> None:
+        cache = ByteLRUCache(max_bytes=10)
+        cache.put("a", b"1234")
+        cache.put("a", b"12")
+        self.assertEqual(2, cache.size)
+        cache.put("huge", b"x" * 11)
+        self.assertIsNone(cache.get("huge"))
+        self.assertEqual(b"12", cache.get("a"))
+
+
+class TestMemeRenderer(unittest.IsolatedAsyncioTestCase):
+    def test_cache_key(self) -> None:
+        key = meme_cache_key("Headache", ["a", "b"])
+        self.assertEqual(key, meme_cache_key("Headache", ("a", "b")))
+        self.assertNotEqual(key, meme_cache_key("Headache", ["a b"]))
+        self.assertNotEqual(key, meme_cache_key("Classy", ["a", "b"]))
+
+    async def test_render_in_pool_and_cache(self) -> None:
+        renderer = MemeRenderer(workers=1)
+        try:
+            res = await renderer.render("ItsRetarded", ["it's", "retarded"])
+            self.assertTrue(res.startswith(b"\x89PNG"))
+            # Workers don't inherit the bot's state by forking
+            self.assertEqual(
+                "forkserver", renderer.executor._mp_context.get_start_method()
+            )
+
+            # Second time doesn't need the pool at all
+            renderer.shutdown()
+            with patch.object(MemeRenderer, "executor") as mock_executor:
+                again = await renderer.render("ItsRetarded", ["it's", "retarded"])
+            self.assertEqual(res, again)
+            mock_executor.submit.assert_not_called()
+        finally:
+            renderer.shutdown()
+
+    async def test_busy(self) -> None:
+        renderer = MemeRenderer(max_pending=1)
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def slow_run_in_executor(executor, fn, *args):
+            started.set()
+            await release.wait()
+            return b"png"
+
+        loop = asyncio.get_running_loop()
+        with patch.object(loop, "run_in_executor", new=slow_run_in_executor):
+            first = asyncio.create_task(renderer.render("Headache", ["a"]))
+            await started.wait()
+            with self.assertRaises(MemeRendererBusy):
+                await renderer.render("Headache", ["b"])
+            release.set()
+            self.assertEqual(b"png", await first)
+            self.assertEqual(0, renderer.pending)
+        renderer.shutdown()
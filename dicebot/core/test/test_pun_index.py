@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+
+import unittest
+from unittest.mock import AsyncMock, create_autospec, patch
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from dicebot.core.pun_index import GuildPunIndex, PunIndex, pun_index
+from dicebot.data.db.pun import Pun
+from dicebot.data.types.minhash import MinHash, normalize_text
+from dicebot.test.utils import DatabaseTestCase
+
+
+def _pun(setup: str, punchline: str, with_signatures: bool = True) -> Pun:
+    pun = Pun(guild_id=1, setup=setup, punchline=punchline, first_poster_id=2)
+    if with_signatures:
+        pun.setup_signature = MinHash.of(setup).to_bytes()
+        pun.punchline_signature = MinHash.of(punchline).to_bytes()
+    return pun
+
+
+class TestMinHash(unittest.TestCase):
+    def test_normalize_text(self) -> None:
+        self.assertEqual("a fsh", normalize_text("  A fsh!!"))
+
+    def test_similarity(self) -> None:
+        sig = MinHash.of("What do you call a fish with no eyes?")
+        same = MinHash.of("what do you call a FISH with no eyes")
+        self.assertEqual(1.0, sig.similarity(same))
+        self.assertGreater(
+            sig.similarity(MinHash.of("What do you call a fish that has no eyes?")),
+            0.6,
+        )
+        self.assertLess(
+            sig.similarity(MinHash.of("Why did the scarecrow win an award?")), 0.2
+        )
+
+    def test_round_trip(self) -> None:
+        sig = MinHash.of("A fsh")
+        self.assertEqual(sig, MinHash.from_bytes(sig.to_bytes()))
+        with self.assertRaises(ValueError):
+            MinHash.from_bytes(b"\0" * 8)
+
+
+class TestGuildPunIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        self.fish = _pun("What do you call a fish with no eyes?", "A fsh")
+        self.scarecrow = _pun(
+            "Why did the scarecrow win an award?",
+            "He was outstanding in his field",
+            # Rows from before signatures were stored still work
+            with_signatures=False,
+        )
+        self.index = GuildPunIndex([self.fish, self.scarecrow])
+
+    def test_obvious_repost(self) -> None:
+        match = self.index.best_match("what do you call a fish with no eyes", "a fsh!")
+        assert match is not None
+        self.assertIs(self.fish, match.pun)
+        self.assertTrue(match.is_repost)
+
+    def test_same_punchline_new_setup_is_borderline(self) -> None:
+        match = self.index.best_match("Name a fish missing its eyes", "A fsh")
+        assert match is not None
+        self.assertIs(self.fish, match.pun)
+        self.assertFalse(match.is_repost)
+        self.assertTrue(match.is_borderline)
+
+    def test_unrelated(self) -> None:
+        self.assertIsNone(self.index.best_match("Knock knock", "Interrupting cow"))
+
+    def test_old_rows(self) -> None:
+        match = self.index.best_match(
+            "Why did the scarecrow win an award", "He was outstanding in his field!"
+        )
+        assert match is not None
+        self.assertIs(self.scarecrow, match.pun)
+        self.assertTrue(match.is_repost)
+
+
+class TestPunIndex(unittest.IsolatedAsyncioTestCase):
+    async def test_loads_once_per_guild(self) -> None:
+        index = PunIndex()
+        session = create_autospec(AsyncSession)
+        fish = _pun("What do you call a fish with no eyes?", "A fsh")
+        mock_get = AsyncMock(return_value=[fish])
+        with patch.object(Pun, "get_all_for_guild", new=mock_get):
+            for _ in range(3):
+                match = await index.find_match(session, 1, "fish with no eyes", "a fsh")
+                assert match is not None
+                self.assertIs(fish, match.pun)
+            mock_get.assert_awaited_once_with(session, 1)
+            session.expunge.assert_called_once_with(fish)
+
+            index.invalidate(1)
+            await index.find_match(session, 1, "fish with no eyes", "a fsh")
+            self.assertEqual(2, mock_get.await_count)
+
+    async def test_add_during_load_isnt_cached(self) -> None:
+        """An index that was loading while a pun was committed might be
+        missing it, so it isn't kept."""
+        index = PunIndex()
+        session = create_autospec(AsyncSession)
+
+        async def get_all_for_guild(session, guild_id):
+            index.add(_pun("Knock knock", "Cow"))
+            return []
+
+        mock_get = AsyncMock(side_effect=get_all_for_guild)
+        with patch.object(Pun, "get_all_for_guild", new=mock_get):
+            await index.get(session, 1)
+            await index.get(session, 1)
+        self.assertEqual(2, mock_get.await_count)
+
+
+class TestPunIndexDb(DatabaseTestCase):
+    async def asyncTearDown(self):
+        pun_index.clear()
+        await super().asyncTearDown()
+
+    async def test_new_puns_are_indexed(self):
+        async with self.sessionmaker() as session:
+            self.assertIsNone(
+                await pun_index.find_match(session, 1, "Knock knock", "Cow")
+            )
+            index = await pun_index.get(session, 1)
+            pun = await Pun.add_or_get(session, 1, "Knock knock", "Cow", 2)
+            self.assertIsNotNone(pun.setup_signature)
+            self.assertIsNotNone(pun.punchline_signature)
+
+        # The pun was added to the loaded index rather than reloading it
+        async with self.sessionmaker() as session:
+            self.assertIs(index, await pun_index.get(session, 1))
+            match = await pun_index.find_match(session, 1, "knock knock!", "cow")
+            assert match is not None
+            self.assertTrue(match.is_repost)
+            self.assertEqual(pun.id, match.pun.id)
+            # Other guilds have their own puns
+            self.assertIsNone(
+                await pun_index.find_match(session, 2, "knock knock!", "cow")
+            )
+
+    async def test_rolled_back_puns_arent_indexed(self):
+        async with self.sessionmaker() as session:
+            self.assertIsNone(
+                await pun_index.find_match(session, 1, "Knock knock", "Cow")
+            )
+            session.add(
+                Pun(
+                    guild_id=1,
+                    setup="Knock knock",
+                    punchline="Cow",
+                    first_poster_id=2,
+                    setup_signature=MinHash.of("Knock knock").to_bytes(),
+                    punchline_signature=MinHash.of("Cow").to_bytes(),
+                )
+            )
+            await session.flush()
+            await session.rollback()
+
+            self.assertIsNone(
+                await pun_index.find_match(session, 1, "Knock knock", "Cow")
+            )
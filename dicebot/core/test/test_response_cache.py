@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from dicebot.core.response_cache import (
+    InMemoryResponseCache,
+    RedisResponseCache,
+    normalize_prompt,
+    response_cache_from_env,
+    response_cache_key,
+)
+
+
+def _messages(prompt: str) -> list[dict[str, str]]:
+    return [{"role": "user", "content": prompt}]
+
+
+class TestResponseCacheKey(unittest.TestCase):
+    def test_normalize_prompt(self) -> None:
+        self.assertEqual("a b c", normalize_prompt("  a\n\nb \t c\n"))
+
+    def test_key(self) -> None:
+        key = response_cache_key("model", _messages("a  b"), 1, ["tool"])
+        self.assertEqual(
+            key, response_cache_key("model", _messages("a b\n"), 1, ["tool"])
+        )
+        self.assertNotEqual(
+            key, response_cache_key("other", _messages("a b"), 1, ["tool"])
+        )
+        self.assertNotEqual(
+            key, response_cache_key("model", _messages("a b"), 0, ["tool"])
+        )
+        self.assertNotEqual(key, response_cache_key("model", _messages("a b"), 1))
+        self.assertNotEqual(
+            key, response_cache_key("model", _messages("a c"), 1, ["tool"])
+        )
+
+
+class TestResponseCache(unittest.IsolatedAsyncioTestCase):
+    async def test_in_memory(self) -> None:
+        cache = InMemoryResponseCache(maxsize=2)
+        await cache.put("a", "1", ttl=60)
+        await cache.put("b", "2", ttl=0)
+        self.assertEqual("1", await cache.get("a"))
+        # Expired immediately
+        self.assertIsNone(await cache.get("b"))
+
+    async def test_redis_errors_are_misses(self) -> None:
+        cache = RedisResponseCache("redis://localhost:1")
+        client = MagicMock()
+        client.get = AsyncMock(side_effect=ConnectionError)
+        client.set = AsyncMock(side_effect=ConnectionError)
+        with patch(
+            "dicebot.core.response_cache.aioredis.Redis.from_url",
+            return_value=client,
+        ):
+            self.assertIsNone(await cache.get("a"))
+            await cache.put("a", "1", ttl=60)
+            client.set.assert_awaited_once()
+
+    async def test_redis_ttl(self) -> None:
+        cache = RedisResponseCache("redis://localhost:1")
+        client = MagicMock()
+        client.get = AsyncMock(return_value="1")
+        client.set = AsyncMock()
+        with patch(
+            "dicebot.core.response_cache.aioredis.Redis.from_url",
+            return_value=client,
+        ):
+            await cache.put("a", "1", ttl=1.5)
+            client.set.assert_awaited_once_with("a", "1", px=1500)
+            self.assertEqual("1", await cache.get("a"))
+
+    def test_from_env(self) -> None:
+        url = "redis://redis:6379/1"
+        with patch.dict("os.environ", {"ASK_CACHE_REDIS_URL": url}):
+            self.assertIsInstance(response_cache_from_env(), RedisResponseCache)
+        with patch.dict("os.environ", {"ASK_CACHE_REDIS_URL": ""}):
+            self.assertIsInstance(response_cache_from_env(), InMemoryResponseCache)
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+
+import unittest
+from unittest.mock import patch
+
+from dicebot.core.ttl_cache import TTLCache
+
+
+class TestTTLCache(unittest.TestCase):
+    def test_get_and_put(self) -> None:
+        cache: TTLCache[str, int] = TTLCache(maxsize=4, ttl=60)
+        self.assertIsNone(cache.get("a"))
+        cache.put("a", 1)
+        self.assertEqual(1, cache.get("a"))
+        self.assertIn("a", cache)
+
+    def test_evicts_least_recently_used(self) -> None:
+        cache: TTLCache[str, int] = TTLCache(maxsize=2, ttl=60)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        # Touch "a" so "b" becomes the oldest entry
+        cache.get("a")
+        cache.put("c", 3)
+        self.assertEqual(1, cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(3, cache.get("c"))
+        self.assertEqual(2, len(cache))
+
+    @patch("dicebot.core.ttl_cache.time")
+    def test_expiry(self, mock_time) -> None:
+        cache: TTLCache[str, int] = TTLCache(maxsize=4, ttl=10)
+        mock_time.monotonic.return_value = 100.0
+        cache.put("a", 1)
+        cache.put("b", 2, ttl=30)
+        mock_time.monotonic.return_value = 115.0
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(2, cache.get("b"))
+
+    def test_invalidate(self) -> None:
+        cache: TTLCache[str, int] = TTLCache(maxsize=4, ttl=60)
+        cache.put("a", 1)
+        cache.invalidate("a")
+        cache.invalidate("missing")
+        self.assertIsNone(cache.get("a"))
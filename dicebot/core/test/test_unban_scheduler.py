@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+
+import asyncio
+import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from dicebot.core.unban_scheduler import PendingUnban, UnbanScheduler
+from dicebot.data.db.ban import Ban
+from dicebot.test.utils import DatabaseTestCase
+
+
+def _ban(ban_id: int, secs_from_now: float, **kwargs) -> Ban:
+    kwargs.setdefault("channel_id", 10)
+    return Ban(
+        id=ban_id,
+        guild_id=1,
+        bannee_id=2,
+        banner_id=3,
+        reason="test",
+        banned_until=(
+            datetime.datetime.now() + datetime.timedelta(seconds=secs_from_now)
+        ),
+        **kwargs,
+    )
+
+
+class TestUnbanScheduler(DatabaseTestCase):
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+        self.scheduler = UnbanScheduler(horizon=60 * 60)
+        self.send_unban = AsyncMock()
+        patcher = patch("dicebot.core.unban_scheduler.send_unban", self.send_unban)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def asyncTearDown(self) -> None:
+        await self.scheduler.stop()
+        await super().asyncTearDown()
+
+    async def _fired_ban_ids(self) -> list:
+        # Give the scheduler task a chance to wake up
+        await asyncio.sleep(0.05)
+        return [c.args[5] for c in self.send_unban.await_args_list]
+
+    def test_pending_unbans_sort_by_due_time(self) -> None:
+        ban = _ban(1, 60)
+        later = PendingUnban.from_ban(ban)
+        sooner = PendingUnban.from_ban(_ban(2, 30))
+        self.assertLess(sooner, later)
+        self.assertEqual(datetime.timedelta(seconds=1), later.due - ban.banned_until)
+
+    async def test_falls_back_when_not_running(self) -> None:
+        self.assertFalse(self.scheduler.schedule(_ban(1, 60)))
+
+    async def test_rebuilds_from_db(self) -> None:
+        async with self.sessionmaker() as session:
+            session.add_all(
+                [
+                    # Ended while the bot was down
+                    _ban(1, -60),
+                    # Coming up soon
+                    _ban(2, 30 * 60),
+                    # Past the horizon, so Celery has it
+                    _ban(3, 2 * 60 * 60),
+                    # Already announced
+                    _ban(4, -30, acknowledged=True),
+                    # Voided early
+                    _ban(5, 60, voided=True),
+                    # From before bans knew their channel
+                    _ban(6, -30, channel_id=None),
+                    # Too long ago to bother with
+                    _ban(7, -2 * 24 * 60 * 60),
+                ]
+            )
+            await session.commit()
+
+        await self.scheduler.start(MagicMock(), self.sessionmaker)
+        self.assertTrue(self.scheduler.running)
+        self.assertEqual([1], await self._fired_ban_ids())
+        self.assertEqual(1, len(self.scheduler))
+
+        # The next rescan doesn't fire the same unban again
+        await self.scheduler._rescan()
+        self.assertEqual(1, len(self.scheduler))
+        self.assertEqual([1], await self._fired_ban_ids())
+
+    async def test_schedule(self) -> None:
+        await self.scheduler.start(MagicMock(), self.sessionmaker)
+
+        self.assertFalse(self.scheduler.schedule(_ban(1, 2 * 60 * 60)))
+        self.assertFalse(self.scheduler.schedule(_ban(2, 60, channel_id=None)))
+        self.assertTrue(self.scheduler.schedule(_ban(3, 60)))
+        # Scheduling the same ban twice is a no-op
+        self.assertTrue(self.scheduler.schedule(_ban(3, 60)))
+        self.assertEqual(1, len(self.scheduler))
+        self.assertEqual([], await self._fired_ban_ids())
+
+        # A ban that's already over goes out straight away
+        self.assertTrue(self.scheduler.schedule(_ban(4, -1)))
+        self.assertEqual([4], await self._fired_ban_ids())
+        self.assertEqual(1, len(self.scheduler))
+
+    async def test_start_is_idempotent(self) -> None:
+        await self.scheduler.start(MagicMock(), self.sessionmaker)
+        task = self.scheduler._task
+        await self.scheduler.start(MagicMock(), self.sessionmaker)
+        self.assertIs(task, self.scheduler._task)
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+
+import asyncio
+import time
+import unittest
+from unittest.mock import patch
+
+from dicebot.core.video_lengths import VideoLengthCache, parse_video_id
+from dicebot.data.db.youtube_video import YoutubeVideo
+from dicebot.test.utils import DatabaseTestCase
+
+VIDEO_ID = "dQw4w9WgXcQ"
+
+
+class TestParseVideoId(unittest.TestCase):
+    def test_urls_normalize_to_the_same_id(self) -> None:
+        for url in [
+            f"https://www.youtube.com/watch?v={VIDEO_ID}",
+            f"https://youtube.com/watch?feature=share&v={VIDEO_ID}&t=42",
+            f"https://m.youtube.com/watch?v={VIDEO_ID}",
+            f"https://music.youtube.com/watch?v={VIDEO_ID}&list=abc",
+            f"https://youtu.be/{VIDEO_ID}",
+            f"https://youtu.be/{VIDEO_ID}?si=tracking",
+            f"https://www.youtube.com/shorts/{VIDEO_ID}",
+            f"https://www.youtube.com/embed/{VIDEO_ID}?autoplay=1",
+            f"https://www.youtube-nocookie.com/embed/{VIDEO_ID}",
+            f"https://www.youtube.com/live/{VIDEO_ID}",
+            f"  HTTPS://WWW.YOUTUBE.COM/watch?v={VIDEO_ID}  ",
+        ]:
+            with self.subTest(url=url):
+                self.assertEqual(VIDEO_ID, parse_video_id(url))
+
+    def test_not_videos(self) -> None:
+        for url in [
+            "https://www.youtube.com/",
+            "https://www.youtube.com/@somechannel",
+            "https://www.youtube.com/watch?v=short",
+            "https://www.youtube.com/playlist?list=PL123",
+            f"https://example.com/watch?v={VIDEO_ID}",
+            f"https://notyoutu.be/{VIDEO_ID}",
+            "not a url",
+        ]:
+            with self.subTest(url=url):
+                self.assertIsNone(parse_video_id(url))
+
+
+class TestVideoLengthCache(DatabaseTestCase):
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        self.cache = VideoLengthCache(timeout=0.5)
+
+    async def asyncTearDown(self):
+        self.cache.shutdown()
+        await super().asyncTearDown()
+
+    async def test_resolved_once(self):
+        url = f"https://youtu.be/{VIDEO_ID}"
+        with patch(
+            "dicebot.core.video_lengths._fetch_length", return_value=754
+        ) as mock_fetch:
+            async with self.sessionmaker() as session:
+                self.assertEqual(754, await self.cache.get_length_secs(session, url))
+                # Same video, different link
+                self.assertEqual(
+                    754,
+                    await self.cache.get_length_secs(
+                        session, f"https://www.youtube.com/shorts/{VIDEO_ID}"
+                    ),
+                )
+                await session.commit()
+            mock_fetch.assert_called_once_with(VIDEO_ID)
+
+            # After a restart the length comes from the database
+            self.cache.clear()
+            async with self.sessionmaker() as session:
+                self.assertEqual(754, await self.cache.get_length_secs(session, url))
+                self.assertEqual(754, await YoutubeVideo.get_length(session, VIDEO_ID))
+            mock_fetch.assert_called_once()
+
+    async def test_set_length_leaves_the_session_alone(self):
+        async with self.sessionmaker() as session:
+            await YoutubeVideo.set_length(session, VIDEO_ID, 754)
+            await session.commit()
+
+        async with self.sessionmaker() as session:
+            session.add(YoutubeVideo(video_id="9bZkp7q19f0", length_secs=252))
+            # Already there, which isn't an error and doesn't throw away
+            # anything else the caller had pending
+            await YoutubeVideo.set_length(session, VIDEO_ID, 60)
+            await session.commit()
+
+        async with self.sessionmaker() as session:
+            self.assertEqual(754, await YoutubeVideo.get_length(session, VIDEO_ID))
+            self.assertEqual(252, await YoutubeVideo.get_length(session, "9bZkp7q19f0"))
+
+    async def test_concurrent_lookups_share_one_request(self):
+        def slow_fetch(video_id: str) -> int:
+            time.sleep(0.1)
+            return 60
+
+        url = f"https://youtu.be/{VIDEO_ID}"
+        with patch(
+            "dicebot.core.video_lengths._fetch_length", side_effect=slow_fetch
+        ) as mock_fetch:
+            async with self.sessionmaker() as s1, self.sessionmaker() as s2:
+                res = await asyncio.gather(
+                    self.cache.get_length_secs(s1, url),
+                    self.cache.get_length_secs(s2, url),
+                )
+        self.assertEqual([60, 60], res)
+        mock_fetch.assert_called_once()
+
+    async def test_timeout_does_not_block_the_loop(self):
+        def hung_fetch(video_id: str) -> int:
+            time.sleep(1)
+            return 60
+
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        task = asyncio.create_task(ticker())
+        with patch("dicebot.core.video_lengths._fetch_length", side_effect=hung_fetch):
+            async with self.sessionmaker() as session:
+                res = await self.cache.get_length_secs(
+                    session, f"https://youtu.be/{VIDEO_ID}"
+                )
+        task.cancel()
+        self.assertIsNone(res)
+        # The loop kept running while we waited on YouTube
+        self.assertGreater(ticks, 10)
+
+        # Failures are remembered for a bit rather than retried right away
+        with patch("dicebot.core.video_lengths._fetch_length") as mock_fetch:
+            async with self.sessionmaker() as session:
+                self.assertIsNone(
+                    await self.cache.get_length_secs(
+                        session, f"https://youtu.be/{VIDEO_ID}"
+                    )
+                )
+            mock_fetch.assert_not_called()
+
+    async def test_not_a_video(self):
+        async with self.sessionmaker() as session:
+            self.assertIsNone(
+                await self.cache.get_length_secs(session, "https://youtube.com/")
+            )
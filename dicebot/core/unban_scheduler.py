@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+import asyncio
+import datetime
+import heapq
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set
+
+import discord
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from dicebot.data.db.ban import Ban
+from dicebot.tasks.unban import send_unban
+
+# Bans ending further out than this go to Celery instead
+DEFAULT_HORIZON_SECS = 24 * 60 * 60
+# How often to look for bans that have come within the horizon (or that were
+# scheduled through Celery and the broker lost)
+DEFAULT_RESCAN_INTERVAL_SECS = 60 * 60
+# Unbans missed while the bot was down still get sent if they're this recent
+DEFAULT_MISSED_UNBAN_WINDOW_SECS = 24 * 60 * 60
+# Matches the Celery task's countdown, so unban_async's "has it ended" check
+# (which is a strict comparison) passes
+UNBAN_DELAY_SECS = 1
+
+
+@dataclass(frozen=True, order=True)
+class PendingUnban:
+    due: datetime.datetime
+    ban_id: int
+    channel_id: int = field(compare=False)
+    guild_id: int = field(compare=False)
+    bannee_id: int = field(compare=False)
+
+    @classmethod
+    def from_ban(cls, ban: Ban) -> PendingUnban:
+        assert ban.channel_id is not None
+        return cls(
+            due=ban.banned_until + datetime.timedelta(seconds=UNBAN_DELAY_SECS),
+            ban_id=ban.id,
+            channel_id=ban.channel_id,
+            guild_id=ban.guild_id,
+            bannee_id=ban.bannee_id,
+        )
+
+
+class UnbanScheduler:
+    """Sends unban notifications from the bot itself rather than through a
+    Celery countdown task per ban.
+
+    Pending unbans live in a heap ordered by when they're due, and a single
+    task sleeps until the earliest one. The heap is rebuilt from the ban table
+    on startup and topped up periodically, so nothing depends on the broker
+    holding on to a message for the length of the ban. Celery is still used
+    for bans longer than the horizon, as a fallback."""
+
+    def __init__(
+        self,
+        horizon: float = DEFAULT_HORIZON_SECS,
+        rescan_interval: float = DEFAULT_RESCAN_INTERVAL_SECS,
+        missed_unban_window: float = DEFAULT_MISSED_UNBAN_WINDOW_SECS,
+    ) -> None:
+        self.horizon = horizon
+        self.rescan_interval = rescan_interval
+        self.missed_unban_window = missed_unban_window
+        self._heap: List[PendingUnban] = []
+        self._scheduled: Set[int] = set()
+        # Ban id -> when it was due, so the periodic rescan doesn't resend
+        # unbans that didn't get acknowledged (i.e. a longer ban superseded it)
+        self._fired: Dict[int, datetime.datetime] = {}
+        self._client: Optional[discord.Client] = None
+        self._sessionmaker: Optional[async_sessionmaker[AsyncSession]] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task[None]] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(
+        self,
+        client: discord.Client,
+        sessionmaker: async_sessionmaker[AsyncSession],
+    ) -> None:
+        # on_ready fires again on every reconnect
+        if self.running:
+            return
+        self._client = client
+        self._sessionmaker = sessionmaker
+        self._wakeup = asyncio.Event()
+        await self._rescan()
+        self._task = asyncio.create_task(self._run(), name="unban_scheduler")
+        logging.info(f"Unban scheduler started with {len(self._heap)} pending")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        self._heap.clear()
+        self._scheduled.clear()
+
+    def schedule(self, ban: Ban) -> bool:
+        """Take care of this ban's unban if it's within the horizon. Returns
+        False if the caller needs to fall back to Celery."""
+        if not self.running or ban.channel_id is None:
+            return False
+        limit = datetime.datetime.now() + datetime.timedelta(seconds=self.horizon)
+        if ban.banned_until > limit:
+            return False
+        self._push(PendingUnban.from_ban(ban))
+        return True
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def _push(self, pending: PendingUnban) -> None:
+        if pending.ban_id in self._scheduled or pending.ban_id in self._fired:
+            return
+        heapq.heappush(self._heap, pending)
+        self._scheduled.add(pending.ban_id)
+        # The sleeper only needs to hear about it if it's the new earliest
+        if self._heap[0] is pending and self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _run(self) -> None:
+        assert self._wakeup is not None
+        next_rescan = time.monotonic() + self.rescan_interval
+        while True:
+            now = datetime.datetime.now()
+            while self._heap and self._heap[0].due <= now:
+                pending = heapq.heappop(self._heap)
+                self._scheduled.discard(pending.ban_id)
+                self._fired[pending.ban_id] = pending.due
+                await self._fire(pending)
+
+            timeout = max(next_rescan - time.monotonic(), 0)
+            if self._heap:
+                until_due = (self._heap[0].due - now).total_seconds()
+                timeout = min(timeout, until_due)
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+
+            if time.monotonic() >= next_rescan:
+                try:
+                    await self._rescan()
+                except Exception:
+                    logging.exception("Failed to rescan the ban table")
+                next_rescan = time.monotonic() + self.rescan_interval
+
+    async def _fire(self, pending: PendingUnban) -> None:
+        assert self._client is not None and self._sessionmaker is not None
+        try:
+            async with self._sessionmaker() as session:
+                await send_unban(
+                    self._client,
+                    session,
+                    pending.channel_id,
+                    pending.guild_id,
+                    pending.bannee_id,
+                    pending.ban_id,
+                )
+        except Exception:
+            logging.exception(f"Failed to send unban for {pending}")
+
+    async def _rescan(self) -> None:
+        assert self._sessionmaker is not None
+        now = datetime.datetime.now()
+        since = now - datetime.timedelta(seconds=self.missed_unban_window)
+        until = now + datetime.timedelta(seconds=self.horizon)
+        # Anything that was due before the window can't come back
+        self._fired = {k: v for k, v in self._fired.items() if v >= since}
+        async with self._sessionmaker() as session:
+            bans = await Ban.get_pending_unbans(session, since, until)
+        for ban in bans:
+            self._push(PendingUnban.from_ban(ban))
+
+
+unban_scheduler = UnbanScheduler()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+
+import asyncio
+import logging
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import pytube
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from dicebot.core.ttl_cache import TTLCache
+from dicebot.data.db.youtube_video import YoutubeVideo
+
+DEFAULT_VIDEO_LENGTH_CACHE_SIZE = 4096
+# A video's length never changes
+DEFAULT_VIDEO_LENGTH_TTL_SECS = 24 * 60 * 60
+# ...but a lookup that failed might work later
+DEFAULT_FAILED_LOOKUP_TTL_SECS = 300
+DEFAULT_LOOKUP_WORKERS = 4
+DEFAULT_LOOKUP_TIMEOUT_SECS = 10.0
+
+_YOUTUBE_HOSTS = {
+    "youtube.com",
+    "m.youtube.com",
+    "music.youtube.com",
+    "youtube-nocookie.com",
+}
+_PATH_PREFIXES = ("shorts", "embed", "v", "live", "e")
+_VIDEO_ID_REGEX = re.compile(r"^[A-Za-z0-9_-]{11}$")
+
+
+def parse_video_id(url: str) -> Optional[str]:
+    """Pull the video id out of any of the many shapes of YouTube link, so
+    the same video always ends up with the same cache key"""
+    try:
+        parsed = urlparse(url.strip())
+    except ValueError:
+        return None
+
+    host = (parsed.hostname or "").lower().removeprefix("www.")
+    path = [part for part in parsed.path.split("/") if part]
+    candidate = None
+    if host == "youtu.be":
+        candidate = path[0] if path else None
+    elif host in _YOUTUBE_HOSTS:
+        if path == ["watch"]:
+            candidate = next(iter(parse_qs(parsed.query).get("v", [])), None)
+        elif len(path) >= 2 and path[0] in _PATH_PREFIXES:
+            candidate = path[1]
+
+    if candidate is None or not _VIDEO_ID_REGEX.match(candidate):
+        return None
+    return candidate
+
+
+def _fetch_length(video_id: str) -> int:
+    return pytube.YouTube(f"https://www.youtube.com/watch?v={video_id}").length
+
+
+class VideoLengthCache:
+    """Looks up YouTube video lengths without blocking the event loop.
+
+    pytube is synchronous, so lookups run in a small thread pool and give up
+    after a timeout. Lengths are remembered in memory and in the youtube_video
+    table, and concurrent lookups of the same video share one request."""
+
+    def __init__(
+        self,
+        maxsize: int = DEFAULT_VIDEO_LENGTH_CACHE_SIZE,
+        workers: int = DEFAULT_LOOKUP_WORKERS,
+        timeout: float = DEFAULT_LOOKUP_TIMEOUT_SECS,
+    ) -> None:
+        self.timeout = timeout
+        # Values are wrapped in a tuple so failed lookups (None) are cacheable
+        self.lengths: TTLCache[str, Tuple[Optional[int]]] = TTLCache(
+            maxsize, DEFAULT_VIDEO_LENGTH_TTL_SECS
+        )
+        self.executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="youtube"
+        )
+        self._pending: Dict[str, "asyncio.Future[Optional[int]]"] = {}
+
+    @classmethod
+    def from_env(cls) -> "VideoLengthCache":
+        return cls(
+            workers=int(os.getenv("YOUTUBE_LOOKUP_WORKERS", DEFAULT_LOOKUP_WORKERS)),
+            timeout=float(
+                os.getenv("YOUTUBE_LOOKUP_TIMEOUT_SECS", DEFAULT_LOOKUP_TIMEOUT_SECS)
+            ),
+        )
+
+    async def get_length_secs(self, session: AsyncSession, url: str) -> Optional[int]:
+        video_id = parse_video_id(url)
+        if video_id is None:
+            return None
+
+        cached = self.lengths.get(video_id)
+        if cached is not None:
+            return cached[0]
+
+        pending = self._pending.get(video_id)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[video_id] = future
+        try:
+            res = await self._lookup(session, video_id)
+            future.set_result(res)
+            return res
+        except Exception as e:
+            future.set_exception(e)
+            # Don't leave the exception unretrieved if nobody else was waiting
+            future.exception()
+            raise
+        finally:
+            del self._pending[video_id]
+            if not future.done():
+                # We got cancelled, so anyone waiting on us gets cancelled too
+                future.cancel()
+
+    async def _lookup(self, session: AsyncSession, video_id: str) -> Optional[int]:
+        res = await YoutubeVideo.get_length(session, video_id)
+        if res is not None:
+            self.lengths.put(video_id, (res,))
+            return res
+
+        # The thread keeps going after a timeout (there's no way to interrupt
+        # pytube), but the pool is bounded so a slow YouTube can only ever tie
+        # up a few threads rather than the event loop
+        loop = asyncio.get_running_loop()
+        try:
+            res = await asyncio.wait_for(
+                loop.run_in_executor(self.executor, _fetch_length, video_id),
+                timeout=self.timeout,
+            )
+        except Exception as e:
+            logging.warning(f"Failed to get YouTube info for `{video_id}`: {e!r}")
+            self.lengths.put(video_id, (None,), ttl=DEFAULT_FAILED_LOOKUP_TTL_SECS)
+            return None
+
+        self.lengths.put(video_id, (res,))
+        await YoutubeVideo.set_length(session, video_id, res)
+        return res
+
+    def clear(self) -> None:
+        self.lengths.clear()
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+video_lengths = VideoLengthCache.from_env()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+
+"""Store MinHash signatures for puns caught before they were saved with them.
+
+Rows without them get hashed again every time their guild's pun index is
+loaded, so run this once after upgrading past the revision that adds them:
+
+    python -m dicebot.data.backfill_pun_signatures
+
+It only touches rows that are missing a signature, so it's safe to rerun."""
+
+import asyncio
+
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from dicebot.data.db.pun import Pun
+
+DEFAULT_BATCH_SIZE = 500
+
+
+async def backfill_signatures(
+    session: AsyncSession, batch_size: int = DEFAULT_BATCH_SIZE
+) -> int:
+    """Fill in every missing signature, committing after each batch. Returns
+    how many puns were updated."""
+    total = 0
+    while True:
+        result = await session.scalars(
+            select(Pun)
+            .filter(
+                or_(Pun.setup_signature.is_(None), Pun.punchline_signature.is_(None))
+            )
+            .order_by(Pun.id)
+            .limit(batch_size)
+        )
+        puns = result.all()
+        if not puns:
+            return total
+        for pun in puns:
+            setup, punchline = pun.signatures()
+            pun.setup_signature = setup.to_bytes()
+            pun.punchline_signature = punchline.to_bytes()
+        await session.commit()
+        total += len(puns)
+
+
+async def main() -> None:
+    from dicebot.app import app_sessionmaker
+
+    async with app_sessionmaker() as session:
+        puns = await backfill_signatures(session)
+    print(f"Backfilled signatures for {puns} puns")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
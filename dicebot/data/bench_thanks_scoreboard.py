@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+
+"""Compare the thanks scoreboard query against the cross join it replaced.
+
+Seeds a throwaway database with a guild's worth of thanks, checks that both
+queries give the same counts, then prints their plans and timings:
+
+    python -m dicebot.data.bench_thanks_scoreboard --rows 100000
+
+By default this runs on an in-memory SQLite database. Pass --url to run it
+against Postgres instead; the tables get created and then DROPPED, so only
+point it at a database you don't care about."""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from typing import Any, List, Sequence
+
+from sqlalchemy import case, func, insert, select, sql, text
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+
+from dicebot.core.import_witchcraft import import_submodules
+from dicebot.data.db.base import Base
+from dicebot.data.db.guild import Guild
+from dicebot.data.db.thanks import Thanks
+from dicebot.data.db.user import User
+
+GUILD_ID = 1
+INSERT_BATCH_SIZE = 10_000
+
+
+def cross_join_thanks_counts_query(guild_id: int) -> sql.Select:
+    """How Thanks.counts_query used to work: every user who's been
+    part of a thanks, paired with every thanks in the guild, then summed.
+    That's users * thanks rows before the GROUP BY."""
+    users_q = (
+        select(Thanks.thanker_id.label("user_id"))
+        .filter_by(guild_id=guild_id)
+        .union(select(Thanks.thankee_id.label("user_id")).filter_by(guild_id=guild_id))
+    ).subquery()
+    distinct_users_q = select(users_q.c.user_id.distinct().label("user_id")).subquery()
+    thanks_q = (
+        select(Thanks.thanker_id, Thanks.thankee_id).filter_by(guild_id=guild_id)
+    ).subquery()
+    # Spelled out as a join on TRUE so SQLAlchemy doesn't warn about it
+    joined_q = (
+        select(distinct_users_q.c.user_id, thanks_q.c.thanker_id, thanks_q.c.thankee_id)
+        .select_from(distinct_users_q.join(thanks_q, sql.true()))
+        .subquery()
+    )
+
+    return (
+        select(
+            joined_q.c.user_id,
+            func.sum(
+                case((joined_q.c.user_id == joined_q.c.thanker_id, 1), else_=0)
+            ).label("sent"),
+            func.sum(
+                case((joined_q.c.user_id == joined_q.c.thankee_id, 1), else_=0)
+            ).label("received"),
+        )
+        .group_by(joined_q.c.user_id)
+        .order_by(text("received"), text("sent"))
+    )
+
+
+async def seed(conn: AsyncConnection, rows: int, users: int, seed: int) -> None:
+    rng = random.Random(seed)
+    await conn.execute(insert(Guild), [{"id": GUILD_ID}])
+    await conn.execute(insert(User), [{"id": i} for i in range(1, users + 1)])
+    for start in range(0, rows, INSERT_BATCH_SIZE):
+        batch = []
+        for i in range(start, min(rows, start + INSERT_BATCH_SIZE)):
+            thanker_id, thankee_id = rng.sample(range(1, users + 1), 2)
+            batch.append(
+                {
+                    "id": i + 1,
+                    "guild_id": GUILD_ID,
+                    "thanker_id": thanker_id,
+                    "thankee_id": thankee_id,
+                    "reason": "benchmark",
+                }
+            )
+        await conn.execute(insert(Thanks), batch)
+
+
+async def explain(conn: AsyncConnection, query: sql.Select) -> Sequence[str]:
+    compiled = query.compile(conn.engine, compile_kwargs={"literal_binds": True})
+    if conn.dialect.name == "sqlite":
+        res = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}")
+        # (id, parent, notused, detail)
+        return [row[3] for row in res.all()]
+    res = await conn.exec_driver_sql(f"EXPLAIN {compiled}")
+    return [row[0] for row in res.all()]
+
+
+async def time_query(
+    conn: AsyncConnection, query: sql.Select, iterations: int
+) -> List[float]:
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        (await conn.execute(query)).all()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def counts(rows: Sequence[Any]) -> Any:
+    # Ties can come back in either order, so compare them as a set
+    return {(row.user_id, row.sent, row.received) for row in rows}
+
+
+async def main(opts: argparse.Namespace) -> None:
+    import_submodules("dicebot.data.db")
+    engine = create_async_engine(opts.url)
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await seed(conn, opts.rows, opts.users, opts.seed)
+            if conn.dialect.name == "postgresql":
+                await conn.exec_driver_sql("ANALYZE thanks")
+
+        queries = [
+            ("cross join", cross_join_thanks_counts_query(GUILD_ID)),
+            ("union all", Thanks.counts_query(GUILD_ID)),
+        ]
+        print(f"{opts.rows} thanks between {opts.users} users on {opts.url}\n")
+        async with engine.connect() as conn:
+            results = [(await conn.execute(query)).all() for _, query in queries]
+            if counts(results[0]) != counts(results[1]):
+                raise SystemExit("The queries disagree about the counts!")
+
+            for name, query in queries:
+                print(f"{name} plan:")
+                for line in await explain(conn, query):
+                    print(f"    {line}")
+            print()
+
+            print(f"{'query':<12} {'p50 ms':>10} {'max ms':>10}")
+            for name, query in queries:
+                timings = await time_query(conn, query, opts.iterations)
+                p50 = statistics.median(timings)
+                print(f"{name:<12} {p50:>10.1f} {max(timings):>10.1f}")
+    finally:
+        if not opts.url.startswith("sqlite"):
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.drop_all)
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the thanks scoreboard")
+    parser.add_argument("-n", "--iterations", type=int, default=3)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--url", default="sqlite+aiosqlite:///:memory:")
+    asyncio.run(main(parser.parse_args()))
@@ -4,9 +4,16 @@ from __future__ import annotations
 
 import datetime
 from enum import Enum
-from typing import TYPE_CHECKING, Annotated, Optional
+from typing import TYPE_CHECKING, Annotated, Mapping, Optional
 
-from sqlalchemy import BigInteger, ForeignKey, UniqueConstraint, select
+from sqlalchemy import (
+    BigInteger,
+    ForeignKey,
+    UniqueConstraint,
+    delete,
+    insert,
+    select,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -57,6 +64,33 @@ class ActiveEvent(Base):
         )
         return res.one_or_none()
 
+    @classmethod
+    async def start_many(
+        cls,
+        session: AsyncSession,
+        event_types: Mapping[int, EventType],
+        started_at: datetime.datetime,
+        expires_at: datetime.datetime,
+    ) -> None:
+        """Start an event in each of these guilds, which mustn't have one going
+        already. There's only ever one row per guild, so expired events are
+        cleared out to make way."""
+        if len(event_types) == 0:
+            return
+        await session.execute(delete(cls).filter(cls.guild_id.in_(event_types.keys())))
+        await session.execute(
+            insert(cls),
+            [
+                {
+                    "guild_id": guild_id,
+                    "event_type": event_type.value,
+                    "started_at": started_at,
+                    "expires_at": expires_at,
+                }
+                for guild_id, event_type in event_types.items()
+            ],
+        )
+
     def __repr__(self) -> str:
         return (
             f"ActiveEvent({self.id=}, {self.guild_id=}, {self.event_type=}, "
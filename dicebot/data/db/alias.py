@@ -2,9 +2,9 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Annotated, Optional, Sequence
+from typing import TYPE_CHECKING, Annotated, Dict, Optional, Sequence
 
-from sqlalchemy import BigInteger, ForeignKey, select
+from sqlalchemy import BigInteger, ForeignKey, UniqueConstraint, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -21,6 +21,7 @@ int_ix = Annotated[int, mapped_column(BigInteger, index=True)]
 
 class Alias(Base):
     __tablename__ = "alias"
+    __table_args__ = (UniqueConstraint("guild_id", "key", name="uq_alias_guild_key"),)
 
     # Columns
     id: Mapped[int_pk]
@@ -46,5 +47,14 @@ class Alias(Base):
         res = await session.scalars(select(Alias).filter_by(guild_id=guild.id))
         return res.all()
 
+    @classmethod
+    async def get_key_values(
+        cls, session: AsyncSession, guild: Guild
+    ) -> Dict[str, str]:
+        res = await session.execute(
+            select(Alias.key, Alias.value).filter_by(guild_id=guild.id)
+        )
+        return {row.key: row.value for row in res}
+
     def __repr__(self) -> str:
         return f"Alias({self.id=}, {self.key=}, {self.value=})"
@@ -3,9 +3,9 @@
 from __future__ import annotations
 
 import datetime
-from typing import TYPE_CHECKING, Annotated, Optional
+from typing import TYPE_CHECKING, Annotated, Optional, Sequence
 
-from sqlalchemy import BigInteger, ForeignKey, desc, func, select, update
+from sqlalchemy import BigInteger, ForeignKey, Index, desc, func, select, text, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -28,6 +28,17 @@ bool_f = Annotated[bool, mapped_column(default=False)]
 
 class Ban(Base):
     __tablename__ = "ban"
+    __table_args__ = (
+        # get_latest_unvoided_ban and unban
+        Index("ix_ban_guild_bannee_until", "guild_id", "bannee_id", "banned_until"),
+        # The unban scheduler's rescan only cares about bans nobody's been told
+        # about yet, which is a tiny fraction of the table
+        Index(
+            "ix_ban_pending_unban",
+            "banned_until",
+            postgresql_where=text("NOT voided AND NOT acknowledged"),
+        ),
+    )
 
     # Columns
     id: Mapped[bigint_pk]
@@ -40,6 +51,8 @@ class Ban(Base):
     acknowledged: Mapped[bool_f]
     voided: Mapped[bool_f]
     voided_early_at: Mapped[Optional[datetime.datetime]]
+    # Where to announce the unban. Older bans don't have one.
+    channel_id: Mapped[Optional[bigint]]
 
     # Methods
     @classmethod
@@ -56,6 +69,39 @@ class Ban(Base):
         )
         return res.one_or_none()
 
+    @classmethod
+    async def get_pending_unbans(
+        cls,
+        session: AsyncSession,
+        since: datetime.datetime,
+        until: datetime.datetime,
+    ) -> Sequence[Ban]:
+        """Bans ending between `since` and `until` that nobody has been told
+        about yet"""
+        res = await session.scalars(
+            select(cls)
+            .filter_by(voided=False, acknowledged=False)
+            .filter(
+                cls.channel_id.is_not(None),
+                cls.banned_until >= since,
+                cls.banned_until <= until,
+            )
+            .order_by(cls.banned_until)
+        )
+        return res.all()
+
+    @classmethod
+    async def acknowledge(cls, session: AsyncSession, ban_id: int) -> bool:
+        """Mark the ban as acknowledged. Returns False if someone else already
+        had, i.e. they're the one sending the unban message."""
+        res = await session.execute(
+            update(cls)
+            .filter_by(id=ban_id, acknowledged=False)
+            .values(acknowledged=True)
+            .returning(cls.id)
+        )
+        return res.first() is not None
+
     @classmethod
     async def unban(cls, session: AsyncSession, guild: Guild, bannee: User) -> None:
         await session.execute(
@@ -69,5 +115,6 @@ class Ban(Base):
         return (
             f"Ban({self.id=}, {self.guild_id=}, {self.bannee_id=}, "
             f"{self.banner_id=}, {self.reason=}, {self.banned_at=}, "
-            f"{self.banned_until=}, {self.voided=}, {self.voided_early_at=})"
+            f"{self.banned_until=}, {self.voided=}, {self.voided_early_at=}, "
+            f"{self.channel_id=})"
         )
@@ -5,7 +5,7 @@ from __future__ import annotations
 import datetime
 from typing import TYPE_CHECKING, Annotated, Optional
 
-from sqlalchemy import BigInteger, ForeignKey, select
+from sqlalchemy import BigInteger, ForeignKey, Index, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -22,6 +22,12 @@ bigint_ix = Annotated[int, mapped_column(BigInteger, index=True)]
 
 class BanImmunity(Base):
     __tablename__ = "ban_immunity"
+    # get_active
+    __table_args__ = (
+        Index(
+            "ix_ban_immunity_guild_user_until", "guild_id", "user_id", "immune_until"
+        ),
+    )
 
     id: Mapped[bigint_pk]
     guild_id: Mapped[bigint_ix] = mapped_column(ForeignKey("guild.id"))
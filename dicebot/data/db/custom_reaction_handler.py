@@ -5,7 +5,7 @@ from __future__ import annotations
 from typing import TYPE_CHECKING, Annotated, Optional, Sequence
 
 from discord import Reaction
-from sqlalchemy import BigInteger, ForeignKey, select
+from sqlalchemy import BigInteger, ForeignKey, Index, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -22,6 +22,15 @@ int_ix = Annotated[int, mapped_column(BigInteger, index=True)]
 
 class CustomReactionHandler(Base):
     __tablename__ = "custom_reaction_handler"
+    # get, which runs on every reaction
+    __table_args__ = (
+        Index(
+            "ix_custom_reaction_handler_guild_reaction",
+            "guild_id",
+            "reaction_id",
+            "reaction_name",
+        ),
+    )
 
     # Columns
     id: Mapped[int_pk]
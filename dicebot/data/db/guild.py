@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import datetime
 import re
 from typing import Annotated, Optional, Sequence
 
@@ -10,18 +11,20 @@ from sqlalchemy import (
     BigInteger,
     Column,
     ForeignKey,
+    Index,
     Table,
-    case,
     delete,
     desc,
-    func,
     select,
     sql,
     text,
+    update,
 )
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.expression import ColumnElement
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
+from dicebot.data.db.active_event import ActiveEvent
 from dicebot.data.db.alias import Alias
 from dicebot.data.db.ban import Ban
 from dicebot.data.db.base import Base
@@ -30,8 +33,9 @@ from dicebot.data.db.feature import Feature
 from dicebot.data.db.macro import Macro
 from dicebot.data.db.rename import Rename
 from dicebot.data.db.roll import Roll
-from dicebot.data.db.thanks import Thanks
 from dicebot.data.db.user import User
+from dicebot.data.db.user_guild_stats import UserGuildStats
+from dicebot.data.db.user_name import UserName
 
 # Special types to make the ORM models prettier
 bigint = Annotated[int, mapped_column(BigInteger)]
@@ -72,6 +76,16 @@ user_guild_admin_assoc = Table(
 
 class Guild(Base):
     __tablename__ = "guild"
+    __table_args__ = (
+        # The hourly daily-event check only ever looks at guilds with events on
+        Index(
+            "ix_guild_events_timezone",
+            "timezone",
+            postgresql_where=text(
+                "events_probability IS NOT NULL AND events_channel_id IS NOT NULL"
+            ),
+        ),
+    )
 
     # Columns
     id: Mapped[bigint_pk_natural]
@@ -168,6 +182,17 @@ class Guild(Base):
         else:
             old_alias.value = value
 
+    def has_feature(self, feature_name: str) -> bool:
+        return any(f.feature_name == feature_name for f in self.features)
+
+    async def add_feature(self, session: AsyncSession, feature_name: str) -> None:
+        if not self.has_feature(feature_name):
+            feature = await Feature.get_or_create(session, feature_name)
+            self.features.append(feature)
+
+    def remove_feature(self, feature_name: str) -> None:
+        self.features = [f for f in self.features if f.feature_name != feature_name]
+
     async def roll_scoreboard_str(
         self,
         client: discord.Client,
@@ -175,18 +200,13 @@ class Guild(Base):
     ) -> discord.Embed:
         records = await session.execute(
             select(
-                Roll.discord_user_id,
-                func.sum(
-                    case((Roll.actual_roll == Roll.target_roll, 1), else_=0)
-                ).label("wins"),
-                func.sum(
-                    case((Roll.actual_roll == Roll.target_roll - 1, 1), else_=0)
-                ).label("losses"),
-                func.sum(case((Roll.actual_roll == 1, 1), else_=0)).label("ones"),
-                func.count(Roll.discord_user_id).label("attempts"),
+                UserGuildStats.user_id.label("discord_user_id"),
+                UserGuildStats.roll_wins.label("wins"),
+                UserGuildStats.roll_losses.label("losses"),
+                UserGuildStats.roll_ones.label("ones"),
+                UserGuildStats.rolls.label("attempts"),
             )
-            .filter_by(guild_id=self.id)
-            .group_by(Roll.discord_user_id)
+            .filter(UserGuildStats.guild_id == self.id, UserGuildStats.rolls > 0)
             .order_by(text("wins"), text("losses"), text("ones"), text("attempts"))
         )
 
@@ -195,12 +215,12 @@ class Guild(Base):
         if not rows:
             embed.description = "No rolls yet."
             return embed
+        names = await UserName.resolve(
+            session, client, self.id, (rec.discord_user_id for rec in rows)
+        )
         for rec in rows:
-            user = client.get_user(rec.discord_user_id)
-            if not user:
-                user = await client.fetch_user(rec.discord_user_id)
             embed.add_field(
-                name=user.name,
+                name=names[rec.discord_user_id],
                 value=f"{rec.wins}W / {rec.losses}L / {rec.ones} crits / {rec.attempts} total",
                 inline=False,
             )
@@ -210,9 +230,11 @@ class Guild(Base):
         self, client: discord.Client, session: AsyncSession
     ) -> discord.Embed:
         ban_records = await session.execute(
-            select(Ban.bannee_id, func.count(Ban.bannee_id).label("ban_count"))
-            .filter_by(guild_id=self.id)
-            .group_by(Ban.bannee_id)
+            select(
+                UserGuildStats.user_id.label("bannee_id"),
+                UserGuildStats.times_banned.label("ban_count"),
+            )
+            .filter(UserGuildStats.guild_id == self.id, UserGuildStats.times_banned > 0)
             .order_by(desc(text("ban_count")))
         )
 
@@ -221,12 +243,12 @@ class Guild(Base):
         if not rows:
             embed.description = "No bans yet."
             return embed
+        names = await UserName.resolve(
+            session, client, self.id, (record.bannee_id for record in rows)
+        )
         for record in rows:
-            user = client.get_user(record.bannee_id)
-            if not user:
-                user = await client.fetch_user(record.bannee_id)
             embed.add_field(
-                name=user.name,
+                name=names[record.bannee_id],
                 value=f"Banned {record.ban_count} time{'s' if record.ban_count != 1 else ''}",
                 inline=False,
             )
@@ -235,37 +257,17 @@ class Guild(Base):
     async def thanks_scoreboard_str(
         self, client: discord.Client, session: AsyncSession
     ) -> discord.Embed:
-        users_q = (
-            select(Thanks.thanker_id.label("user_id"))
-            .filter_by(guild_id=self.id)
-            .union(
-                select(Thanks.thankee_id.label("user_id")).filter_by(guild_id=self.id)
-            )
-        ).subquery()
-        distinct_users_q = select(
-            users_q.c.user_id.distinct().label("user_id")
-        ).subquery()
-
-        thanks_q = (
-            select(Thanks.thanker_id, Thanks.thankee_id).filter_by(guild_id=self.id)
-        ).subquery()
-
-        # Intentional Cartesian product to count per-user sent/received
-        joined_q = select(
-            distinct_users_q.c.user_id, thanks_q.c.thanker_id, thanks_q.c.thankee_id
-        ).subquery()
-
         records = await session.execute(
             select(
-                joined_q.c.user_id,
-                func.sum(
-                    case((joined_q.c.user_id == joined_q.c.thanker_id, 1), else_=0)
-                ).label("sent"),
-                func.sum(
-                    case((joined_q.c.user_id == joined_q.c.thankee_id, 1), else_=0)
-                ).label("received"),
+                UserGuildStats.user_id,
+                UserGuildStats.thanks_given.label("sent"),
+                UserGuildStats.thanks_received.label("received"),
+            )
+            .filter(
+                UserGuildStats.guild_id == self.id,
+                (UserGuildStats.thanks_given > 0)
+                | (UserGuildStats.thanks_received > 0),
             )
-            .group_by(joined_q.c.user_id)
             .order_by(text("received"), text("sent"))
         )
 
@@ -274,12 +276,12 @@ class Guild(Base):
         if not rows:
             embed.description = "No thanks yet."
             return embed
+        names = await UserName.resolve(
+            session, client, self.id, (record.user_id for record in rows)
+        )
         for record in rows:
-            user = client.get_user(record.user_id)
-            if not user:
-                user = await client.fetch_user(record.user_id)
             embed.add_field(
-                name=user.name,
+                name=names[record.user_id],
                 value=f"{record.received} received / {record.sent} sent",
                 inline=False,
             )
@@ -287,6 +289,18 @@ class Guild(Base):
 
     async def clear_stats(self, session: AsyncSession) -> None:
         await session.execute(delete(Roll).where(Roll.guild_id == self.id))
+        await session.execute(
+            update(UserGuildStats)
+            .where(UserGuildStats.guild_id == self.id)
+            .values(
+                rolls=0,
+                roll_wins=0,
+                roll_losses=0,
+                roll_ones=0,
+                best_roll=0,
+                last_rolled_at=None,
+            )
+        )
         self.current_roll = DEFAULT_START_ROLL
         await session.commit()
 
@@ -334,7 +348,8 @@ class Guild(Base):
     ) -> Guild:
         res = await session.get(cls, guild_id)
         if res is None:
-            res = cls(id=guild_id, is_dm=is_dm)
+            # Start with an empty feature list so it's loaded without a lazy load
+            res = cls(id=guild_id, is_dm=is_dm, features=[])
             # Add the new guild owner as the only admin
             owner = await User.get_or_create(session, owner_id)
             res.admins.append(owner)
@@ -353,6 +368,47 @@ class Guild(Base):
         )
         return res.all()
 
+    @classmethod
+    async def get_event_timezones(cls, session: AsyncSession) -> Sequence[str]:
+        """Every timezone used by a guild that has daily events turned on"""
+        res = await session.scalars(
+            select(Guild.timezone).filter(*cls._has_events()).distinct()
+        )
+        return res.all()
+
+    @classmethod
+    async def get_all_for_events(
+        cls,
+        session: AsyncSession,
+        timezones: Sequence[str],
+        now: datetime.datetime,
+    ) -> Sequence[Guild]:
+        """Guilds with daily events turned on, in one of `timezones`, that
+        don't already have an event going"""
+        if len(timezones) == 0:
+            return []
+        has_active_event = (
+            select(ActiveEvent.id)
+            .filter(ActiveEvent.guild_id == Guild.id, ActiveEvent.expires_at > now)
+            .exists()
+        )
+        res = await session.scalars(
+            select(Guild).filter(
+                *cls._has_events(),
+                Guild.timezone.in_(timezones),
+                ~has_active_event,
+            )
+        )
+        return res.all()
+
+    @staticmethod
+    def _has_events() -> tuple[ColumnElement[bool], ...]:
+        return (
+            Guild.is_dm.is_(False),
+            Guild.events_probability.is_not(None),
+            Guild.events_channel_id.is_not(None),
+        )
+
     @classmethod
     async def get_all(cls, session: AsyncSession) -> Sequence[Guild]:
         res = await session.scalars(select(Guild).filter_by(is_dm=False))
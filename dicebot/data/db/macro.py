@@ -3,9 +3,9 @@
 from __future__ import annotations
 
 import urllib.parse
-from typing import TYPE_CHECKING, Annotated, Optional, Sequence
+from typing import TYPE_CHECKING, Annotated, Dict, Optional, Sequence
 
-from sqlalchemy import BigInteger, ForeignKey, select
+from sqlalchemy import BigInteger, ForeignKey, UniqueConstraint, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -22,6 +22,7 @@ int_ix = Annotated[int, mapped_column(BigInteger, index=True)]
 
 class Macro(Base):
     __tablename__ = "macro"
+    __table_args__ = (UniqueConstraint("guild_id", "key", name="uq_macro_guild_key"),)
 
     # Columns
     id: Mapped[int_pk]
@@ -60,5 +61,14 @@ class Macro(Base):
         res = await session.scalars(select(Macro).filter_by(guild_id=guild.id))
         return res.all()
 
+    @classmethod
+    async def get_key_values(
+        cls, session: AsyncSession, guild: Guild
+    ) -> Dict[str, str]:
+        res = await session.execute(
+            select(Macro.key, Macro.value).filter_by(guild_id=guild.id)
+        )
+        return {row.key: row.value for row in res}
+
     def __repr__(self) -> str:
         return f"Macro({self.id=}, {self.key=}, {self.value=})"
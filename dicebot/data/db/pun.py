@@ -1,17 +1,24 @@
 #!/usr/bin/env python3
 
 from __future__ import annotations
-from typing import Optional
+from typing import Optional, Sequence, Tuple
 
-from sqlalchemy import BigInteger, Text, DateTime, func, select
+from sqlalchemy import BigInteger, Index, LargeBinary, Text, DateTime, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Mapped, mapped_column
 
 from dicebot.data.db.base import Base
+from dicebot.data.db.user_guild_stats import UserGuildStats
+from dicebot.data.types.minhash import MinHash
 
 
 class Pun(Base):
     __tablename__ = "pun"
+    # get_by_punchline. A hash index since punchlines can be longer than a
+    # btree entry is allowed to be in Postgres.
+    __table_args__ = (
+        Index("ix_pun_punchline", "punchline", postgresql_using="hash"),
+    )
 
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
     guild_id: Mapped[int] = mapped_column(BigInteger, nullable=False, index=True)
@@ -19,6 +26,31 @@ class Pun(Base):
     punchline: Mapped[str] = mapped_column(Text, nullable=False)
     first_poster_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
     posted_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    # MinHash signatures for fuzzy repost detection. Older rows don't have
+    # them until dicebot.data.backfill_pun_signatures has been run, so they
+    # get computed on the fly when missing.
+    setup_signature: Mapped[Optional[bytes]] = mapped_column(LargeBinary, nullable=True)
+    punchline_signature: Mapped[Optional[bytes]] = mapped_column(LargeBinary, nullable=True)
+
+    def signatures(self) -> Tuple[MinHash, MinHash]:
+        setup = (
+            MinHash.from_bytes(self.setup_signature)
+            if self.setup_signature is not None
+            else MinHash.of(self.setup)
+        )
+        punchline = (
+            MinHash.from_bytes(self.punchline_signature)
+            if self.punchline_signature is not None
+            else MinHash.of(self.punchline)
+        )
+        return setup, punchline
+
+    @classmethod
+    async def get_all_for_guild(
+        cls, session: AsyncSession, guild_id: int
+    ) -> Sequence[Pun]:
+        result = await session.scalars(select(Pun).filter_by(guild_id=guild_id))
+        return result.all()
 
     @classmethod
     async def get_by_punchline(
@@ -40,8 +72,11 @@ class Pun(Base):
                 setup=setup,
                 punchline=punchline,
                 first_poster_id=first_poster_id,
+                setup_signature=MinHash.of(setup).to_bytes(),
+                punchline_signature=MinHash.of(punchline).to_bytes(),
             )
             session.add(pun)
+            await UserGuildStats.record_pun(session, pun)
             await session.commit()
         return pun
 
@@ -5,7 +5,7 @@ from __future__ import annotations
 import datetime
 from typing import Annotated, Optional
 
-from sqlalchemy import BigInteger, ForeignKey, func, select
+from sqlalchemy import BigInteger, ForeignKey, Index, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -23,6 +23,10 @@ timestamp_now = Annotated[
 
 class ReactedMessage(Base):
     __tablename__ = "reacted_message"
+    # get_by_msg_and_reaction_id
+    __table_args__ = (
+        Index("ix_reacted_message_msg_reaction", "msg_id", "reaction_id"),
+    )
 
     # Columns
     id: Mapped[bigint_pk]
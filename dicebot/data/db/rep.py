@@ -3,13 +3,24 @@
 from __future__ import annotations
 
 import datetime
-from typing import Annotated, Optional
+from dataclasses import dataclass
+from typing import Annotated, Optional, Tuple
 
-from sqlalchemy import BigInteger, ForeignKey, Integer, func, select
+from sqlalchemy import (
+    BigInteger,
+    ForeignKey,
+    Index,
+    Integer,
+    func,
+    select,
+    sql,
+    union_all,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Mapped, mapped_column
 
 from dicebot.data.db.base import Base
+from dicebot.data.db.user_guild_stats import UserGuildStats
 
 bigint = Annotated[int, mapped_column(BigInteger)]
 bigint_pk = Annotated[int, mapped_column(BigInteger, primary_key=True)]
@@ -18,6 +29,24 @@ bigint_ix = Annotated[int, mapped_column(BigInteger, index=True)]
 
 class Rep(Base):
     __tablename__ = "rep"
+    # get_relationship_summary, which sums amounts per giver for a receiver
+    # and per receiver for a giver
+    __table_args__ = (
+        Index(
+            "ix_rep_guild_receiver_giver_amount",
+            "guild_id",
+            "receiver_id",
+            "giver_id",
+            "amount",
+        ),
+        Index(
+            "ix_rep_guild_giver_receiver_amount",
+            "guild_id",
+            "giver_id",
+            "receiver_id",
+            "amount",
+        ),
+    )
 
     id: Mapped[bigint_pk]
     guild_id: Mapped[bigint_ix] = mapped_column(ForeignKey("guild.id"))
@@ -45,111 +74,93 @@ class Rep(Base):
             amount=amount,
         )
         session.add(rep)
+        await UserGuildStats.record_rep(session, rep)
         await session.commit()
         return rep
 
     @classmethod
-    async def get_total_received(
+    async def get_relationship_summary(
         cls, session: AsyncSession, guild_id: int, user_id: int
-    ) -> int:
-        """Sum of all rep received by user_id in this guild."""
-        result = await session.scalar(
-            select(func.coalesce(func.sum(cls.amount), 0))
-            .filter_by(guild_id=guild_id, receiver_id=user_id)
+    ) -> RepSummary:
+        """Everything about user_id's rep in this guild, in one statement: the
+        net rep between them and each person they've given to or received
+        from, ranked in each direction, keeping only the top and bottom."""
+        received_q = (
+            select(
+                sql.true().label("is_received"),
+                cls.giver_id.label("other_id"),
+                func.sum(cls.amount).label("total"),
+            )
+            .filter(cls.guild_id == guild_id, cls.receiver_id == user_id)
+            .group_by(cls.giver_id)
         )
-        return int(result)
-
-    @classmethod
-    async def get_total_given(
-        cls, session: AsyncSession, guild_id: int, user_id: int
-    ) -> int:
-        """Sum of all rep given by user_id in this guild."""
-        result = await session.scalar(
-            select(func.coalesce(func.sum(cls.amount), 0))
-            .filter_by(guild_id=guild_id, giver_id=user_id)
+        given_q = (
+            select(
+                sql.false().label("is_received"),
+                cls.receiver_id.label("other_id"),
+                func.sum(cls.amount).label("total"),
+            )
+            .filter(cls.guild_id == guild_id, cls.giver_id == user_id)
+            .group_by(cls.receiver_id)
         )
-        return int(result)
+        pairs = union_all(received_q, given_q).subquery()
 
-    @classmethod
-    async def get_biggest_fan(
-        cls, session: AsyncSession, guild_id: int, user_id: int
-    ) -> Optional[tuple[int, int]]:
-        """Returns (giver_id, total) for the person who gave user_id the most positive rep.
-        Returns None if no rep received."""
-        result = await session.execute(
-            select(cls.giver_id, func.sum(cls.amount).label("total"))
-            .filter_by(guild_id=guild_id, receiver_id=user_id)
-            .group_by(cls.giver_id)
-            .order_by(func.sum(cls.amount).desc())
-            .limit(1)
-        )
-        row = result.one_or_none()
-        if row is None:
-            return None
-        total = int(row.total)
-        if total <= 0:
-            return None
-        return (row.giver_id, total)
+        direction = pairs.c.is_received
+        ranked = select(
+            pairs,
+            func.sum(pairs.c.total)
+            .over(partition_by=direction)
+            .label("direction_total"),
+            func.row_number()
+            .over(
+                partition_by=direction,
+                order_by=(pairs.c.total.desc(), pairs.c.other_id),
+            )
+            .label("top"),
+            func.row_number()
+            .over(
+                partition_by=direction,
+                order_by=(pairs.c.total.asc(), pairs.c.other_id),
+            )
+            .label("bottom"),
+        ).subquery()
 
-    @classmethod
-    async def get_hater(
-        cls, session: AsyncSession, guild_id: int, user_id: int
-    ) -> Optional[tuple[int, int]]:
-        """Returns (giver_id, total) for the person who gave user_id the most negative rep.
-        Returns None if no negative rep received."""
-        result = await session.execute(
-            select(cls.giver_id, func.sum(cls.amount).label("total"))
-            .filter_by(guild_id=guild_id, receiver_id=user_id)
-            .group_by(cls.giver_id)
-            .order_by(func.sum(cls.amount).asc())
-            .limit(1)
+        rows = await session.execute(
+            select(ranked).filter((ranked.c.top == 1) | (ranked.c.bottom == 1))
         )
-        row = result.one_or_none()
-        if row is None:
-            return None
-        total = int(row.total)
-        if total >= 0:
-            return None  # No actual hater (all givers are net positive or zero)
-        return (row.giver_id, total)
 
-    @classmethod
-    async def get_best_friend(
-        cls, session: AsyncSession, guild_id: int, user_id: int
-    ) -> Optional[tuple[int, int]]:
-        """Returns (receiver_id, total) for the person user_id has given the most rep to.
-        Returns None if user_id has given no rep."""
-        result = await session.execute(
-            select(cls.receiver_id, func.sum(cls.amount).label("total"))
-            .filter_by(guild_id=guild_id, giver_id=user_id)
-            .group_by(cls.receiver_id)
-            .order_by(func.sum(cls.amount).desc())
-            .limit(1)
-        )
-        row = result.one_or_none()
-        if row is None:
-            return None
-        total = int(row.total)
-        if total <= 0:
-            return None
-        return (row.receiver_id, total)
+        res = RepSummary()
+        for row in rows:
+            total = int(row.total)
+            pair = (row.other_id, total)
+            if row.is_received:
+                res.received = int(row.direction_total)
+                if row.top == 1 and total > 0:
+                    res.biggest_fan = pair
+                if row.bottom == 1 and total < 0:
+                    res.hater = pair
+            else:
+                res.given = int(row.direction_total)
+                if row.top == 1 and total > 0:
+                    res.best_friend = pair
+                if row.bottom == 1 and total < 0:
+                    res.nemesis = pair
+        return res
 
-    @classmethod
-    async def get_nemesis(
-        cls, session: AsyncSession, guild_id: int, user_id: int
-    ) -> Optional[tuple[int, int]]:
-        """Returns (receiver_id, total) for the person user_id has given the least (most negative) rep to.
-        Returns None if user_id has given no negative rep."""
-        result = await session.execute(
-            select(cls.receiver_id, func.sum(cls.amount).label("total"))
-            .filter_by(guild_id=guild_id, giver_id=user_id)
-            .group_by(cls.receiver_id)
-            .order_by(func.sum(cls.amount).asc())
-            .limit(1)
-        )
-        row = result.one_or_none()
-        if row is None:
-            return None
-        total = int(row.total)
-        if total >= 0:
-            return None  # No nemesis (all recipients are net positive or zero)
-        return (row.receiver_id, total)
+
+@dataclass
+class RepSummary:
+    """Net rep in each direction, plus who's on either end of it. Each
+    relationship is (other user's ID, net rep) and is only set if there's a
+    clear one: a biggest fan has to have given net positive rep, a hater net
+    negative, and likewise for best friend and nemesis."""
+
+    # Rep the user has received/given in total
+    received: int = 0
+    given: int = 0
+    # Who gave the user the most and least rep
+    biggest_fan: Optional[Tuple[int, int]] = None
+    hater: Optional[Tuple[int, int]] = None
+    # Who the user gave the most and least rep to
+    best_friend: Optional[Tuple[int, int]] = None
+    nemesis: Optional[Tuple[int, int]] = None
@@ -3,9 +3,10 @@
 from __future__ import annotations
 
 import datetime
+import random
 from typing import Annotated, Optional, Sequence
 
-from sqlalchemy import BigInteger, ForeignKey, func, select, sql
+from sqlalchemy import BigInteger, ForeignKey, Index, func, select, sql, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -20,9 +21,39 @@ timestamp_now = Annotated[
     mapped_column(nullable=False, server_default=func.CURRENT_TIMESTAMP()),
 ]
 
+# How far apart reminders are for each frequency. "random" is handled below.
+REMINDER_INTERVALS = {
+    "daily": datetime.timedelta(days=1),
+    "weekly": datetime.timedelta(days=7),
+    # Just... assume there are 31 days in a month. Close enough.
+    "monthly": datetime.timedelta(days=31),
+    "quarterly": datetime.timedelta(days=31 * 3),
+    "yearly": datetime.timedelta(days=365),
+}
+# Random reminders come 1-73 days apart, so about 10 of them a year
+RANDOM_REMINDER_MAX_DAYS = 73
+# Resolutions are for the year, so reminders stop after this long
+REMINDER_PERIOD = datetime.timedelta(days=365)
+
+
+def next_reminder(frequency: str, after: datetime.datetime) -> datetime.datetime:
+    if frequency == "random":
+        days = random.randint(1, RANDOM_REMINDER_MAX_DAYS)
+        return after + datetime.timedelta(days=days)
+    return after + REMINDER_INTERVALS[frequency]
+
 
 class Resolution(Base):
     __tablename__ = "resolution"
+    __table_args__ = (
+        # Only active resolutions with reminders left are ever due, so the
+        # periodic scan only has to look at those
+        Index(
+            "ix_resolution_due_reminders",
+            "next_reminder_at",
+            postgresql_where=sql.text("active AND next_reminder_at IS NOT NULL"),
+        ),
+    )
 
     # Columns
     id: Mapped[int_pk]
@@ -33,8 +64,81 @@ class Resolution(Base):
     frequency: Mapped[str]
     active: Mapped[bool_t_sd]
     created_at: Mapped[timestamp_now]
+    # The recurrence: remind every `frequency` until `remind_until`. Both are
+    # NULL for resolutions made before reminders were scheduled this way, and
+    # next_reminder_at goes NULL once there are no reminders left.
+    next_reminder_at: Mapped[Optional[datetime.datetime]]
+    remind_until: Mapped[Optional[datetime.datetime]]
 
     # Methods
+    @classmethod
+    def new(
+        cls,
+        guild_id: int,
+        author_id: int,
+        channel_id: int,
+        msg: str,
+        frequency: str,
+        now: Optional[datetime.datetime] = None,
+    ) -> Resolution:
+        now = now or datetime.datetime.now()
+        return cls(
+            guild_id=guild_id,
+            author_id=author_id,
+            channel_id=channel_id,
+            msg=msg,
+            frequency=frequency,
+            next_reminder_at=next_reminder(frequency, now),
+            remind_until=now + REMINDER_PERIOD,
+        )
+
+    def advance(self, now: datetime.datetime) -> None:
+        """Move on to the next reminder after `now`. Reminders missed while
+        nobody was around to send them are skipped rather than sent in a burst."""
+        if self.next_reminder_at is None or self.remind_until is None:
+            return
+        self.next_reminder_at = self._next_reminder_after(now)
+
+    async def claim_reminder(
+        self, session: AsyncSession, now: datetime.datetime
+    ) -> bool:
+        """Advance (as above) in the database, but only if nobody else has
+        since this was loaded. Returns whether the due reminder is ours to
+        send."""
+        if self.next_reminder_at is None or self.remind_until is None:
+            return False
+        res = await session.execute(
+            update(Resolution)
+            .filter_by(id=self.id, next_reminder_at=self.next_reminder_at)
+            .values(next_reminder_at=self._next_reminder_after(now))
+            .returning(Resolution.id)
+        )
+        return res.first() is not None
+
+    def _next_reminder_after(
+        self, now: datetime.datetime
+    ) -> Optional[datetime.datetime]:
+        assert self.next_reminder_at is not None and self.remind_until is not None
+        res = self.next_reminder_at
+        while res <= now:
+            res = next_reminder(self.frequency, res)
+        return res if res <= self.remind_until else None
+
+    @classmethod
+    async def get_due(
+        cls, session: AsyncSession, now: datetime.datetime
+    ) -> Sequence[Resolution]:
+        res = await session.scalars(
+            select(cls)
+            .filter(
+                cls.active,
+                cls.next_reminder_at.is_not(None),
+                cls.next_reminder_at <= now,
+            )
+            .order_by(cls.next_reminder_at)
+        )
+        return res.all()
+
     @classmethod
     async def get_or_none(
         cls, session: AsyncSession, resolution_id: int
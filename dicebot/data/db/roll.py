@@ -5,7 +5,7 @@ from __future__ import annotations
 import datetime
 from typing import TYPE_CHECKING, Annotated, Optional
 
-from sqlalchemy import BigInteger, ForeignKey, func, select
+from sqlalchemy import BigInteger, ForeignKey, Index, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -27,6 +27,10 @@ timestamp_now = Annotated[
 
 class Roll(Base):
     __tablename__ = "roll"
+    # get_last_roll
+    __table_args__ = (
+        Index("ix_roll_guild_user_id", "guild_id", "discord_user_id", "id"),
+    )
 
     # Columns
     id: Mapped[bigint_pk]
@@ -27,7 +27,7 @@ class ScheduledEvent(Base):
     channel_id: Mapped[bigint]
     name: Mapped[str]
     event_time: Mapped[datetime.datetime]
-    message_id: Mapped[Optional[bigint]]
+    message_id: Mapped[Optional[bigint]] = mapped_column(index=True)
 
     @classmethod
     async def get_by_id(cls, session: AsyncSession, event_id: int) -> Optional[ScheduledEvent]:
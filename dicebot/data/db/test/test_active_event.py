@@ -3,49 +3,12 @@
 import datetime
 import unittest
 
-from sqlalchemy import BigInteger, Integer
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-
 from dicebot.data.db.active_event import ActiveEvent, EventType
-from dicebot.data.db.base import Base
-
-# Import all models so their tables are registered in Base.metadata before create_all
-import dicebot.data.db.guild  # noqa: F401
-
-
-async def _create_tables(conn):
-    """Create all tables, replacing BigInteger with Integer for SQLite compatibility."""
-
-    def _create(connection):
-        for table in Base.metadata.sorted_tables:
-            # Replace BigInteger with Integer for SQLite (needed for PK autoincrement)
-            cols_to_fix = [
-                col for col in table.columns
-                if isinstance(col.type, BigInteger)
-            ]
-            original_types = {col.name: col.type for col in cols_to_fix}
-            for col in cols_to_fix:
-                col.type = Integer()
-            try:
-                table.create(connection, checkfirst=True)
-            finally:
-                for col in cols_to_fix:
-                    col.type = original_types[col.name]
-
-    await conn.run_sync(_create)
+from dicebot.data.db.guild import Guild
+from dicebot.test.utils import DatabaseTestCase
 
 
-class TestActiveEvent(unittest.IsolatedAsyncioTestCase):
-    async def asyncSetUp(self):
-        self.engine = create_async_engine("sqlite+aiosqlite:///:memory:")
-        async with self.engine.begin() as conn:
-            await _create_tables(conn)
-        self.session = AsyncSession(self.engine, expire_on_commit=False)
-
-    async def asyncTearDown(self):
-        await self.session.close()
-        await self.engine.dispose()
-
+class TestActiveEvent(DatabaseTestCase):
     async def test_get_current_no_event(self):
         """get_current returns None when no rows exist."""
         result = await ActiveEvent.get_current(self.session, guild_id=1)
@@ -95,6 +58,78 @@ class TestActiveEvent(unittest.IsolatedAsyncioTestCase):
         self.assertIsNotNone(result)
         self.assertEqual(result.event_type_enum, EventType.BLESSING_DAY)
 
+    async def test_start_many(self):
+        """start_many replaces expired events and inserts new ones."""
+        now = datetime.datetime.now()
+        self.session.add(
+            ActiveEvent(
+                guild_id=1,
+                event_type=EventType.CURSE_DAY.value,
+                started_at=now - datetime.timedelta(days=2),
+                expires_at=now - datetime.timedelta(days=1),
+            )
+        )
+        await self.session.commit()
+
+        await ActiveEvent.start_many(
+            self.session,
+            {1: EventType.TURBO_DAY, 2: EventType.LUCKY_HOUR},
+            now,
+            now + datetime.timedelta(hours=1),
+        )
+        await self.session.commit()
+
+        for guild_id, event_type in [(1, EventType.TURBO_DAY), (2, EventType.LUCKY_HOUR)]:
+            result = await ActiveEvent.get_current(self.session, guild_id=guild_id)
+            self.assertIsNotNone(result)
+            self.assertEqual(result.event_type_enum, event_type)
+
+
+class TestGuildsForEvents(DatabaseTestCase):
+    def _guild(self, guild_id, timezone="US/Pacific", events_probability=0.5, events_channel_id=10):
+        return Guild(
+            id=guild_id,
+            is_dm=False,
+            timezone=timezone,
+            events_probability=events_probability,
+            events_channel_id=events_channel_id,
+        )
+
+    async def test_get_all_for_events(self):
+        """Only guilds with events on, in a due timezone, with no event going are returned."""
+        now = datetime.datetime.now()
+        self.session.add_all(
+            [
+                self._guild(1),
+                self._guild(2, timezone="Europe/London"),
+                self._guild(3, events_probability=None),
+                self._guild(4, events_channel_id=None),
+                self._guild(5),
+                self._guild(6),
+                ActiveEvent(
+                    guild_id=5,
+                    event_type=EventType.DOUBLE_BAN.value,
+                    started_at=now,
+                    expires_at=now + datetime.timedelta(hours=1),
+                ),
+                ActiveEvent(
+                    guild_id=6,
+                    event_type=EventType.DOUBLE_BAN.value,
+                    started_at=now - datetime.timedelta(days=2),
+                    expires_at=now - datetime.timedelta(days=1),
+                ),
+            ]
+        )
+        await self.session.commit()
+
+        self.assertEqual(
+            {"US/Pacific", "Europe/London"},
+            set(await Guild.get_event_timezones(self.session)),
+        )
+        guilds = await Guild.get_all_for_events(self.session, ["US/Pacific"], now)
+        self.assertEqual({1, 6}, {g.id for g in guilds})
+        self.assertEqual([], await Guild.get_all_for_events(self.session, [], now))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+
+import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from dicebot.data.db.guild import Guild
+from dicebot.data.db.user_guild_stats import UserGuildStats
+from dicebot.test.utils import DatabaseTestCase
+
+
+class TestGuildScoreboards(DatabaseTestCase):
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        self.guild = Guild(id=1)
+        names = {1: "alice", 2: "bob", 3: "carol"}
+        patcher = patch(
+            "dicebot.data.db.guild.UserName.resolve", AsyncMock(return_value=names)
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def _stats(self, user_id: int, guild_id: int = 1, **stats) -> None:
+        await UserGuildStats.add(self.session, guild_id, user_id, **stats)
+        await self.session.commit()
+
+    @staticmethod
+    def _fields(embed):
+        return [(field.name, field.value) for field in embed.fields]
+
+    async def test_roll_scoreboard_str(self):
+        await self._stats(1, rolls=10, roll_wins=2, roll_losses=1, roll_ones=3)
+        await self._stats(2, rolls=4, roll_wins=1)
+        # Thanked, but never rolled
+        await self._stats(3, thanks_given=1)
+        await self._stats(1, guild_id=2, rolls=99, roll_wins=99)
+
+        embed = await self.guild.roll_scoreboard_str(MagicMock(), self.session)
+
+        self.assertEqual(
+            [
+                ("bob", "1W / 0L / 0 crits / 4 total"),
+                ("alice", "2W / 1L / 3 crits / 10 total"),
+            ],
+            self._fields(embed),
+        )
+
+    async def test_ban_scoreboard_str(self):
+        await self._stats(1, times_banned=1)
+        await self._stats(2, times_banned=3)
+        await self._stats(3, rolls=1)
+
+        embed = await self.guild.ban_scoreboard_str(MagicMock(), self.session)
+
+        self.assertEqual(
+            [("bob", "Banned 3 times"), ("alice", "Banned 1 time")],
+            self._fields(embed),
+        )
+
+    async def test_thanks_scoreboard_str(self):
+        await self._stats(1, thanks_given=2, thanks_received=1)
+        await self._stats(2, thanks_given=1, thanks_received=2)
+        await self._stats(3, rolls=1)
+
+        embed = await self.guild.thanks_scoreboard_str(MagicMock(), self.session)
+
+        self.assertEqual(
+            [("alice", "1 received / 2 sent"), ("bob", "2 received / 1 sent")],
+            self._fields(embed),
+        )
+
+    async def test_scoreboards_empty(self):
+        client = MagicMock()
+        roll = await self.guild.roll_scoreboard_str(client, self.session)
+        ban = await self.guild.ban_scoreboard_str(client, self.session)
+        thanks = await self.guild.thanks_scoreboard_str(client, self.session)
+
+        self.assertEqual("No rolls yet.", roll.description)
+        self.assertEqual("No bans yet.", ban.description)
+        self.assertEqual("No thanks yet.", thanks.description)
+
+    async def test_clear_stats_resets_roll_stats(self):
+        self.session.add(self.guild)
+        rolled_at = datetime.datetime(2024, 1, 1)
+        await self._stats(
+            1, rolls=3, roll_wins=1, best_roll=9, last_rolled_at=rolled_at
+        )
+        await self._stats(1, times_banned=2, thanks_given=1)
+
+        await self.guild.clear_stats(self.session)
+
+        stats = await UserGuildStats.get(self.session, 1, 1)
+        self.assertEqual(
+            (0, 0, 0, None),
+            (stats.rolls, stats.roll_wins, stats.best_roll, stats.last_rolled_at),
+        )
+        self.assertEqual((2, 1), (stats.times_banned, stats.thanks_given))
+        roll = await self.guild.roll_scoreboard_str(MagicMock(), self.session)
+        self.assertEqual("No rolls yet.", roll.description)
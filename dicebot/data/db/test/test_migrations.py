@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+
+import os
+import tempfile
+import unittest
+
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import create_engine, inspect
+
+from dicebot.core.import_witchcraft import import_submodules
+from dicebot.data.db.base import Base
+
+import_submodules("dicebot.data.db")
+
+ALEMBIC_DIR = os.path.join(
+    os.path.dirname(__file__), os.pardir, os.pardir, os.pardir, os.pardir, "alembic"
+)
+
+
+class TestMigrations(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()
+        db_path = os.path.join(self.tmpdir.name, "dicebot.db")
+        self.engine = create_engine(f"sqlite:///{db_path}")
+        self.config = Config()
+        self.config.set_main_option("script_location", os.path.abspath(ALEMBIC_DIR))
+
+    def tearDown(self) -> None:
+        self.engine.dispose()
+        self.tmpdir.cleanup()
+
+    def _run(self, cmd, revision: str) -> None:
+        with self.engine.begin() as conn:
+            self.config.attributes["connection"] = conn
+            cmd(self.config, revision)
+
+    def test_single_head(self) -> None:
+        heads = ScriptDirectory.from_config(self.config).get_heads()
+        self.assertEqual(1, len(heads), f"Multiple heads, merge them: {heads}")
+
+    def test_models_match_migrations(self) -> None:
+        """If this fails, the models changed without a migration to go with
+        them. Run `alembic revision --autogenerate` and check what it wrote."""
+        self._run(command.upgrade, "head")
+
+        with self.engine.connect() as conn:
+            context = MigrationContext.configure(conn)
+            diff = compare_metadata(context, Base.metadata)
+        self.assertEqual([], diff)
+
+    def test_downgrade(self) -> None:
+        self._run(command.upgrade, "head")
+        self._run(command.downgrade, "base")
+
+        tables = inspect(self.engine).get_table_names()
+        self.assertEqual(["alembic_version"], tables)
@@ -2,36 +2,8 @@
 
 import unittest
 
-from sqlalchemy import BigInteger, Integer
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-
-from dicebot.data.db.base import Base
-from dicebot.data.db.rep import Rep
-
-# Import all models so their tables are registered in Base.metadata before create_all
-import dicebot.data.db.guild  # noqa: F401
-
-
-async def _create_tables(conn):
-    """Create all tables, replacing BigInteger with Integer for SQLite compatibility."""
-
-    def _create(connection):
-        for table in Base.metadata.sorted_tables:
-            # Replace BigInteger with Integer for SQLite (needed for PK autoincrement)
-            cols_to_fix = [
-                col for col in table.columns
-                if isinstance(col.type, BigInteger)
-            ]
-            original_types = {col.name: col.type for col in cols_to_fix}
-            for col in cols_to_fix:
-                col.type = Integer()
-            try:
-                table.create(connection, checkfirst=True)
-            finally:
-                for col in cols_to_fix:
-                    col.type = original_types[col.name]
-
-    await conn.run_sync(_create)
+from dicebot.data.db.rep import Rep, RepSummary
+from dicebot.test.utils import DatabaseTestCase
 
 
 GUILD_ID = 1
@@ -40,108 +12,119 @@ USER_B = 102
 USER_C = 103
 
 
-class TestRep(unittest.IsolatedAsyncioTestCase):
-    async def asyncSetUp(self):
-        self.engine = create_async_engine("sqlite+aiosqlite:///:memory:")
-        async with self.engine.begin() as conn:
-            await _create_tables(conn)
-        self.session = AsyncSession(self.engine, expire_on_commit=False)
-
-    async def asyncTearDown(self):
-        await self.session.close()
-        await self.engine.dispose()
-
-    async def test_give_and_get_total_received(self):
-        """give records rep and get_total_received returns the correct sum."""
+class TestRep(DatabaseTestCase):
+    async def test_give_and_summary_received(self):
+        """give records rep and the summary's received is the correct sum."""
         await Rep.give(self.session, guild_id=GUILD_ID, giver_id=USER_A, receiver_id=USER_B, amount=10)
-        total = await Rep.get_total_received(self.session, guild_id=GUILD_ID, user_id=USER_B)
+        total = (await Rep.get_relationship_summary(self.session, guild_id=GUILD_ID, user_id=USER_B)).received
         self.assertEqual(total, 10)
 
-    async def test_get_total_received_no_rep(self):
-        """get_total_received returns 0 when the user has received no rep."""
-        total = await Rep.get_total_received(self.session, guild_id=GUILD_ID, user_id=USER_A)
+    async def test_summary_received_no_rep(self):
+        """The summary's received is 0 when the user has received no rep."""
+        total = (await Rep.get_relationship_summary(self.session, guild_id=GUILD_ID, user_id=USER_A)).received
         self.assertEqual(total, 0)
 
-    async def test_get_total_given(self):
-        """get_total_given returns the sum of rep given by a user."""
+    async def test_summary_given(self):
+        """The summary's given is the sum of rep given by a user."""
         await Rep.give(self.session, guild_id=GUILD_ID, giver_id=USER_A, receiver_id=USER_B, amount=5)
-        total = await Rep.get_total_given(self.session, guild_id=GUILD_ID, user_id=USER_A)
+        total = (await Rep.get_relationship_summary(self.session, guild_id=GUILD_ID, user_id=USER_A)).given
         self.assertEqual(total, 5)
 
-    async def test_get_biggest_fan(self):
-        """get_biggest_fan returns (giver_id, total) for the top giver."""
+    async def test_summary_biggest_fan(self):
+        """The summary's biggest_fan is (giver_id, total) for the top giver."""
         await Rep.give(self.session, guild_id=GUILD_ID, giver_id=USER_A, receiver_id=USER_C, amount=10)
         await Rep.give(self.session, guild_id=GUILD_ID, giver_id=USER_B, receiver_id=USER_C, amount=3)
-        result = await Rep.get_biggest_fan(self.session, guild_id=GUILD_ID, user_id=USER_C)
+        result = (await Rep.get_relationship_summary(self.session, guild_id=GUILD_ID, user_id=USER_C)).biggest_fan
         self.assertIsNotNone(result)
         self.assertEqual(result[0], USER_A)
         self.assertEqual(result[1], 10)
 
-    async def test_get_biggest_fan_none(self):
-        """get_biggest_fan returns None when no rep has been given to this user."""
-        result = await Rep.get_biggest_fan(self.session, guild_id=GUILD_ID, user_id=USER_C)
+    async def test_summary_biggest_fan_none(self):
+        """The summary's biggest_fan is None when no rep has been given to this user."""
+        result = (await Rep.get_relationship_summary(self.session, guild_id=GUILD_ID, user_id=USER_C)).biggest_fan
         self.assertIsNone(result)
 
-    async def test_get_biggest_fan_none_when_net_negative(self):
-        """get_biggest_fan returns None when the top giver has a net-negative total."""
+    async def test_summary_biggest_fan_none_when_net_negative(self):
+        """The summary's biggest_fan is None when the top giver has a net-negative total."""
         await Rep.give(self.session, guild_id=GUILD_ID, giver_id=USER_A, receiver_id=USER_C, amount=1)
         await Rep.give(self.session, guild_id=GUILD_ID, giver_id=USER_A, receiver_id=USER_C, amount=-5)
-        result = await Rep.get_biggest_fan(self.session, guild_id=GUILD_ID, user_id=USER_C)
+        result = (await Rep.get_relationship_summary(self.session, guild_id=GUILD_ID, user_id=USER_C)).biggest_fan
         self.assertIsNone(result)
 
-    async def test_get_hater(self):
-        """get_hater returns (giver_id, total) for the person who gave the most negative rep."""
+    async def test_summary_hater(self):
+        """The summary's hater is (giver_id, total) for the person who gave the most negative rep."""
         await Rep.give(self.session, guild_id=GUILD_ID, giver_id=USER_A, receiver_id=USER_C, amount=-5)
         await Rep.give(self.session, guild_id=GUILD_ID, giver_id=USER_B, receiver_id=USER_C, amount=3)
-        result = await Rep.get_hater(self.session, guild_id=GUILD_ID, user_id=USER_C)
+        result = (await Rep.get_relationship_summary(self.session, guild_id=GUILD_ID, user_id=USER_C)).hater
         self.assertIsNotNone(result)
         self.assertEqual(result[0], USER_A)
         self.assertEqual(result[1], -5)
 
-    async def test_get_hater_none_when_all_positive(self):
-        """get_hater returns None when all givers are net positive."""
+    async def test_summary_hater_none_when_all_positive(self):
+        """The summary's hater is None when all givers are net positive."""
         await Rep.give(self.session, guild_id=GUILD_ID, giver_id=USER_A, receiver_id=USER_C, amount=5)
         await Rep.give(self.session, guild_id=GUILD_ID, giver_id=USER_B, receiver_id=USER_C, amount=3)
-        result = await Rep.get_hater(self.session, guild_id=GUILD_ID, user_id=USER_C)
+        result = (await Rep.get_relationship_summary(self.session, guild_id=GUILD_ID, user_id=USER_C)).hater
         self.assertIsNone(result)
 
-    async def test_get_best_friend(self):
-        """get_best_friend returns (receiver_id, total) for the top recipient of a user's rep."""
+    async def test_summary_best_friend(self):
+        """The summary's best_friend is (receiver_id, total) for the top recipient of a user's rep."""
         await Rep.give(self.session, guild_id=GUILD_ID, giver_id=USER_A, receiver_id=USER_B, amount=10)
         await Rep.give(self.session, guild_id=GUILD_ID, giver_id=USER_A, receiver_id=USER_C, amount=3)
-        result = await Rep.get_best_friend(self.session, guild_id=GUILD_ID, user_id=USER_A)
+        result = (await Rep.get_relationship_summary(self.session, guild_id=GUILD_ID, user_id=USER_A)).best_friend
         self.assertIsNotNone(result)
         self.assertEqual(result[0], USER_B)
         self.assertEqual(result[1], 10)
 
-    async def test_get_best_friend_none(self):
-        """get_best_friend returns None when the user has given no rep."""
-        result = await Rep.get_best_friend(self.session, guild_id=GUILD_ID, user_id=USER_A)
+    async def test_summary_best_friend_none(self):
+        """The summary's best_friend is None when the user has given no rep."""
+        result = (await Rep.get_relationship_summary(self.session, guild_id=GUILD_ID, user_id=USER_A)).best_friend
         self.assertIsNone(result)
 
-    async def test_get_best_friend_none_when_net_negative(self):
-        """get_best_friend returns None when the top recipient has a net-negative total."""
+    async def test_summary_best_friend_none_when_net_negative(self):
+        """The summary's best_friend is None when the top recipient has a net-negative total."""
         await Rep.give(self.session, guild_id=GUILD_ID, giver_id=USER_A, receiver_id=USER_B, amount=1)
         await Rep.give(self.session, guild_id=GUILD_ID, giver_id=USER_A, receiver_id=USER_B, amount=-5)
-        result = await Rep.get_best_friend(self.session, guild_id=GUILD_ID, user_id=USER_A)
+        result = (await Rep.get_relationship_summary(self.session, guild_id=GUILD_ID, user_id=USER_A)).best_friend
         self.assertIsNone(result)
 
-    async def test_get_nemesis(self):
-        """get_nemesis returns (receiver_id, total) for the recipient with the most negative net rep."""
+    async def test_summary_nemesis(self):
+        """The summary's nemesis is (receiver_id, total) for the recipient with the most negative net rep."""
         await Rep.give(self.session, guild_id=GUILD_ID, giver_id=USER_A, receiver_id=USER_B, amount=-5)
         await Rep.give(self.session, guild_id=GUILD_ID, giver_id=USER_A, receiver_id=USER_C, amount=3)
-        result = await Rep.get_nemesis(self.session, guild_id=GUILD_ID, user_id=USER_A)
+        result = (await Rep.get_relationship_summary(self.session, guild_id=GUILD_ID, user_id=USER_A)).nemesis
         self.assertIsNotNone(result)
         self.assertEqual(result[0], USER_B)
         self.assertEqual(result[1], -5)
 
-    async def test_get_nemesis_none_when_all_positive(self):
-        """get_nemesis returns None when all recipients have net positive rep from this user."""
+    async def test_summary_nemesis_none_when_all_positive(self):
+        """The summary's nemesis is None when all recipients have net positive rep from this user."""
         await Rep.give(self.session, guild_id=GUILD_ID, giver_id=USER_A, receiver_id=USER_B, amount=5)
         await Rep.give(self.session, guild_id=GUILD_ID, giver_id=USER_A, receiver_id=USER_C, amount=3)
-        result = await Rep.get_nemesis(self.session, guild_id=GUILD_ID, user_id=USER_A)
+        result = (await Rep.get_relationship_summary(self.session, guild_id=GUILD_ID, user_id=USER_A)).nemesis
         self.assertIsNone(result)
 
+    async def test_get_relationship_summary(self):
+        """All of the summary comes from the one query, for this guild only."""
+        await Rep.give(self.session, guild_id=GUILD_ID, giver_id=USER_B, receiver_id=USER_A, amount=4)
+        await Rep.give(self.session, guild_id=GUILD_ID, giver_id=USER_C, receiver_id=USER_A, amount=-2)
+        await Rep.give(self.session, guild_id=GUILD_ID, giver_id=USER_A, receiver_id=USER_B, amount=7)
+        await Rep.give(self.session, guild_id=GUILD_ID, giver_id=USER_A, receiver_id=USER_C, amount=-1)
+        await Rep.give(self.session, guild_id=GUILD_ID, giver_id=USER_A, receiver_id=USER_C, amount=-3)
+        await Rep.give(self.session, guild_id=GUILD_ID + 1, giver_id=USER_A, receiver_id=USER_B, amount=100)
+        result = await Rep.get_relationship_summary(self.session, guild_id=GUILD_ID, user_id=USER_A)
+        self.assertEqual(
+            RepSummary(
+                received=2,
+                given=3,
+                biggest_fan=(USER_B, 4),
+                hater=(USER_C, -2),
+                best_friend=(USER_B, 7),
+                nemesis=(USER_C, -4),
+            ),
+            result,
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+
+import datetime
+import unittest
+
+from dicebot.data.db.resolution import REMINDER_PERIOD, Resolution
+from dicebot.test.utils import DatabaseTestCase
+
+NOW = datetime.datetime(2024, 1, 1, 12, 0)
+
+
+def _resolution(frequency: str, now: datetime.datetime = NOW) -> Resolution:
+    return Resolution.new(
+        guild_id=1, author_id=2, channel_id=3, msg="msg", frequency=frequency, now=now
+    )
+
+
+class TestResolutionRecurrence(unittest.TestCase):
+    def test_new(self) -> None:
+        r = _resolution("weekly")
+        self.assertEqual(NOW + datetime.timedelta(days=7), r.next_reminder_at)
+        self.assertEqual(NOW + REMINDER_PERIOD, r.remind_until)
+
+    def test_advance(self) -> None:
+        r = _resolution("daily")
+        due = r.next_reminder_at
+        assert due is not None
+        r.advance(due + datetime.timedelta(minutes=5))
+        self.assertEqual(due + datetime.timedelta(days=1), r.next_reminder_at)
+
+    def test_advance_skips_missed_reminders(self) -> None:
+        r = _resolution("daily")
+        r.advance(NOW + datetime.timedelta(days=10, hours=1))
+        self.assertEqual(NOW + datetime.timedelta(days=11), r.next_reminder_at)
+
+    def test_advance_past_the_end(self) -> None:
+        r = _resolution("yearly")
+        # The one yearly reminder lands exactly on the last day
+        self.assertEqual(r.remind_until, r.next_reminder_at)
+        r.advance(NOW + REMINDER_PERIOD)
+        self.assertIsNone(r.next_reminder_at)
+        # And there's nothing left to advance
+        r.advance(NOW + 2 * REMINDER_PERIOD)
+        self.assertIsNone(r.next_reminder_at)
+
+    def test_random(self) -> None:
+        r = _resolution("random")
+        assert r.next_reminder_at is not None
+        self.assertGreater(r.next_reminder_at, NOW)
+        self.assertLessEqual(r.next_reminder_at, NOW + REMINDER_PERIOD)
+
+
+class TestResolutionDb(DatabaseTestCase):
+    async def test_get_due(self):
+        due = _resolution("daily")
+        not_yet = _resolution("weekly")
+        deleted = _resolution("daily")
+        deleted.active = False
+        deleted.next_reminder_at = None
+        # Made before reminders lived on the row
+        legacy = Resolution(guild_id=1, author_id=2, channel_id=3, msg="msg")
+        legacy.frequency = "daily"
+        self.session.add_all([due, not_yet, deleted, legacy])
+        await self.session.commit()
+
+        now = NOW + datetime.timedelta(days=2)
+        self.assertEqual([due], list(await Resolution.get_due(self.session, now)))
+
+    async def test_claim_reminder(self):
+        self.session.add(_resolution("daily"))
+        await self.session.commit()
+
+        now = NOW + datetime.timedelta(days=1, minutes=5)
+        async with self.sessionmaker() as s1, self.sessionmaker() as s2:
+            (r1,) = await Resolution.get_due(s1, now)
+            (r2,) = await Resolution.get_due(s2, now)
+            self.assertTrue(await r1.claim_reminder(s1, now))
+            await s1.commit()
+            # r2 is stale now, so its reminder has already been taken
+            self.assertFalse(await r2.claim_reminder(s2, now))
+            self.assertEqual(NOW + datetime.timedelta(days=2), r1.next_reminder_at)
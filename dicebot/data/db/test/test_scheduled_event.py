@@ -3,50 +3,13 @@
 import datetime
 import unittest
 
-from sqlalchemy import BigInteger, Integer
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 
-from dicebot.data.db.base import Base
 from dicebot.data.db.scheduled_event import ScheduledEvent, ScheduledEventSignup
+from dicebot.test.utils import DatabaseTestCase
 
-# Import all models so their tables are registered in Base.metadata before create_all
-import dicebot.data.db.guild  # noqa: F401
-
-
-async def _create_tables(conn):
-    """Create all tables, replacing BigInteger with Integer for SQLite compatibility."""
-
-    def _create(connection):
-        for table in Base.metadata.sorted_tables:
-            # Replace BigInteger with Integer for SQLite (needed for PK autoincrement)
-            cols_to_fix = [
-                col for col in table.columns
-                if isinstance(col.type, BigInteger)
-            ]
-            original_types = {col.name: col.type for col in cols_to_fix}
-            for col in cols_to_fix:
-                col.type = Integer()
-            try:
-                table.create(connection, checkfirst=True)
-            finally:
-                for col in cols_to_fix:
-                    col.type = original_types[col.name]
-
-    await conn.run_sync(_create)
-
-
-class TestScheduledEvent(unittest.IsolatedAsyncioTestCase):
-    async def asyncSetUp(self):
-        self.engine = create_async_engine("sqlite+aiosqlite:///:memory:")
-        async with self.engine.begin() as conn:
-            await _create_tables(conn)
-        self.session = AsyncSession(self.engine, expire_on_commit=False)
-
-    async def asyncTearDown(self):
-        await self.session.close()
-        await self.engine.dispose()
 
+class TestScheduledEvent(DatabaseTestCase):
     async def test_get_by_id_not_found(self):
         """get_by_id returns None when no event exists."""
         result = await ScheduledEvent.get_by_id(self.session, event_id=999)
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+
+import random
+
+from dicebot.data.bench_thanks_scoreboard import cross_join_thanks_counts_query
+from dicebot.data.db.thanks import Thanks
+from dicebot.test.utils import DatabaseTestCase
+
+
+class TestThanks(DatabaseTestCase):
+    def _thank(self, thanker_id: int, thankee_id: int, guild_id: int = 1) -> None:
+        self.session.add(
+            Thanks(
+                guild_id=guild_id,
+                thanker_id=thanker_id,
+                thankee_id=thankee_id,
+                reason="test",
+            )
+        )
+
+    async def _counts(self, query):
+        res = await self.session.execute(query)
+        return {(row.user_id, row.sent, row.received) for row in res}
+
+    async def test_counts_query(self):
+        self._thank(1, 2)
+        self._thank(1, 2)
+        self._thank(2, 3)
+        # Another guild's thanks don't count
+        self._thank(3, 1, guild_id=2)
+        await self.session.commit()
+
+        counts = await self._counts(Thanks.counts_query(1))
+
+        self.assertEqual({(1, 2, 0), (2, 1, 2), (3, 0, 1)}, counts)
+
+    async def test_counts_query_matches_cross_join(self):
+        rng = random.Random(0)
+        for _ in range(200):
+            self._thank(*rng.sample(range(1, 12), 2), guild_id=rng.choice([1, 2]))
+        await self.session.commit()
+
+        self.assertEqual(
+            await self._counts(cross_join_thanks_counts_query(1)),
+            await self._counts(Thanks.counts_query(1)),
+        )
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+
+import datetime
+
+from sqlalchemy import delete
+
+from dicebot.data import rebuild_stats
+from dicebot.data.db.ban import Ban
+from dicebot.data.db.pun import Pun
+from dicebot.data.db.rep import Rep
+from dicebot.data.db.roll import Roll
+from dicebot.data.db.thanks import Thanks
+from dicebot.data.db.user_guild_stats import UserGuildStats
+from dicebot.test.utils import DatabaseTestCase
+
+
+class TestUserGuildStats(DatabaseTestCase):
+    async def _roll(self, user_id: int, actual: int, target: int, day: int) -> None:
+        roll = Roll(
+            guild_id=1,
+            discord_user_id=user_id,
+            actual_roll=actual,
+            target_roll=target,
+            rolled_at=datetime.datetime(2024, 1, day),
+        )
+        self.session.add(roll)
+        await UserGuildStats.record_roll(self.session, roll)
+        await self.session.commit()
+
+    async def _ban(self, bannee_id: int) -> None:
+        ban = Ban(
+            guild_id=1,
+            bannee_id=bannee_id,
+            banner_id=9,
+            reason="test",
+            banned_until=datetime.datetime(2024, 1, 1),
+        )
+        self.session.add(ban)
+        await UserGuildStats.record_ban(self.session, ban)
+        await self.session.commit()
+
+    async def _thank(self, thanker_id: int, thankee_id: int) -> None:
+        thanks = Thanks(
+            guild_id=1, thanker_id=thanker_id, thankee_id=thankee_id, reason="test"
+        )
+        self.session.add(thanks)
+        await UserGuildStats.record_thanks(self.session, thanks)
+        await self.session.commit()
+
+    async def _write_some_of_everything(self) -> None:
+        await self._roll(1, actual=6, target=6, day=1)
+        await self._roll(1, actual=1, target=5, day=3)
+        await self._roll(1, actual=4, target=5, day=2)
+        await self._roll(2, actual=3, target=4, day=1)
+        await self._ban(2)
+        await self._ban(2)
+        await self._thank(1, 2)
+        await self._thank(3, 2)
+        await Rep.give(self.session, 1, giver_id=1, receiver_id=2, amount=3)
+        await Rep.give(self.session, 1, giver_id=2, receiver_id=1, amount=-1)
+        await Pun.add_or_get(self.session, 1, "Why?", "Because", first_poster_id=3)
+        # Already caught, so this doesn't count again
+        await Pun.add_or_get(self.session, 1, "Why?", "Because", first_poster_id=1)
+
+    async def test_get_missing(self):
+        self.assertIsNone(await UserGuildStats.get(self.session, 1, 1))
+
+    async def test_add_creates_then_adds(self):
+        await UserGuildStats.add(self.session, 1, 1, thanks_given=1)
+        await UserGuildStats.add(self.session, 1, 1, thanks_given=2, rep_given=-4)
+        await self.session.commit()
+
+        stats = await UserGuildStats.get(self.session, 1, 1)
+        self.assertEqual(3, stats.thanks_given)
+        self.assertEqual(-4, stats.rep_given)
+        self.assertEqual(0, stats.rolls)
+        self.assertIsNone(stats.last_rolled_at)
+
+    async def test_get_sees_later_adds(self):
+        await UserGuildStats.add(self.session, 1, 1, times_banned=1)
+        self.assertEqual(1, (await UserGuildStats.get(self.session, 1, 1)).times_banned)
+
+        await UserGuildStats.add(self.session, 1, 1, times_banned=1)
+        self.assertEqual(2, (await UserGuildStats.get(self.session, 1, 1)).times_banned)
+
+    async def test_record_roll(self):
+        await self._roll(1, actual=6, target=6, day=1)
+        await self._roll(1, actual=4, target=5, day=3)
+        await self._roll(1, actual=1, target=5, day=2)
+
+        stats = await UserGuildStats.get(self.session, 1, 1)
+        self.assertEqual(3, stats.rolls)
+        self.assertEqual(1, stats.roll_wins)
+        self.assertEqual(1, stats.roll_losses)
+        self.assertEqual(1, stats.roll_ones)
+        self.assertEqual(6, stats.best_roll)
+        self.assertEqual(datetime.datetime(2024, 1, 3), stats.last_rolled_at)
+
+    async def test_writes_match_rebuild(self):
+        await self._write_some_of_everything()
+
+        self.assertEqual([], await rebuild_stats.check_stats(self.session, 1))
+
+        stats = await UserGuildStats.get(self.session, 1, 2)
+        self.assertEqual(
+            (1, 2, 2, 3, -1),
+            (
+                stats.rolls,
+                stats.times_banned,
+                stats.thanks_received,
+                stats.rep_received,
+                stats.rep_given,
+            ),
+        )
+        self.assertEqual(1, (await UserGuildStats.get(self.session, 1, 3)).puns_caught)
+
+    async def test_check_finds_drift(self):
+        await self._write_some_of_everything()
+        await UserGuildStats.add(self.session, 1, 2, times_banned=1)
+        await UserGuildStats.add(self.session, 1, 4, thanks_given=1)
+
+        mismatches = await rebuild_stats.check_stats(self.session, 1)
+
+        self.assertEqual(
+            [
+                rebuild_stats.Mismatch(1, 2, "times_banned", 2, 3),
+                rebuild_stats.Mismatch(1, 4, "thanks_given", 0, 1),
+            ],
+            mismatches,
+        )
+
+    async def test_rebuild(self):
+        await self._write_some_of_everything()
+        expected = await rebuild_stats.compute_stats(self.session, 1)
+        await UserGuildStats.add(self.session, 2, 1, rolls=1)
+        await self.session.execute(delete(UserGuildStats).filter_by(guild_id=1))
+        await UserGuildStats.add(self.session, 1, 4, thanks_given=1)
+        await self.session.commit()
+        self.assertNotEqual([], await rebuild_stats.check_stats(self.session, 1))
+
+        users = await rebuild_stats.rebuild_stats(self.session, 1)
+
+        self.assertEqual(3, users)
+        self.assertEqual([], await rebuild_stats.check_stats(self.session, 1))
+        self.assertEqual(expected, await rebuild_stats.compute_stats(self.session, 1))
+        self.assertIsNone(await UserGuildStats.get(self.session, 1, 4))
+        # Other guilds are left alone
+        self.assertEqual(1, (await UserGuildStats.get(self.session, 2, 1)).rolls)
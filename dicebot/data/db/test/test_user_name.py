@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+
+import asyncio
+import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import discord
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from dicebot.data.db import user_name
+from dicebot.data.db.user_name import UserName
+from dicebot.test.utils import DatabaseTestCase
+
+
+def _named(name: str) -> MagicMock:
+    user = MagicMock()
+    user.display_name = name
+    return user
+
+
+class TestUserName(DatabaseTestCase):
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+
+        self.discord_guild = MagicMock()
+        self.discord_guild.get_member.return_value = None
+        self.client = MagicMock()
+        self.client.get_guild.return_value = self.discord_guild
+        self.client.get_user.return_value = None
+        self.client.fetch_user = AsyncMock()
+
+    async def test_resolve_prefers_member_cache(self):
+        self.discord_guild.get_member.side_effect = lambda i: _named(f"member{i}")
+        self.session.add(UserName(user_id=1, name="stale"))
+        await self.session.commit()
+
+        res = await UserName.resolve(self.session, self.client, 10, [1, 2])
+
+        self.assertEqual({1: "member1", 2: "member2"}, res)
+        self.client.fetch_user.assert_not_awaited()
+
+    async def test_resolve_uses_table_before_fetching(self):
+        self.session.add(UserName(user_id=1, name="saved"))
+        await self.session.commit()
+        self.client.fetch_user.return_value = _named("fetched")
+
+        res = await UserName.resolve(self.session, self.client, 10, [1, 2])
+
+        self.assertEqual({1: "saved", 2: "fetched"}, res)
+        self.client.fetch_user.assert_awaited_once_with(2)
+
+    async def test_resolve_refetches_old_names(self):
+        old = datetime.datetime.now() - user_name.NAME_MAX_AGE * 2
+        self.session.add(UserName(user_id=1, name="old", fetched_at=old))
+        await self.session.commit()
+        self.client.fetch_user.return_value = _named("new")
+
+        res = await UserName.resolve(self.session, self.client, 10, [1])
+
+        self.assertEqual({1: "new"}, res)
+        self.assertEqual({1: "new"}, await UserName.get_many(self.session, [1]))
+
+    async def test_resolve_saves_fetched_names(self):
+        self.client.fetch_user.side_effect = lambda i: _named(f"user{i}")
+
+        await UserName.resolve(self.session, self.client, 10, [1, 2, 2])
+
+        self.assertEqual(2, self.client.fetch_user.await_count)
+        saved = await UserName.get_many(self.session, [1, 2])
+        self.assertEqual({1: "user1", 2: "user2"}, saved)
+
+    async def test_resolve_does_not_commit_callers_session(self):
+        self.client.fetch_user.side_effect = lambda i: _named(f"user{i}")
+
+        with patch.object(self.session, "commit") as mock_commit:
+            await UserName.resolve(self.session, self.client, 10, [1])
+        mock_commit.assert_not_called()
+
+        async with self.sessionmaker() as session:
+            self.assertEqual({1: "user1"}, await UserName.get_many(session, [1]))
+
+    async def test_resolve_falls_back_when_fetch_fails(self):
+        self.client.fetch_user.side_effect = discord.NotFound(MagicMock(), "gone")
+
+        res = await UserName.resolve(self.session, self.client, 10, [1])
+
+        self.assertEqual({1: "Unknown user 1"}, res)
+        self.assertEqual({}, await UserName.get_many(self.session, [1]))
+
+        res = await UserName.resolve(
+            self.session, self.client, 10, [1], unknown_format="<@{}>"
+        )
+        self.assertEqual({1: "<@1>"}, res)
+
+    async def test_put_many_upserts(self):
+        await UserName.put_many(self.session, {1: "one", 2: "two"})
+        await self.session.commit()
+        # Another session saved user 2 first
+        async with AsyncSession(self.engine) as other:
+            await UserName.put_many(other, {2: "deux", 3: "three"})
+            await other.commit()
+
+        await UserName.put_many(self.session, {2: "two again"})
+        await self.session.commit()
+        saved = await UserName.get_many(self.session, [1, 2, 3])
+        self.assertEqual({1: "one", 2: "two again", 3: "three"}, saved)
+
+    @patch("dicebot.data.db.user_name.MAX_CONCURRENT_FETCHES", 2)
+    async def test_resolve_bounds_concurrent_fetches(self):
+        in_flight = 0
+        most_in_flight = 0
+
+        async def fetch_user(user_id):
+            nonlocal in_flight, most_in_flight
+            in_flight += 1
+            most_in_flight = max(most_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return _named(f"user{user_id}")
+
+        self.client.fetch_user.side_effect = fetch_user
+
+        res = await UserName.resolve(self.session, self.client, 10, range(6))
+
+        self.assertEqual(6, len(res))
+        self.assertEqual(2, most_in_flight)
@@ -5,7 +5,7 @@ from __future__ import annotations
 import datetime
 from typing import Annotated
 
-from sqlalchemy import BigInteger, ForeignKey, func
+from sqlalchemy import BigInteger, ForeignKey, func, select, sql, text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from dicebot.data.db.base import Base
@@ -29,3 +29,35 @@ class Thanks(Base):
     thankee_id: Mapped[bigint_ix] = mapped_column(ForeignKey("discord_user.id"))
     reason: Mapped[str]
     created_at: Mapped[timestamp_now]
+
+    # Methods
+    @classmethod
+    def counts_query(cls, guild_id: int) -> sql.Select:
+        """Thanks sent and received per user, one row per anyone who's sent or
+        received any. Each thanks row counts once for each side, so this is
+        a single pass over the guild's thanks."""
+        signed_q = (
+            select(
+                cls.thanker_id.label("user_id"),
+                sql.literal(1).label("sent"),
+                sql.literal(0).label("received"),
+            )
+            .filter_by(guild_id=guild_id)
+            .union_all(
+                select(
+                    cls.thankee_id.label("user_id"),
+                    sql.literal(0).label("sent"),
+                    sql.literal(1).label("received"),
+                ).filter_by(guild_id=guild_id)
+            )
+        ).subquery()
+
+        return (
+            select(
+                signed_q.c.user_id,
+                func.sum(signed_q.c.sent).label("sent"),
+                func.sum(signed_q.c.received).label("received"),
+            )
+            .group_by(signed_q.c.user_id)
+            .order_by(text("received"), text("sent"))
+        )
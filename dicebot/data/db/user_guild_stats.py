@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+import datetime
+from typing import TYPE_CHECKING, Annotated, Any, Callable, Optional, Union
+
+from sqlalchemy import BigInteger, ColumnElement, func
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Mapped, mapped_column
+
+from dicebot.data.db.base import Base
+
+if TYPE_CHECKING:
+    from dicebot.data.db.ban import Ban
+    from dicebot.data.db.pun import Pun
+    from dicebot.data.db.rep import Rep
+    from dicebot.data.db.roll import Roll
+    from dicebot.data.db.thanks import Thanks
+
+# Special types to make the ORM models prettier
+bigint_pk_natural = Annotated[
+    int, mapped_column(BigInteger, primary_key=True, autoincrement=False)
+]
+counter = Annotated[int, mapped_column(BigInteger, default=0)]
+
+
+class UserGuildStats(Base):
+    """Running totals of everything !stats and the scoreboards show, one row
+    per user per guild. Kept up to date by whatever inserts the underlying
+    rows (in the same transaction), so reading them is a primary key lookup
+    instead of an aggregate over the whole guild's history.
+
+    dicebot.data.rebuild_stats recomputes these from scratch and can check
+    them against the source tables."""
+
+    __tablename__ = "user_guild_stats"
+
+    # Columns
+    guild_id: Mapped[bigint_pk_natural]
+    user_id: Mapped[bigint_pk_natural]
+    rolls: Mapped[counter]
+    roll_wins: Mapped[counter]
+    # Rolled one under the target. The roll scoreboard calls these losses.
+    roll_losses: Mapped[counter]
+    roll_ones: Mapped[counter]
+    best_roll: Mapped[counter]
+    last_rolled_at: Mapped[Optional[datetime.datetime]]
+    times_banned: Mapped[counter]
+    thanks_given: Mapped[counter]
+    thanks_received: Mapped[counter]
+    puns_caught: Mapped[counter]
+    rep_given: Mapped[counter]
+    rep_received: Mapped[counter]
+
+    # Methods
+    @classmethod
+    async def get(
+        cls, session: AsyncSession, guild_id: int, user_id: int
+    ) -> Optional[UserGuildStats]:
+        # add() goes around the ORM, so a copy the session already has could
+        # be out of date
+        return await session.get(cls, (guild_id, user_id), populate_existing=True)
+
+    @classmethod
+    async def add(
+        cls, session: AsyncSession, guild_id: int, user_id: int, **deltas: Any
+    ) -> None:
+        """Add deltas to a user's counters, creating their row if needed.
+        best_roll and last_rolled_at keep whichever is bigger instead."""
+        stmt: Union[sqlite.Insert, postgresql.Insert]
+        greatest: Callable[..., ColumnElement[Any]]
+        if session.get_bind().dialect.name == "sqlite":
+            stmt = sqlite.insert(cls)
+            greatest = func.max
+        else:
+            stmt = postgresql.insert(cls)
+            greatest = func.greatest
+
+        table = cls.__table__.c
+        excluded = stmt.excluded
+        updates = {
+            col.name: table[col.name] + excluded[col.name]
+            for col in cls.__table__.columns
+            if not col.primary_key and isinstance(col.type, BigInteger)
+        }
+        updates["best_roll"] = greatest(table.best_roll, excluded.best_roll)
+        # SQLite's max() is NULL if either side is
+        updates["last_rolled_at"] = greatest(
+            func.coalesce(table.last_rolled_at, excluded.last_rolled_at),
+            func.coalesce(excluded.last_rolled_at, table.last_rolled_at),
+        )
+
+        await session.execute(
+            stmt.values(
+                guild_id=guild_id, user_id=user_id, **deltas
+            ).on_conflict_do_update(
+                index_elements=["guild_id", "user_id"], set_=updates
+            )
+        )
+
+    @classmethod
+    async def record_roll(cls, session: AsyncSession, roll: Roll) -> None:
+        await cls.add(
+            session,
+            roll.guild_id,
+            roll.discord_user_id,
+            rolls=1,
+            roll_wins=int(roll.actual_roll == roll.target_roll),
+            roll_losses=int(roll.actual_roll == roll.target_roll - 1),
+            roll_ones=int(roll.actual_roll == 1),
+            best_roll=roll.actual_roll,
+            # The same clock the roll's rolled_at default comes from
+            last_rolled_at=(
+                roll.rolled_at
+                if roll.rolled_at is not None
+                else func.current_timestamp()
+            ),
+        )
+
+    @classmethod
+    async def record_ban(cls, session: AsyncSession, ban: Ban) -> None:
+        await cls.add(session, ban.guild_id, ban.bannee_id, times_banned=1)
+
+    @classmethod
+    async def record_thanks(cls, session: AsyncSession, thanks: Thanks) -> None:
+        await cls.add(session, thanks.guild_id, thanks.thanker_id, thanks_given=1)
+        await cls.add(session, thanks.guild_id, thanks.thankee_id, thanks_received=1)
+
+    @classmethod
+    async def record_rep(cls, session: AsyncSession, rep: Rep) -> None:
+        await cls.add(session, rep.guild_id, rep.giver_id, rep_given=rep.amount)
+        await cls.add(session, rep.guild_id, rep.receiver_id, rep_received=rep.amount)
+
+    @classmethod
+    async def record_pun(cls, session: AsyncSession, pun: Pun) -> None:
+        await cls.add(session, pun.guild_id, pun.first_poster_id, puns_caught=1)
+
+    def __repr__(self) -> str:
+        return (
+            f"UserGuildStats({self.guild_id=}, {self.user_id=}, {self.rolls=}, "
+            f"{self.times_banned=}, {self.thanks_given=}, {self.thanks_received=}, "
+            f"{self.puns_caught=}, {self.rep_given=}, {self.rep_received=})"
+        )
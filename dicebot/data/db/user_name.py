@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+import asyncio
+import datetime
+import logging
+from typing import Annotated, Dict, Iterable, Mapping, Optional, Union
+
+import discord
+from sqlalchemy import BigInteger, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Mapped, mapped_column
+
+from dicebot.data.db.base import Base
+
+# Special types to make the ORM models prettier
+bigint_pk_natural = Annotated[
+    int, mapped_column(BigInteger, primary_key=True, autoincrement=False)
+]
+
+# People rename themselves now and then, so names get looked up again after this
+NAME_MAX_AGE = datetime.timedelta(days=7)
+# How many users to fetch from Discord at once when names aren't known
+MAX_CONCURRENT_FETCHES = 5
+
+
+class UserName(Base):
+    """The last display name we fetched from Discord for each user, so the
+    scoreboards don't have to ask Discord about everyone who ever rolled"""
+
+    __tablename__ = "user_name"
+
+    # Columns
+    user_id: Mapped[bigint_pk_natural]
+    name: Mapped[str]
+    fetched_at: Mapped[datetime.datetime] = mapped_column(default=datetime.datetime.now)
+
+    # Methods
+    @classmethod
+    async def get_many(
+        cls, session: AsyncSession, user_ids: Iterable[int]
+    ) -> Dict[int, str]:
+        """Names that were fetched recently enough to still trust"""
+        oldest = datetime.datetime.now() - NAME_MAX_AGE
+        # put_many() goes around the ORM, so copies the session already has
+        # could be out of date
+        res = await session.scalars(
+            select(cls)
+            .filter(cls.user_id.in_(user_ids), cls.fetched_at >= oldest)
+            .execution_options(populate_existing=True)
+        )
+        return {row.user_id: row.name for row in res}
+
+    @classmethod
+    async def put_many(cls, session: AsyncSession, names: Mapping[int, str]) -> None:
+        if len(names) == 0:
+            return
+        stmt: Union[sqlite.Insert, postgresql.Insert]
+        if session.get_bind().dialect.name == "sqlite":
+            stmt = sqlite.insert(cls)
+        else:
+            stmt = postgresql.insert(cls)
+
+        # An upsert, since two commands resolving the same new user at once
+        # would both try to insert them. Sorted so concurrent upserts lock
+        # rows in the same order.
+        now = datetime.datetime.now()
+        await session.execute(
+            stmt.values(
+                [
+                    {"user_id": user_id, "name": name, "fetched_at": now}
+                    for user_id, name in sorted(names.items())
+                ]
+            ).on_conflict_do_update(
+                index_elements=["user_id"],
+                set_={"name": stmt.excluded.name, "fetched_at": now},
+            )
+        )
+
+    @classmethod
+    async def resolve(
+        cls,
+        session: AsyncSession,
+        client: discord.Client,
+        guild_id: int,
+        user_ids: Iterable[int],
+        unknown_format: str = "Unknown user {}",
+    ) -> Dict[int, str]:
+        """Display names for a batch of users. Looks in the guild's member
+        cache and the client's user cache, then this table, and only asks
+        Discord about whoever's left, a few at a time. Anyone still unnamed
+        gets unknown_format filled in with their ID."""
+        user_ids = list(dict.fromkeys(user_ids))
+        res: Dict[int, str] = {}
+
+        discord_guild = client.get_guild(guild_id)
+        for user_id in user_ids:
+            member = discord_guild.get_member(user_id) if discord_guild else None
+            user = member or client.get_user(user_id)
+            if user is not None:
+                res[user_id] = user.display_name
+
+        missing = [user_id for user_id in user_ids if user_id not in res]
+        if missing:
+            res.update(await cls.get_many(session, missing))
+
+        missing = [user_id for user_id in user_ids if user_id not in res]
+        if missing:
+            semaphore = asyncio.Semaphore(MAX_CONCURRENT_FETCHES)
+
+            async def fetch(user_id: int) -> Optional[str]:
+                async with semaphore:
+                    try:
+                        return (await client.fetch_user(user_id)).display_name
+                    except discord.DiscordException as e:
+                        logging.warning(f"Failed to fetch user {user_id}: {e!r}")
+                        return None
+
+            names = await asyncio.gather(*(fetch(user_id) for user_id in missing))
+            fetched = {
+                user_id: name
+                for user_id, name in zip(missing, names)
+                if name is not None
+            }
+            # Saved on the side, since the caller's session is in the middle
+            # of a command that may not want anything committed yet
+            async with AsyncSession(session.bind) as names_session:
+                await cls.put_many(names_session, fetched)
+                await names_session.commit()
+            res.update(fetched)
+
+        # Whoever Discord couldn't tell us about (deleted accounts and such)
+        for user_id in user_ids:
+            res.setdefault(user_id, unknown_format.format(user_id))
+        return res
+
+    def __repr__(self) -> str:
+        return f"UserName({self.user_id=}, {self.name=}, {self.fetched_at=})"
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+import datetime
+from typing import Annotated, Union
+
+from sqlalchemy import Text, func
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Mapped, mapped_column
+
+from dicebot.data.db.base import Base
+
+# Special types to make the ORM models prettier
+text_pk = Annotated[str, mapped_column(Text, primary_key=True)]
+timestamp_now = Annotated[
+    datetime.datetime,
+    mapped_column(nullable=False, server_default=func.CURRENT_TIMESTAMP()),
+]
+
+
+class YoutubeVideo(Base):
+    """Video lengths we've already looked up, so a link that gets posted over
+    and over only has to be resolved once"""
+
+    __tablename__ = "youtube_video"
+
+    # Columns
+    video_id: Mapped[text_pk]
+    length_secs: Mapped[int]
+    fetched_at: Mapped[timestamp_now]
+
+    # Methods
+    @classmethod
+    async def get_length(cls, session: AsyncSession, video_id: str) -> int | None:
+        res = await session.get(cls, video_id)
+        return res.length_secs if res is not None else None
+
+    @classmethod
+    async def set_length(
+        cls, session: AsyncSession, video_id: str, length_secs: int
+    ) -> None:
+        stmt: Union[sqlite.Insert, postgresql.Insert]
+        if session.get_bind().dialect.name == "sqlite":
+            stmt = sqlite.insert(cls)
+        else:
+            stmt = postgresql.insert(cls)
+
+        # Someone else may have posted the same link at the same time; either
+        # answer is fine. Committing is up to the caller.
+        await session.execute(
+            stmt.values(
+                video_id=video_id, length_secs=length_secs
+            ).on_conflict_do_nothing(index_elements=["video_id"])
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"YoutubeVideo({self.video_id=}, {self.length_secs=}, {self.fetched_at=})"
+        )
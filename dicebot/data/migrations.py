@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+
+from typing import Any, Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+
+def create_index_concurrently(
+    index_name: str, table_name: str, columns: Sequence[str], **kwargs: Any
+) -> None:
+    """op.create_index, but on Postgres the index is built with CREATE INDEX
+    CONCURRENTLY so the table keeps taking writes while it builds.
+
+    CONCURRENTLY can't run inside a transaction, so this commits whatever the
+    migration has done so far. If an earlier attempt failed partway it will
+    have left an invalid index behind, which gets dropped and rebuilt."""
+    context = op.get_context()
+    if context.dialect.name != "postgresql":
+        op.create_index(index_name, table_name, columns, **kwargs)
+        return
+
+    with context.autocommit_block():
+        if not context.as_sql and _is_invalid(index_name):
+            op.drop_index(
+                index_name, table_name=table_name, postgresql_concurrently=True
+            )
+        op.create_index(
+            index_name,
+            table_name,
+            columns,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+            **kwargs,
+        )
+
+
+def drop_index_concurrently(index_name: str, table_name: str) -> None:
+    context = op.get_context()
+    if context.dialect.name != "postgresql":
+        op.drop_index(index_name, table_name=table_name)
+        return
+
+    with context.autocommit_block():
+        op.drop_index(
+            index_name,
+            table_name=table_name,
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def _is_invalid(index_name: str) -> bool:
+    res = op.get_bind().execute(
+        sa.text(
+            "SELECT NOT i.indisvalid FROM pg_index i "
+            "JOIN pg_class c ON c.oid = i.indexrelid "
+            "WHERE c.relname = :name"
+        ),
+        {"name": index_name},
+    )
+    return bool(res.scalar())
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+
+import asyncio
+from typing import Any, Awaitable, Callable, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+# Per command, so one !stats can't take every connection in the pool
+MAX_CONCURRENT_READS = 4
+
+Query = Callable[[AsyncSession], Awaitable[Any]]
+
+
+class ParallelReads:
+    """Runs independent read-only queries at the same time, each on its own
+    short-lived session, so a command that needs several of them waits about
+    as long as the slowest one instead of all of them in turn.
+
+    The extra sessions only see what's been committed and are thrown away
+    afterwards, so anything returned should be plain values or fully loaded
+    rows. Without a sessionmaker the queries run one after another on the
+    given session instead."""
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        sessionmaker: Optional[async_sessionmaker[AsyncSession]],
+        max_concurrency: int = MAX_CONCURRENT_READS,
+    ) -> None:
+        self.session = session
+        self.sessionmaker = sessionmaker
+        self.max_concurrency = max_concurrency
+
+    async def gather(self, *queries: Query) -> List[Any]:
+        """Each query's result, in the same order as the queries"""
+        if self.sessionmaker is None or len(queries) <= 1:
+            return [await query(self.session) for query in queries]
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def run(query: Query) -> Any:
+            assert self.sessionmaker is not None
+            async with semaphore, self.sessionmaker() as session:
+                return await query(session)
+
+        return list(await asyncio.gather(*(run(query) for query in queries)))
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+
+"""Recompute user_guild_stats from the tables it summarizes.
+
+The running totals are updated as rows get written, so they only need
+rebuilding after the table is first created or if something wrote rolls,
+bans, thanks, rep, or puns without going through UserGuildStats. To check
+every guild without changing anything (exits non-zero if anything's off):
+
+    python -m dicebot.data.rebuild_stats --check
+
+and to rebuild every guild, or just some of them:
+
+    python -m dicebot.data.rebuild_stats [GUILD_ID ...]
+
+A rebuild replaces the guild's rows in one transaction, but anything written
+to the guild while it runs can be counted twice or not at all, so check again
+afterwards if the guild is busy."""
+
+import argparse
+import asyncio
+import logging
+from typing import Any, Dict, Iterable, List, NamedTuple
+
+from sqlalchemy import case, delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from dicebot.data.db.ban import Ban
+from dicebot.data.db.guild import Guild
+from dicebot.data.db.pun import Pun
+from dicebot.data.db.rep import Rep
+from dicebot.data.db.roll import Roll
+from dicebot.data.db.thanks import Thanks
+from dicebot.data.db.user_guild_stats import UserGuildStats
+
+STAT_FIELDS = [
+    col.name for col in UserGuildStats.__table__.columns if not col.primary_key
+]
+
+
+class Mismatch(NamedTuple):
+    guild_id: int
+    user_id: int
+    field: str
+    expected: Any
+    actual: Any
+
+
+def _empty_stats() -> Dict[str, Any]:
+    res: Dict[str, Any] = {field: 0 for field in STAT_FIELDS}
+    res["last_rolled_at"] = None
+    return res
+
+
+async def compute_stats(
+    session: AsyncSession, guild_id: int
+) -> Dict[int, Dict[str, Any]]:
+    """What every user's stats in the guild should be, straight from the
+    source tables. Users with nothing to count are left out."""
+    res: Dict[int, Dict[str, Any]] = {}
+
+    def add(rows: Iterable[Any], **fields: str) -> None:
+        for row in rows:
+            stats = res.setdefault(row.user_id, _empty_stats())
+            for field, column in fields.items():
+                stats[field] = getattr(row, column)
+
+    rolls = await session.execute(
+        select(
+            Roll.discord_user_id.label("user_id"),
+            func.count().label("rolls"),
+            func.sum(case((Roll.actual_roll == Roll.target_roll, 1), else_=0)).label(
+                "wins"
+            ),
+            func.sum(
+                case((Roll.actual_roll == Roll.target_roll - 1, 1), else_=0)
+            ).label("losses"),
+            func.sum(case((Roll.actual_roll == 1, 1), else_=0)).label("ones"),
+            func.max(Roll.actual_roll).label("best"),
+            func.max(Roll.rolled_at).label("last_rolled_at"),
+        )
+        .filter_by(guild_id=guild_id)
+        .group_by(Roll.discord_user_id)
+    )
+    add(
+        rolls,
+        rolls="rolls",
+        roll_wins="wins",
+        roll_losses="losses",
+        roll_ones="ones",
+        best_roll="best",
+        last_rolled_at="last_rolled_at",
+    )
+
+    bans = await session.execute(
+        select(Ban.bannee_id.label("user_id"), func.count().label("bans"))
+        .filter_by(guild_id=guild_id)
+        .group_by(Ban.bannee_id)
+    )
+    add(bans, times_banned="bans")
+
+    thanks = await session.execute(Thanks.counts_query(guild_id))
+    add(thanks, thanks_given="sent", thanks_received="received")
+
+    puns = await session.execute(
+        select(Pun.first_poster_id.label("user_id"), func.count().label("puns"))
+        .filter_by(guild_id=guild_id)
+        .group_by(Pun.first_poster_id)
+    )
+    add(puns, puns_caught="puns")
+
+    rep_given = await session.execute(
+        select(Rep.giver_id.label("user_id"), func.sum(Rep.amount).label("total"))
+        .filter_by(guild_id=guild_id)
+        .group_by(Rep.giver_id)
+    )
+    add(rep_given, rep_given="total")
+
+    rep_received = await session.execute(
+        select(Rep.receiver_id.label("user_id"), func.sum(Rep.amount).label("total"))
+        .filter_by(guild_id=guild_id)
+        .group_by(Rep.receiver_id)
+    )
+    add(rep_received, rep_received="total")
+
+    return res
+
+
+async def check_stats(session: AsyncSession, guild_id: int) -> List[Mismatch]:
+    expected = await compute_stats(session, guild_id)
+    rows = await session.scalars(select(UserGuildStats).filter_by(guild_id=guild_id))
+    actual = {
+        row.user_id: {field: getattr(row, field) for field in STAT_FIELDS}
+        for row in rows
+    }
+
+    res = []
+    for user_id in sorted(expected.keys() | actual.keys()):
+        want = expected.get(user_id, _empty_stats())
+        got = actual.get(user_id, _empty_stats())
+        for field in STAT_FIELDS:
+            if want[field] != got[field]:
+                res.append(Mismatch(guild_id, user_id, field, want[field], got[field]))
+    return res
+
+
+async def rebuild_stats(session: AsyncSession, guild_id: int) -> int:
+    """Replace the guild's rows with freshly computed ones. Returns how many
+    users the guild has stats for."""
+    stats = await compute_stats(session, guild_id)
+    await session.execute(
+        delete(UserGuildStats).where(UserGuildStats.guild_id == guild_id)
+    )
+    if stats:
+        await session.execute(
+            insert(UserGuildStats),
+            [
+                {"guild_id": guild_id, "user_id": user_id, **user_stats}
+                for user_id, user_stats in stats.items()
+            ],
+        )
+    await session.commit()
+    return len(stats)
+
+
+async def main(opts: argparse.Namespace) -> int:
+    from dicebot.app import app_sessionmaker
+
+    async with app_sessionmaker() as session:
+        guild_ids = opts.guild_ids or (await session.scalars(select(Guild.id))).all()
+
+    mismatches = 0
+    for guild_id in guild_ids:
+        async with app_sessionmaker() as session:
+            if opts.check:
+                found = await check_stats(session, guild_id)
+                for mismatch in found:
+                    logging.warning(f"Stats mismatch: {mismatch}")
+                mismatches += len(found)
+                print(f"Guild {guild_id}: {len(found)} mismatched stats")
+            else:
+                users = await rebuild_stats(session, guild_id)
+                print(f"Guild {guild_id}: rebuilt stats for {users} users")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild or check user_guild_stats")
+    parser.add_argument(
+        "--check", action="store_true", help="only report stats that are wrong"
+    )
+    parser.add_argument("guild_ids", nargs="*", type=int)
+    raise SystemExit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+
+import unittest
+
+from sqlalchemy import select
+
+from dicebot.core.pun_index import pun_index
+from dicebot.data.backfill_pun_signatures import backfill_signatures
+from dicebot.data.db.pun import Pun
+from dicebot.data.types.minhash import MinHash
+from dicebot.test.utils import DatabaseTestCase
+
+
+class TestBackfillPunSignatures(DatabaseTestCase):
+    async def asyncTearDown(self):
+        pun_index.clear()
+        await super().asyncTearDown()
+
+    async def test_backfill(self):
+        async with self.sessionmaker() as session:
+            for i in range(5):
+                session.add(
+                    Pun(
+                        guild_id=1,
+                        setup=f"Setup {i}",
+                        punchline=f"Punchline {i}",
+                        first_poster_id=2,
+                    )
+                )
+            await session.commit()
+            await Pun.add_or_get(session, 1, "Knock knock", "Cow", 2)
+
+        async with self.sessionmaker() as session:
+            self.assertEqual(5, await backfill_signatures(session, batch_size=2))
+        async with self.sessionmaker() as session:
+            puns = (await session.scalars(select(Pun))).all()
+            self.assertEqual(6, len(puns))
+            for pun in puns:
+                self.assertEqual(MinHash.of(pun.setup).to_bytes(), pun.setup_signature)
+                self.assertEqual(
+                    MinHash.of(pun.punchline).to_bytes(), pun.punchline_signature
+                )
+            # Nothing left to do the second time
+            self.assertEqual(0, await backfill_signatures(session))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+
+import asyncio
+import contextlib
+import unittest
+from unittest.mock import MagicMock
+
+from dicebot.data.parallel_reads import ParallelReads
+
+
+class TestParallelReads(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.session = MagicMock(name="session")
+        self.opened = []
+        self.closed = []
+
+    @contextlib.asynccontextmanager
+    async def sessionmaker(self):
+        session = MagicMock(name=f"session{len(self.opened)}")
+        self.opened.append(session)
+        yield session
+        self.closed.append(session)
+
+    async def test_gather_without_sessionmaker(self) -> None:
+        order = []
+
+        async def query(session, i):
+            order.append(i)
+            self.assertIs(self.session, session)
+            return i * 10
+
+        reads = ParallelReads(self.session, None)
+        res = await reads.gather(lambda s: query(s, 1), lambda s: query(s, 2))
+
+        self.assertEqual([10, 20], res)
+        self.assertEqual([1, 2], order)
+
+    async def test_gather_single_query_uses_session(self) -> None:
+        reads = ParallelReads(self.session, self.sessionmaker)
+        res = await reads.gather(lambda s: asyncio.sleep(0, result=s))
+
+        self.assertEqual([self.session], res)
+        self.assertEqual([], self.opened)
+
+    async def test_gather_uses_a_session_each(self) -> None:
+        async def query(session, delay):
+            await asyncio.sleep(delay)
+            return session
+
+        reads = ParallelReads(self.session, self.sessionmaker)
+        res = await reads.gather(
+            lambda s: query(s, 0.02), lambda s: query(s, 0), lambda s: query(s, 0.01)
+        )
+
+        # Results come back in query order, not the order they finish in
+        self.assertEqual(self.opened, res)
+        self.assertEqual(3, len(set(map(id, res))))
+        self.assertNotIn(self.session, res)
+        self.assertCountEqual(self.opened, self.closed)
+
+    async def test_gather_concurrency_cap(self) -> None:
+        in_flight = 0
+        most_in_flight = 0
+
+        async def query(session):
+            nonlocal in_flight, most_in_flight
+            in_flight += 1
+            most_in_flight = max(most_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+        reads = ParallelReads(self.session, self.sessionmaker, max_concurrency=2)
+        await reads.gather(*[query] * 5)
+
+        self.assertEqual(2, most_in_flight)
+        self.assertEqual(5, len(self.opened))
+
+    async def test_gather_raises(self) -> None:
+        async def fails(session):
+            raise ValueError("nope")
+
+        reads = ParallelReads(self.session, self.sessionmaker)
+        with self.assertRaises(ValueError):
+            await reads.gather(fails, lambda s: asyncio.sleep(0))
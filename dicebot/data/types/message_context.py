@@ -7,10 +7,11 @@ import textwrap
 from typing import Optional, Any
 
 import discord
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from dicebot.data.db.guild import Guild
 from dicebot.data.db.user import User
+from dicebot.data.parallel_reads import ParallelReads
 
 MAX_CHARS_PER_MSG = 3000
 
@@ -28,6 +29,8 @@ class MessageContext:
     is_test: bool
     # Arbitrary state bag for handlers to communicate
     state: dict[str, Any] = field(default_factory=dict)
+    # For checking out extra sessions, e.g. to run queries concurrently
+    sessionmaker: Optional[async_sessionmaker[AsyncSession]] = None
 
     @property
     def bot_user_id(self) -> int:
@@ -51,6 +54,9 @@ class MessageContext:
         )
         return self.message.channel
 
+    def parallel_reads(self) -> ParallelReads:
+        return ParallelReads(self.session, self.sessionmaker)
+
     # This function is a simple wrapper around the official send() function and thus does no chunking
     # for messages that are over the length limit.
     async def send(self, *args, silent: bool = True, **kwargs) -> None:
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+import random
+import re
+import zlib
+from array import array
+from typing import Iterator, List, Set, Tuple
+
+# 64 hashes gives similarity estimates within about +/-0.06, which is plenty
+# to tell "same joke" from "different joke"
+NUM_HASHES = 64
+# Split into bands of 2 for LSH, so pairs with a similarity as low as ~0.3
+# almost always end up sharing a bucket
+ROWS_PER_BAND = 2
+SHINGLE_SIZE = 3
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+# Fixed seed: signatures are persisted, so they have to be stable
+_rng = random.Random(0x70C0)
+_PERMUTATIONS: List[Tuple[int, int]] = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+    for _ in range(NUM_HASHES)
+]
+
+_NON_WORD_REGEX = re.compile(r"[\W_]+")
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase and drop punctuation, so "Dam!" and "dam" are the same"""
+    return _NON_WORD_REGEX.sub(" ", text.lower()).strip()
+
+
+def shingles(text: str) -> Set[str]:
+    text = normalize_text(text)
+    if len(text) <= SHINGLE_SIZE:
+        return {text}
+    return {text[i : i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+
+
+class MinHash:
+    """A fixed-size signature of a text's character n-grams. The fraction of
+    positions where two signatures agree estimates the Jaccard similarity of
+    the two n-gram sets."""
+
+    __slots__ = ("values",)
+
+    def __init__(self, values: array) -> None:
+        self.values = values
+
+    @classmethod
+    def of(cls, text: str) -> MinHash:
+        hashes = [zlib.crc32(s.encode("utf-8")) for s in shingles(text)]
+        values = array(
+            "Q",
+            (
+                min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+                for a, b in _PERMUTATIONS
+            ),
+        )
+        return cls(values)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> MinHash:
+        values = array("Q")
+        values.frombytes(data)
+        if len(values) != NUM_HASHES:
+            raise ValueError(f"Expected {NUM_HASHES} hashes, got {len(values)}")
+        return cls(values)
+
+    def to_bytes(self) -> bytes:
+        return self.values.tobytes()
+
+    def similarity(self, other: MinHash) -> float:
+        same = sum(1 for a, b in zip(self.values, other.values) if a == b)
+        return same / NUM_HASHES
+
+    def bands(self) -> Iterator[Tuple[int, Tuple[int, ...]]]:
+        for i in range(0, NUM_HASHES, ROWS_PER_BAND):
+            yield i, tuple(self.values[i : i + ROWS_PER_BAND])
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, MinHash) and self.values == other.values
+
+    def __repr__(self) -> str:
+        return f"MinHash({self.values.tolist()})"
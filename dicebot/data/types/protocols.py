@@ -3,7 +3,16 @@
 from __future__ import annotations
 
 import types
-from typing import Protocol, Union, get_args, get_origin, runtime_checkable
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Protocol,
+    Union,
+    get_args,
+    get_origin,
+    runtime_checkable,
+)
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -67,16 +76,43 @@ def _unwrap_optional(typ):
     return typ
 
 
-async def typify_str(
-    ctx: MessageContext, typ: StrTypifiable, value: str
-) -> StrTypifiable:
+# A prepared conversion from a command argument string to a typed value
+Converter = Callable[[MessageContext, str], Awaitable[Any]]
+
+
+def converter_for(typ: StrTypifiable) -> Converter:
+    """Work out once how to build `typ` from a string so that converting
+    an argument later doesn't have to redo the protocol checks."""
     typ = _unwrap_optional(typ)
     if isinstance(typ, _FromStrWithCtxProtocol):
-        return typ.from_str_with_ctx(value, ctx=ctx)
-    if isinstance(typ, _FromStrProtocol):
-        # assert getattr(typ, "from_str", None) is not None
-        return typ.from_str(value)
+
+        async def convert(ctx: MessageContext, value: str) -> Any:
+            return typ.from_str_with_ctx(value, ctx=ctx)
+
+    elif isinstance(typ, _FromStrProtocol):
+
+        async def convert(ctx: MessageContext, value: str) -> Any:
+            return typ.from_str(value)
+
     elif isinstance(typ, _LoadFromCmdStrProtocol):
-        return await typ.load_from_cmd_str(ctx.session, value)
+
+        async def convert(ctx: MessageContext, value: str) -> Any:
+            return await typ.load_from_cmd_str(ctx.session, value)
+
     elif isinstance(typ, _StrCallProtocol):
-        return typ(value)
+
+        async def convert(ctx: MessageContext, value: str) -> Any:
+            return typ(value)
+
+    else:
+
+        async def convert(ctx: MessageContext, value: str) -> Any:
+            return None
+
+    return convert
+
+
+async def typify_str(
+    ctx: MessageContext, typ: StrTypifiable, value: str
+) -> StrTypifiable:
+    return await converter_for(typ)(ctx, value)
@@ -7,3 +7,9 @@ State dict keys for MessageContext.
 WAS_REPOST = "was_repost"
 # Indicates that the message was identified as a pun
 WAS_PUN = "was_pun"
+# PunVerdict from the PunHandler, including whether it's a repost
+PUN_VERDICT = "pun_verdict"
+# Length of the long YouTube video found by the YoutubeHandler
+YOUTUBE_VIDEO_LENGTH_MINS = "youtube_video_length_mins"
+# ScheduledEvent matching the message reacted to with :eyes:
+EYES_SCHEDULED_EVENT = "eyes_scheduled_event"
@@ -2,13 +2,30 @@
 
 import logging
 from abc import ABC, abstractmethod
+from typing import Optional, Sequence, Type
 
 from discord import Emoji
 
 from dicebot.data.types.message_context import MessageContext
+from dicebot.handlers.message.triggers import Trigger, TriggerInput
 
 
 class AbstractHandler(ABC):
+    # If set, should_handle is only awaited when at least one of these matches.
+    # None means the handler can't be pre-filtered and always gets checked.
+    triggers: Optional[Sequence[Trigger]] = None
+
+    # Handlers run concurrently; a handler that reads ctx.state written by
+    # other handlers (or whose effects must come after theirs) must list them
+    # here so it runs after they're done.
+    runs_after: Sequence[Type["AbstractHandler"]] = ()
+    # Handlers with this set run to completion, in list order, before any of
+    # the others start
+    runs_first: bool = False
+
+    def is_triggered_by(self, msg: TriggerInput) -> bool:
+        return self.triggers is None or any(t.matches(msg) for t in self.triggers)
+
     @abstractmethod
     async def should_handle(
         self,
@@ -5,11 +5,14 @@ import re
 
 from dicebot.data.types.message_context import MessageContext
 from dicebot.handlers.message.abstract_handler import AbstractHandler
+from dicebot.handlers.message.triggers import Regex
 
 
 class BanHandler(AbstractHandler):
     """Easter egg if the bot detects 'ban' being said"""
 
+    triggers = [Regex(re.compile(r"\bban\b", re.IGNORECASE))]
+
     async def should_handle(
         self,
         ctx: MessageContext,
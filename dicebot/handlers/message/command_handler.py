@@ -6,11 +6,17 @@ from typing import Optional
 from dicebot.core.command_runner import CommandRunner
 from dicebot.data.types.message_context import MessageContext
 from dicebot.handlers.message.abstract_handler import AbstractHandler
+from dicebot.handlers.message.ban_handler import BanHandler
+from dicebot.handlers.message.triggers import Prefix
 
 
 class CommandHandler(AbstractHandler):
     """Default command runner"""
 
+    triggers = [Prefix("!")]
+    # The ban easter egg reacts before any command output
+    runs_after = [BanHandler]
+
     def __init__(self) -> None:
         self.runner = CommandRunner()
 
@@ -50,11 +56,12 @@ class CommandHandler(AbstractHandler):
     def helptext(self, cmd: Optional[str] = None) -> str:
         if cmd is not None:
             # Looking for a specific kind of help
-            if cmd in self.runner.cmds:
+            if cmd in self.runner.help_index:
+                cmd_text = self.runner.help_index[cmd]
+            elif cmd in self.runner.cmds:
                 cmd_text = self.runner.helptext(self.runner.cmds[cmd])
             else:
                 cmd_text = f"Could not find command '{cmd}'"
             return cmd_text
         else:
-            cmds = sorted(self.runner.cmds.keys())
-            return "Available commands: " + ", ".join(f"!{c}" for c in cmds)
+            return self.runner.command_list()
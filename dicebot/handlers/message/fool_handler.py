@@ -13,6 +13,8 @@ from dicebot.handlers.message.abstract_handler import AbstractHandler
 from dicebot.handlers.message.long_message_handler import LongMessageHandler
 
 SPONGEBOB_IMG_URL = "https://imgflip.com/s/meme/Mocking-Spongebob.jpg"
+# The joke only lasts for the day anyway
+FOOL_CACHE_TTL_SECS = 24 * 60 * 60
 
 
 class FoolHandler(AbstractHandler):
@@ -54,17 +56,17 @@ class FoolHandler(AbstractHandler):
 
         # April Fool's 2025 - tl;dr everything over 10 characters
         if now.year == 2025:
-            handler = LongMessageHandler(
+            tldr_handler = LongMessageHandler(
                 threshold=10,
                 skip_image=True,
                 autotldr=True,
             )
-            if await handler.should_handle(ctx):
-                return await handler.handle(ctx)
+            if await tldr_handler.should_handle(ctx):
+                return await tldr_handler.handle(ctx)
 
         # April Fool's 2026 - rewrite messages as LinkedIn humble-brags
         if now.year == 2026 and len(ctx.message.content) > 32:
-            asker = AskOpenAI()
+            asker = AskOpenAI(cache_ttl=FOOL_CACHE_TTL_SECS)
             linkedin_post = await asker.ask(
                 "Rewrite the following message as a cringy LinkedIn humble-brag post. "
                 "Keep it under 3 sentences. Use corporate buzzwords, mention personal growth, "
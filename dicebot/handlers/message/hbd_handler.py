@@ -2,11 +2,14 @@
 
 from dicebot.data.types.message_context import MessageContext
 from dicebot.handlers.message.abstract_handler import AbstractHandler
+from dicebot.handlers.message.triggers import Prefix
 
 
 class HbdHandler(AbstractHandler):
     """Recognize someone's birthday with a heartfelt response"""
 
+    triggers = [Prefix("hbd", ignore_case=True)]
+
     async def should_handle(
         self,
         ctx: MessageContext,
@@ -8,6 +8,7 @@ import discord
 from dicebot.commands import giffer
 from dicebot.data.types.message_context import MessageContext
 from dicebot.handlers.message.abstract_handler import AbstractHandler
+from dicebot.handlers.message.triggers import MentionsBotName
 
 DEFAULT_BOT_NAME = "LeeRoy"
 
@@ -15,6 +16,8 @@ DEFAULT_BOT_NAME = "LeeRoy"
 class LeeRoyHandler(AbstractHandler):
     """Easter egg if the bot detects its name being said"""
 
+    triggers = [MentionsBotName(DEFAULT_BOT_NAME)]
+
     async def should_handle(
         self,
         ctx: MessageContext,
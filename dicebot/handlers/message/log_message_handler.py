@@ -15,6 +15,9 @@ class LogMessageHandlerSource(Enum):
 class LogMessageHandler(AbstractHandler):
     """Log all messages to console"""
 
+    # Before anything else gets to reply to the message
+    runs_first = True
+
     def __init__(
         self, source: LogMessageHandlerSource = LogMessageHandlerSource.GUILD
     ) -> None:
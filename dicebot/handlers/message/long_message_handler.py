@@ -4,6 +4,7 @@ import logging
 
 from dicebot.data.types.message_context import MessageContext
 from dicebot.handlers.message.abstract_handler import AbstractHandler
+from dicebot.handlers.message.triggers import MinLength
 from dicebot.handlers.message.tldrwl_handler import do_tldr_summary
 
 LONG_MESSAGE_CHAR_THRESHOLD = 1000
@@ -25,6 +26,7 @@ class LongMessageHandler(AbstractHandler):
         self.threshold = threshold
         self.skip_image = skip_image
         self.autotldr = autotldr
+        self.triggers = [MinLength(threshold)]
 
     async def should_handle(
         self,
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+import json
+import logging
+from dataclasses import dataclass
+from typing import Any, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from dicebot.commands.ask import AskOpenAI
+from dicebot.core.pun_index import pun_index
+from dicebot.data.db.pun import Pun
+
+# Whether a message is a pun isn't going to change
+PUN_CACHE_TTL_SECS = 7 * 24 * 60 * 60
+
+_PUN_PROMPT = """\
+Does this message look like a pun?
+Message: {content}
+"""
+
+_PUN_AND_REPOST_PROMPT = """\
+Does this message look like a pun? Also, do these two pun setups look like
+the same joke?
+Message: {content}
+Setup A: {existing_setup}
+Setup B: {setup}
+"""
+
+_JSON_INSTRUCTIONS = """
+Respond with only a JSON object and nothing else, like:
+{"is_pun": true, "same_setup": false}
+"""
+
+
+@dataclass(frozen=True)
+class PunVerdict:
+    is_pun: bool
+    setup: Optional[str] = None
+    punchline: Optional[str] = None
+    # The most similar pun previously posted in this guild, if any
+    existing: Optional[Pun] = None
+    # Only meaningful when there's an existing pun to compare against
+    same_setup: bool = False
+
+
+def split_pun(content: str) -> Optional[Tuple[str, str]]:
+    """Split a message into its setup and (first spoilered) punchline"""
+    parts = content.split("||", 2)
+    if len(parts) < 3:
+        return None
+    return parts[0].strip(), parts[1].strip()
+
+
+def _parse_verdict(resp: str) -> Optional[dict[str, Any]]:
+    # Models love wrapping JSON in a markdown code block
+    text = resp.strip().removeprefix("```json").strip("`").strip()
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+async def classify_pun(
+    session: AsyncSession, guild_id: int, content: str
+) -> PunVerdict:
+    """Decide whether a message is a pun and whether it's a repost of one
+    posted before. Obvious reposts are caught by the local similarity index;
+    everything else takes a single round trip to the LLM, which also compares
+    setups if the index found a borderline candidate."""
+    split = split_pun(content)
+    match = None
+    if split is not None:
+        match = await pun_index.find_match(session, guild_id, *split)
+
+    if split is not None and match is not None and match.is_repost:
+        logging.info(f"Found a repost locally: {match}")
+        # Well, it was funny enough to be posted the first time
+        return PunVerdict(
+            is_pun=True,
+            setup=split[0],
+            punchline=split[1],
+            existing=match.pun,
+            same_setup=True,
+        )
+
+    existing = match.pun if match is not None else None
+    if split is not None and existing is not None:
+        prompt = _PUN_AND_REPOST_PROMPT.format(
+            content=content, existing_setup=existing.setup, setup=split[0]
+        )
+    else:
+        prompt = _PUN_PROMPT.format(content=content)
+
+    asker = AskOpenAI(cache_ttl=PUN_CACHE_TTL_SECS)
+    resp = await asker.ask(prompt + _JSON_INSTRUCTIONS)
+    data = _parse_verdict(resp)
+    if data is None:
+        logging.warning(f"Failed to parse pun verdict: {resp!r}")
+        # Still give the pun a chance, but never ban for a repost we
+        # couldn't make sense of
+        lowered = resp.lower()
+        data = {"is_pun": "yes" in lowered or "true" in lowered}
+
+    setup, punchline = split if split is not None else (None, None)
+    return PunVerdict(
+        is_pun=data.get("is_pun") is True,
+        setup=setup,
+        punchline=punchline,
+        existing=existing,
+        same_setup=existing is not None and data.get("same_setup") is True,
+    )
@@ -1,15 +1,18 @@
 #!/usr/bin/env python3
 
 import logging
-from dicebot.commands.ask import AskOpenAI
 from dicebot.data.types.message_context import MessageContext
 from dicebot.data.types import state_keys
 from dicebot.handlers.message.abstract_handler import AbstractHandler
+from dicebot.handlers.message.pun_classifier import classify_pun
+from dicebot.handlers.message.triggers import Substring
 
 
 class PunHandler(AbstractHandler):
     """Easter egg if the bot detects a pun in a message."""
 
+    triggers = [Substring("||")]
+
     async def should_handle(
         self,
         ctx: MessageContext,
@@ -20,13 +23,11 @@ class PunHandler(AbstractHandler):
         self,
         ctx: MessageContext,
     ) -> None:
-        asker = AskOpenAI()
-        resp = await asker.ask(
-            "Does this look like a pun?\n"
-            "Only answer yes or no, nothing else:\n"
-            f"{ctx.message.content}"
-        )
-        if "yes" in resp.lower():
+        # This also checks whether it's a repost so the RepostHandler doesn't
+        # need a second round trip to the LLM
+        verdict = await classify_pun(ctx.session, ctx.guild_id, ctx.message.content)
+        ctx.state[state_keys.PUN_VERDICT] = verdict
+        if verdict.is_pun:
             ctx.state[state_keys.WAS_PUN] = True
             guild = ctx.message.guild
             # `should_handle` verified that this is a guild context
@@ -2,13 +2,15 @@
 
 import re
 
-from dicebot.commands.ask import AskOpenAI
 from dicebot.commands.ban import ban_internal
 from dicebot.data.types.time import Time
 from dicebot.data.types.message_context import MessageContext
 from dicebot.data.types import state_keys
 from dicebot.data.db.pun import Pun
 from dicebot.handlers.message.abstract_handler import AbstractHandler
+from dicebot.handlers.message.pun_classifier import classify_pun
+from dicebot.handlers.message.pun_handler import PunHandler
+from dicebot.handlers.message.triggers import Substring
 
 # Regex to find the first text enclosed in spoilers
 SPOILER_REGEX = re.compile(r"\|\|(.+?)\|\|", re.DOTALL)
@@ -17,35 +19,36 @@ SPOILER_REGEX = re.compile(r"\|\|(.+?)\|\|", re.DOTALL)
 class RepostHandler(AbstractHandler):
     """Detect reposted puns by comparing setups and ban repeat offenders."""
 
+    # Only runs after the PunHandler found a pun, which needs spoiler tags
+    triggers = [Substring("||")]
+    runs_after = [PunHandler]
+
     async def should_handle(self, ctx: MessageContext) -> bool:
         return bool(ctx.state.get(state_keys.WAS_PUN))
 
     async def handle(self, ctx: MessageContext) -> None:
-        content = ctx.message.content
-        parts = content.split("||", 2)
-        if len(parts) < 3:
+        verdict = ctx.state.get(state_keys.PUN_VERDICT)
+        if verdict is None:
+            # Someone else decided this was a pun, so do the classification
+            verdict = await classify_pun(ctx.session, ctx.guild_id, ctx.message.content)
+        if verdict.setup is None or verdict.punchline is None:
             return
-        setup = parts[0].strip()
-        punchline = parts[1].strip()
 
-        existing = await Pun.get_by_punchline(ctx.session, ctx.guild_id, punchline)
-        if existing is None:
-            # First occurrence: record setup & punchline
+        existing = verdict.existing
+        if existing is None or (
+            not verdict.same_setup and existing.punchline != verdict.punchline
+        ):
+            # First occurrence (or just a similar pun): record setup & punchline
             await Pun.add_or_get(
-                ctx.session, ctx.guild_id, setup, punchline, ctx.author_id
+                ctx.session,
+                ctx.guild_id,
+                verdict.setup,
+                verdict.punchline,
+                ctx.author_id,
             )
             return
 
-        # Compare stored setup vs new setup via OpenAI
-        asker = AskOpenAI()
-        prompt = (
-            "Do these two pun setups look like the same joke? "
-            "Only answer yes or no, nothing else:\n"
-            f"Setup A: {existing.setup}\n"
-            f"Setup B: {setup}"
-        )
-        resp = await asker.ask(prompt)
-        if "yes" in resp.lower():
+        if verdict.same_setup:
             # Notify and ban
             user = await ctx.client.fetch_user(existing.first_poster_id)
             await ctx.quote_reply(
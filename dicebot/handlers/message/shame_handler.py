@@ -5,23 +5,30 @@ import logging
 import pytz
 
 from dicebot.commands.ban import unban_internal
+from dicebot.core.ban_cache import ban_cache
 from dicebot.data.db.channel import Channel
 from dicebot.data.db.user import User
 from dicebot.data.types.message_context import MessageContext
 from dicebot.handlers.message.abstract_handler import AbstractHandler
+from dicebot.handlers.message.command_handler import CommandHandler
 
 
 class ShameHandler(AbstractHandler):
     """If the user is banned, we react SHAME"""
 
+    # Whatever command the message ran (like an unban) has to land before we
+    # decide whether they're still banned
+    runs_after = [CommandHandler]
+
     async def should_handle(
         self,
         ctx: MessageContext,
     ) -> bool:
-        channel = await Channel.get_or_create(ctx.session, ctx.channel.id, ctx.guild_id)
-        if not channel.shame:
+        # Check the (cached) ban first so most messages don't touch the DB
+        if not await ban_cache.is_currently_banned(ctx.session, ctx.guild, ctx.author):
             return False
-        return await ctx.author.is_currently_banned(ctx.session, ctx.guild)
+        channel = await Channel.get_or_create(ctx.session, ctx.channel.id, ctx.guild_id)
+        return channel.shame
 
     async def handle(
         self,
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+
+from unittest.mock import AsyncMock, patch
+
+from dicebot.commands.ask import AskOpenAI
+from dicebot.core.pun_index import pun_index
+from dicebot.data.db.pun import Pun
+from dicebot.data.types import state_keys
+from dicebot.handlers.message.pun_classifier import classify_pun, split_pun
+from dicebot.handlers.message.pun_handler import PunHandler
+from dicebot.test.utils import DicebotTestCase, TestMessageContext
+
+
+class TestPunClassifier(DicebotTestCase):
+    def tearDown(self) -> None:
+        pun_index.clear()
+
+    def test_split_pun(self) -> None:
+        self.assertEqual(("setup", "punchline"), split_pun("setup ||punchline|| x"))
+        self.assertIsNone(split_pun("no ||closing spoiler"))
+
+    async def test_classify_pun(self) -> None:
+        existing = Pun(guild_id=1, setup="Old setup", punchline="p", first_poster_id=2)
+        ctx = TestMessageContext.get()
+        testcases = [
+            # (content, existing, response, is_pun, same_setup)
+            ("New ||p||", None, '{"is_pun": true}', True, False),
+            ("New ||p||", existing, '{"is_pun": true, "same_setup": true}', True, True),
+            (
+                "New ||p||",
+                existing,
+                '```json\n{"is_pun": false, "same_setup": false}\n```',
+                False,
+                False,
+            ),
+            # Unparseable responses can still be puns, but never reposts
+            ("New ||p||", existing, "yes", True, False),
+            ("New ||p||", existing, "Bruh idk", False, False),
+        ]
+        for content, existing_pun, response, is_pun, same_setup in testcases:
+            with self.subTest(existing=existing_pun, response=response):
+                pun_index.clear()
+                puns = [existing_pun] if existing_pun is not None else []
+                mock_ask = AsyncMock(return_value=response)
+                with patch.object(
+                    Pun, "get_all_for_guild", new=AsyncMock(return_value=puns)
+                ), patch.object(AskOpenAI, "ask", new=mock_ask):
+                    verdict = await classify_pun(ctx.session, 1, content)
+                mock_ask.assert_awaited_once()
+                self.assertEqual(is_pun, verdict.is_pun)
+                self.assertEqual(same_setup, verdict.same_setup)
+                self.assertEqual("New", verdict.setup)
+                self.assertEqual("p", verdict.punchline)
+                self.assertIs(existing_pun, verdict.existing)
+                # Only compare setups when there's something to compare to
+                prompt = mock_ask.await_args.args[0]
+                self.assertEqual(existing_pun is not None, "Setup A" in prompt)
+
+    async def test_pun_handler_sets_state(self) -> None:
+        ctx = TestMessageContext.get("New ||p||")
+        ctx.message.guild.emojis = []
+        ctx.client.emojis = []
+        mock_ask = AsyncMock(return_value='{"is_pun": true}')
+        with patch.object(
+            Pun, "get_all_for_guild", new=AsyncMock(return_value=[])
+        ), patch.object(AskOpenAI, "ask", new=mock_ask):
+            await PunHandler().handle(ctx)
+        self.assertTrue(ctx.state[state_keys.WAS_PUN])
+        self.assertTrue(ctx.state[state_keys.PUN_VERDICT].is_pun)
+        ctx.quote_reply.assert_awaited_once()
+
+    async def test_obvious_repost_skips_llm(self) -> None:
+        existing = Pun(
+            guild_id=1,
+            setup="What do you call a fish with no eyes?",
+            punchline="A fsh",
+            first_poster_id=2,
+        )
+        ctx = TestMessageContext.get()
+        mock_ask = AsyncMock()
+        with patch.object(
+            Pun, "get_all_for_guild", new=AsyncMock(return_value=[existing])
+        ), patch.object(AskOpenAI, "ask", new=mock_ask):
+            verdict = await classify_pun(
+                ctx.session, 1, "what do you call a fish with no eyes ||a fsh!||"
+            )
+        mock_ask.assert_not_awaited()
+        self.assertTrue(verdict.is_pun)
+        self.assertTrue(verdict.same_setup)
+        self.assertIs(existing, verdict.existing)
@@ -3,7 +3,9 @@
 from dataclasses import dataclass
 from unittest.mock import AsyncMock, patch
 
+from dicebot.core.pun_index import pun_index
 from dicebot.data.types import state_keys
+from dicebot.handlers.message.pun_classifier import PunVerdict
 from dicebot.handlers.message.repost_handler import RepostHandler
 from dicebot.data.db.pun import Pun
 from dicebot.commands.ask import AskOpenAI
@@ -11,6 +13,9 @@ from dicebot.test.utils import TestMessageContext, DicebotTestCase
 
 
 class TestRepostHandler(DicebotTestCase):
+    def tearDown(self) -> None:
+        pun_index.clear()
+
     @dataclass
     class Scenario:
         content: str
@@ -28,13 +33,13 @@ class TestRepostHandler(DicebotTestCase):
             TestRepostHandler.Scenario(
                 content="B ||p2|| extra",
                 existing=Pun(guild_id=1, setup="X", punchline="p2", first_poster_id=2),
-                ai_response="no",
+                ai_response='{"is_pun": true, "same_setup": false}',
             ),
             # existing pun, AI says yes -> ban (no new record)
             TestRepostHandler.Scenario(
                 content="C ||p3|| extra",
                 existing=Pun(guild_id=1, setup="Y", punchline="p3", first_poster_id=3),
-                ai_response="yes",
+                ai_response='{"is_pun": true, "same_setup": true}',
                 expect_ban=True,
             ),
         ]
@@ -47,14 +52,17 @@ class TestRepostHandler(DicebotTestCase):
                 ctx = TestMessageContext.get(tc.content)
                 ctx.state[state_keys.WAS_PUN] = True
                 # Prepare mocks
-                mock_get = AsyncMock(return_value=tc.existing)
+                pun_index.clear()
+                mock_get = AsyncMock(
+                    return_value=[tc.existing] if tc.existing is not None else []
+                )
                 mock_add = AsyncMock()
                 mock_ask = AsyncMock(return_value=tc.ai_response)
                 mock_ban = AsyncMock()
 
                 # Patch methods
                 with (
-                    patch.object(Pun, "get_by_punchline", new=mock_get),
+                    patch.object(Pun, "get_all_for_guild", new=mock_get),
                     patch.object(Pun, "add_or_get", new=mock_add),
                     patch.object(AskOpenAI, "ask", new=mock_ask),
                     patch(
@@ -69,10 +77,8 @@ class TestRepostHandler(DicebotTestCase):
                     )
                     await handler.handle(ctx)
 
-                # Assert get_by_punchline always invoked
-                mock_get.assert_awaited_once_with(
-                    ctx.session, ctx.guild_id, tc.content.split("||")[1].strip()
-                )
+                # Assert the guild's puns were always looked at
+                mock_get.assert_awaited_once_with(ctx.session, ctx.guild_id)
                 # Assert add_or_get called only when expected
                 if tc.expect_add:
                     mock_add.assert_awaited_once()
@@ -86,3 +92,26 @@ class TestRepostHandler(DicebotTestCase):
                 else:
                     self.assertFalse(mock_ban.called)
 
+
+    async def test_uses_pun_handler_verdict(self):
+        """The PunHandler already asked about the repost, so don't ask again"""
+        existing = Pun(guild_id=1, setup="X", punchline="p", first_poster_id=2)
+        ctx = TestMessageContext.get("X ||p||")
+        ctx.state[state_keys.WAS_PUN] = True
+        ctx.state[state_keys.PUN_VERDICT] = PunVerdict(
+            is_pun=True, setup="X", punchline="p", existing=existing, same_setup=True
+        )
+        ctx.client.fetch_user = AsyncMock(return_value=AsyncMock(name="User"))
+        mock_ask = AsyncMock()
+        mock_ban = AsyncMock()
+        with (
+            patch.object(AskOpenAI, "ask", new=mock_ask),
+            patch(
+                "dicebot.handlers.message.repost_handler.ban_internal",
+                new=mock_ban,
+            ),
+        ):
+            await RepostHandler().handle(ctx)
+        mock_ask.assert_not_awaited()
+        mock_ban.assert_awaited_once()
+        self.assertTrue(ctx.state[state_keys.WAS_REPOST])
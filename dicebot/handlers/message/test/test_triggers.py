@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+
+import re
+import unittest
+
+from dicebot.handlers.message.ban_handler import BanHandler
+from dicebot.handlers.message.birthday_handler import BirthdayHandler
+from dicebot.handlers.message.fool_handler import FoolHandler
+from dicebot.handlers.message.log_message_handler import LogMessageHandler
+from dicebot.handlers.message.shame_handler import ShameHandler
+from dicebot.handlers.message.triggers import (
+    HasEmbeds,
+    HasReference,
+    MentionsBotName,
+    MinLength,
+    Prefix,
+    Regex,
+    Substring,
+    TriggerInput,
+)
+
+
+def _input(
+    content: str,
+    has_embeds: bool = False,
+    has_reference: bool = False,
+    bot_name: str = "LeeRoy",
+) -> TriggerInput:
+    return TriggerInput(
+        content=content,
+        lowered=content.lower(),
+        has_embeds=has_embeds,
+        has_reference=has_reference,
+        bot_name=bot_name,
+    )
+
+
+class TestTriggers(unittest.TestCase):
+    def test_prefix(self) -> None:
+        self.assertTrue(Prefix("!").matches(_input("!roll")))
+        self.assertFalse(Prefix("!").matches(_input("roll!")))
+        self.assertTrue(
+            Prefix("tldr", "tldw", ignore_case=True).matches(_input("TLDW 3"))
+        )
+        self.assertFalse(Prefix("hbd").matches(_input("HBD")))
+
+    def test_substring(self) -> None:
+        self.assertTrue(Substring("||").matches(_input("a ||b||")))
+        self.assertFalse(Substring("||").matches(_input("a | b")))
+        self.assertTrue(Substring("Ban", ignore_case=True).matches(_input("BAN")))
+
+    def test_regex(self) -> None:
+        trigger = Regex(re.compile(r"\bban\b", re.IGNORECASE))
+        self.assertTrue(trigger.matches(_input("please BAN him")))
+        self.assertFalse(trigger.matches(_input("banana")))
+
+    def test_min_length(self) -> None:
+        self.assertTrue(MinLength(3).matches(_input("abcd")))
+        self.assertFalse(MinLength(3).matches(_input("abc")))
+
+    def test_embeds_and_reference(self) -> None:
+        self.assertTrue(HasEmbeds().matches(_input("", has_embeds=True)))
+        self.assertFalse(HasEmbeds().matches(_input("")))
+        self.assertTrue(HasReference().matches(_input("", has_reference=True)))
+        self.assertFalse(HasReference().matches(_input("")))
+
+    def test_mentions_bot_name(self) -> None:
+        trigger = MentionsBotName("LeeRoy")
+        self.assertTrue(trigger.matches(_input("hey leeroy")))
+        self.assertTrue(trigger.matches(_input("hey dicebot", bot_name="DiceBot")))
+        self.assertFalse(trigger.matches(_input("hey leeroy", bot_name="DiceBot")))
+        self.assertTrue(trigger.matches(_input("hey leeroy", bot_name=None)))
+
+
+class TestHandlerTriggers(unittest.TestCase):
+    def test_plain_message_skips_triggered_handlers(self) -> None:
+        from dicebot.handlers.registry import MESSAGE_HANDLERS
+
+        msg = _input("just a normal chat message")
+        handlers = [
+            handler
+            for entry in MESSAGE_HANDLERS.entries
+            if (handler := entry.handler).is_triggered_by(msg)
+        ]
+        # Only the handlers that don't look at the message content remain
+        self.assertEqual(
+            [LogMessageHandler, BirthdayHandler, FoolHandler, ShameHandler],
+            [type(h) for h in handlers],
+        )
+
+    def test_untriggered_handler_always_checked(self) -> None:
+        self.assertTrue(ShameHandler().is_triggered_by(_input("")))
+        self.assertTrue(BanHandler().is_triggered_by(_input("ban")))
+        self.assertFalse(BanHandler().is_triggered_by(_input("hello")))
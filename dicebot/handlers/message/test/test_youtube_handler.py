@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from dicebot.data.types import state_keys
+from dicebot.handlers.message.youtube_handler import YoutubeHandler
+from dicebot.test.utils import DicebotTestCase, TestMessageContext
+
+
+class TestYoutubeHandler(DicebotTestCase):
+    async def test_should_handle(self) -> None:
+        testcases = [
+            # (embed urls, looked up lengths, expected, expected mins)
+            (["https://youtu.be/dQw4w9WgXcQ"], [11 * 60], True, 11),
+            (["https://youtu.be/dQw4w9WgXcQ"], [3 * 60], False, None),
+            # Failed lookups fall through to the next embed
+            (
+                ["https://youtu.be/dQw4w9WgXcQ", "https://youtu.be/9bZkp7q19f0"],
+                [None, 20 * 60],
+                True,
+                20,
+            ),
+            (["https://example.com"], [], False, None),
+        ]
+        for urls, lengths, expected, expected_mins in testcases:
+            with self.subTest(urls=urls, lengths=lengths):
+                ctx = TestMessageContext.get()
+                ctx.message.embeds = [MagicMock(url=url) for url in urls]
+                mock_get = AsyncMock(side_effect=lengths)
+                with patch(
+                    "dicebot.handlers.message.youtube_handler.video_lengths"
+                ) as mock_lengths:
+                    mock_lengths.get_length_secs = mock_get
+                    res = await YoutubeHandler().should_handle(ctx)
+                self.assertEqual(expected, res)
+                self.assertEqual(len(lengths), mock_get.await_count)
+                # Whatever got looked up is saved
+                self.assertEqual(len(lengths), ctx.session.commit.await_count)
+                self.assertEqual(
+                    expected_mins, ctx.state.get(state_keys.YOUTUBE_VIDEO_LENGTH_MINS)
+                )
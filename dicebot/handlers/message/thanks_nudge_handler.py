@@ -2,6 +2,7 @@
 
 import re
 from dicebot.handlers.message.abstract_handler import AbstractHandler
+from dicebot.handlers.message.triggers import Regex
 from dicebot.data.types.message_context import MessageContext
 
 THANKS_REGEX = re.compile(r"\bthanks\b", re.IGNORECASE)
@@ -9,6 +10,8 @@ THANKS_REGEX = re.compile(r"\bthanks\b", re.IGNORECASE)
 class ThanksNudgeHandler(AbstractHandler):
     """Nudge users to use !thanks when they say thanks in chat."""
 
+    triggers = [Regex(THANKS_REGEX)]
+
     async def should_handle(self, ctx: MessageContext) -> bool:
         content = ctx.message.content
         if not content:
@@ -7,6 +7,7 @@ from dicebot.commands.ask import AskOpenAI
 
 from dicebot.data.types.message_context import MessageContext
 from dicebot.handlers.message.abstract_handler import AbstractHandler
+from dicebot.handlers.message.triggers import Prefix
 
 LAZIER_PROMPT = "Summarize the following in fewer words, but definitely no more than 50 words. Include just the summary.:\n\n{}\n"
 
@@ -36,10 +37,14 @@ TLDRWL_TRIGGERS = (
 )
 
 
+# Linked pages can change, so don't hold on to summaries for too long
+TLDR_CACHE_TTL_SECS = 60 * 60
+
+
 async def do_tldr_summary(content: str, splits: int = 1) -> str:
     logging.info("Getting message summary, this could take a while...")
     to_summarize = content
-    asker = AskOpenAI(tool_ids=["web_content_fetcher"])
+    asker = AskOpenAI(tool_ids=["web_content_fetcher"], cache_ttl=TLDR_CACHE_TTL_SECS)
     for _ in range(splits):
         try:
             to_summarize = await asker.ask(LAZIER_PROMPT.format(to_summarize))
@@ -52,6 +57,8 @@ async def do_tldr_summary(content: str, splits: int = 1) -> str:
 class TldrwlHandler(AbstractHandler):
     """Get a too long, didn't read/write/listen summary"""
 
+    triggers = [Prefix(*TLDRWL_TRIGGERS, ignore_case=True)]
+
     async def should_handle(
         self,
         ctx: MessageContext,
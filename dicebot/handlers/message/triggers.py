@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+import re
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Optional
+
+import discord
+
+
+@dataclass(frozen=True)
+class TriggerInput:
+    """The parts of a message that triggers look at, computed once per message"""
+
+    content: str
+    lowered: str
+    has_embeds: bool
+    has_reference: bool
+    bot_name: Optional[str]
+
+    @classmethod
+    def from_message(
+        cls, message: discord.Message, bot_user: Optional[discord.ClientUser]
+    ) -> TriggerInput:
+        return cls(
+            content=message.content,
+            lowered=message.content.lower(),
+            has_embeds=len(message.embeds) > 0,
+            has_reference=message.reference is not None,
+            bot_name=bot_user.name if bot_user is not None else None,
+        )
+
+
+class Trigger(ABC):
+    """A cheap, synchronous check that has to pass before a handler's
+    should_handle is awaited. These must never do any I/O."""
+
+    @abstractmethod
+    def matches(self, msg: TriggerInput) -> bool:
+        pass
+
+
+class Prefix(Trigger):
+    def __init__(self, *prefixes: str, ignore_case: bool = False) -> None:
+        self.ignore_case = ignore_case
+        self.prefixes = tuple(p.lower() for p in prefixes) if ignore_case else prefixes
+
+    def matches(self, msg: TriggerInput) -> bool:
+        content = msg.lowered if self.ignore_case else msg.content
+        return content.startswith(self.prefixes)
+
+
+class Substring(Trigger):
+    def __init__(self, substring: str, ignore_case: bool = False) -> None:
+        self.ignore_case = ignore_case
+        self.substring = substring.lower() if ignore_case else substring
+
+    def matches(self, msg: TriggerInput) -> bool:
+        content = msg.lowered if self.ignore_case else msg.content
+        return self.substring in content
+
+
+class Regex(Trigger):
+    def __init__(self, pattern: re.Pattern) -> None:
+        self.pattern = pattern
+
+    def matches(self, msg: TriggerInput) -> bool:
+        return self.pattern.search(msg.content) is not None
+
+
+class MinLength(Trigger):
+    def __init__(self, length: int) -> None:
+        self.length = length
+
+    def matches(self, msg: TriggerInput) -> bool:
+        return len(msg.content) > self.length
+
+
+class HasEmbeds(Trigger):
+    def matches(self, msg: TriggerInput) -> bool:
+        return msg.has_embeds
+
+
+class HasReference(Trigger):
+    def matches(self, msg: TriggerInput) -> bool:
+        return msg.has_reference
+
+
+class MentionsBotName(Trigger):
+    def __init__(self, default_name: str) -> None:
+        self.default_name = default_name
+        self._patterns: dict[str, re.Pattern] = {}
+
+    def matches(self, msg: TriggerInput) -> bool:
+        name = msg.bot_name or self.default_name
+        pattern = self._patterns.get(name)
+        if pattern is None:
+            pattern = re.compile(rf"\b{re.escape(name)}\b", re.IGNORECASE)
+            self._patterns[name] = pattern
+        return pattern.search(msg.content) is not None
@@ -3,10 +3,11 @@
 import asyncio
 import logging
 
-import pytube
-
+from dicebot.core.video_lengths import video_lengths
+from dicebot.data.types import state_keys
 from dicebot.data.types.message_context import MessageContext
 from dicebot.handlers.message.abstract_handler import AbstractHandler
+from dicebot.handlers.message.triggers import HasEmbeds
 
 YOUTUBE_TRIGGERS = ["youtube.com", "youtu.be"]
 VIDEO_LENGTH_COMPLAINT_THRESHOLD_MINUTES = 10
@@ -15,8 +16,7 @@ VIDEO_LENGTH_COMPLAINT_THRESHOLD_MINUTES = 10
 class YoutubeHandler(AbstractHandler):
     """Easter egg for long YouTube videos"""
 
-    def __init__(self) -> None:
-        self.video_length_mins = 0
+    triggers = [HasEmbeds()]
 
     async def should_handle(
         self,
@@ -26,20 +26,20 @@ class YoutubeHandler(AbstractHandler):
             if embed.url is not None and any(
                 yt_trigger in embed.url.lower() for yt_trigger in YOUTUBE_TRIGGERS
             ):
-                self.video_length_mins = 0
-                try:
-                    video = pytube.YouTube(embed.url)
-                    self.video_length_mins = video.length // 60
-                    logging.info(f"Found video of length {self.video_length_mins} mins")
-                except Exception as e:
-                    logging.warning(
-                        f"Failed to get YouTube info for `{embed.url}`: {e}"
-                    )
+                video_length_secs = await video_lengths.get_length_secs(
+                    ctx.session, embed.url
+                )
+                # Save it if we had to look it up
+                await ctx.session.commit()
+                if video_length_secs is None:
                     continue
+                video_length_mins = video_length_secs // 60
+                logging.info(f"Found video of length {video_length_mins} mins")
 
                 # If the video isn't too long, don't handle it --
                 # but keep checking other embeds
-                if self.video_length_mins > VIDEO_LENGTH_COMPLAINT_THRESHOLD_MINUTES:
+                if video_length_mins > VIDEO_LENGTH_COMPLAINT_THRESHOLD_MINUTES:
+                    ctx.state[state_keys.YOUTUBE_VIDEO_LENGTH_MINS] = video_length_mins
                     return True
         # No embeds had a long YT video
         return False
@@ -48,6 +48,7 @@ class YoutubeHandler(AbstractHandler):
         self,
         ctx: MessageContext,
     ) -> None:
-        await ctx.quote_reply(f"{self.video_length_mins} minutes?")
+        video_length_mins = ctx.state.get(state_keys.YOUTUBE_VIDEO_LENGTH_MINS, 0)
+        await ctx.quote_reply(f"{video_length_mins} minutes?")
         await asyncio.sleep(1)
         await ctx.send("Bro, I don't have time to watch this")
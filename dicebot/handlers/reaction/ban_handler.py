@@ -4,7 +4,8 @@ import asyncio
 import datetime
 
 from dicebot.commands import ban
-from dicebot.data.db.active_event import ActiveEvent, EventType
+from dicebot.core.event_cache import event_cache
+from dicebot.data.db.active_event import EventType
 from dicebot.data.db.user import User
 from dicebot.data.types.message_context import MessageContext
 from dicebot.data.types.time import Time
@@ -43,12 +44,18 @@ class BanReactionHandler(AbstractReactionHandler):
                     reason="Tried to react-ban the bot",
                 )
 
+        # Every reaction comes through here, so don't look up the event for
+        # ones that aren't bans
+        if not basic:
+            return False
+
         # Check for TURBO_DAY event — threshold becomes 1
-        active_event = await ActiveEvent.get_current(ctx.session, ctx.guild_id)
+        active_event = await event_cache.get_current(ctx.session, ctx.guild_id)
         if active_event is not None and active_event.event_type_enum is EventType.TURBO_DAY:
-            return basic and ctx.reaction.count == 1
+            assert ctx.reaction is not None
+            return ctx.reaction.count == 1
 
-        return basic and self.meets_threshold_check(ctx)
+        return self.meets_threshold_check(ctx)
 
     async def handle(
         self,
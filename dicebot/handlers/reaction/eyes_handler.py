@@ -5,14 +5,12 @@ from typing import Optional
 from sqlalchemy.exc import IntegrityError
 
 from dicebot.data.db.scheduled_event import ScheduledEvent, ScheduledEventSignup
+from dicebot.data.types import state_keys
 from dicebot.data.types.message_context import MessageContext
 from dicebot.handlers.reaction.abstract_reaction_handler import AbstractReactionHandler
 
 
 class EyesReactionHandler(AbstractReactionHandler):
-    def __init__(self) -> None:
-        self._cached_event: Optional[ScheduledEvent] = None
-
     @property
     def reaction_name(self) -> str:
         return "eyes"
@@ -28,14 +26,15 @@ class EyesReactionHandler(AbstractReactionHandler):
         else:
             if (emoji.name or "").lower() != self.reaction_name:
                 return False
-        self._cached_event = await ScheduledEvent.get_by_message_id(ctx.session, ctx.reaction.message.id)
-        return self._cached_event is not None
+        event = await ScheduledEvent.get_by_message_id(ctx.session, ctx.reaction.message.id)
+        ctx.state[state_keys.EYES_SCHEDULED_EVENT] = event
+        return event is not None
 
     async def handle(self, ctx: MessageContext) -> None:
         assert ctx.reaction is not None
         assert ctx.reactor is not None
 
-        event = self._cached_event
+        event: Optional[ScheduledEvent] = ctx.state.get(state_keys.EYES_SCHEDULED_EVENT)
         if event is None:
             return
 
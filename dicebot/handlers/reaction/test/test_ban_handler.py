@@ -9,7 +9,7 @@ from dicebot.test.utils import DicebotTestCase, TestMessageContext
 
 
 class TestBanReactionHandler(DicebotTestCase):
-    @patch("dicebot.handlers.reaction.ban_handler.ActiveEvent.get_current", new_callable=AsyncMock)
+    @patch("dicebot.handlers.reaction.ban_handler.event_cache.get_current", new_callable=AsyncMock)
     @patch("dicebot.handlers.reaction.ban_handler.ban", autospec=True)
     async def test_should_handle_turbo_day_threshold_one(self, mock_ban, mock_get_current):
         """TURBO_DAY: should_handle returns True when reaction.count == 1"""
@@ -28,7 +28,7 @@ class TestBanReactionHandler(DicebotTestCase):
 
         self.assertTrue(result)
 
-    @patch("dicebot.handlers.reaction.ban_handler.ActiveEvent.get_current", new_callable=AsyncMock)
+    @patch("dicebot.handlers.reaction.ban_handler.event_cache.get_current", new_callable=AsyncMock)
     @patch("dicebot.handlers.reaction.ban_handler.ban", autospec=True)
     async def test_should_handle_turbo_day_threshold_not_met(self, mock_ban, mock_get_current):
         """TURBO_DAY: should_handle returns False when reaction.count != 1"""
@@ -46,3 +46,17 @@ class TestBanReactionHandler(DicebotTestCase):
             result = await handler.should_handle(ctx)
 
         self.assertFalse(result)
+
+    @patch("dicebot.handlers.reaction.ban_handler.event_cache.get_current", new_callable=AsyncMock)
+    @patch("dicebot.handlers.reaction.ban_handler.ban", autospec=True)
+    async def test_should_handle_other_reaction_skips_event(self, mock_ban, mock_get_current):
+        """Reactions that aren't bans don't look up the active event"""
+        ctx = TestMessageContext.get(reaction=create_autospec(discord.Reaction))
+        ctx.reaction.count = 1
+
+        handler = BanReactionHandler()
+        with patch.object(handler, "should_handle_without_threshold_check", new_callable=AsyncMock, return_value=False):
+            result = await handler.should_handle(ctx)
+
+        self.assertFalse(result)
+        mock_get_current.assert_not_awaited()
@@ -5,6 +5,7 @@ from sqlalchemy.exc import IntegrityError
 from unittest.mock import AsyncMock, MagicMock, create_autospec, patch
 
 from dicebot.data.db.scheduled_event import ScheduledEvent, ScheduledEventSignup
+from dicebot.data.types import state_keys
 from dicebot.handlers.reaction.eyes_handler import EyesReactionHandler
 from dicebot.test.utils import DicebotTestCase, TestMessageContext
 
@@ -48,7 +49,7 @@ class TestEyesReactionHandler(DicebotTestCase):
         mock_event = MagicMock(spec=ScheduledEvent, id=1)
         mock_get.return_value = mock_event
         handler = EyesReactionHandler()
-        handler._cached_event = mock_event
+        ctx.state[state_keys.EYES_SCHEDULED_EVENT] = mock_event
         await handler.handle(ctx)
         ctx.session.add.assert_called_once()
         ctx.session.commit.assert_awaited_once()
@@ -61,7 +62,7 @@ class TestEyesReactionHandler(DicebotTestCase):
         mock_get.return_value = mock_event
         ctx.session.commit = AsyncMock(side_effect=IntegrityError("", {}, Exception()))
         handler = EyesReactionHandler()
-        handler._cached_event = mock_event
+        ctx.state[state_keys.EYES_SCHEDULED_EVENT] = mock_event
         # Should not raise
         await handler.handle(ctx)
         ctx.session.rollback.assert_awaited_once()
@@ -79,6 +80,6 @@ class TestEyesReactionHandler(DicebotTestCase):
         ctx.reactor.id = 42
         mock_get.return_value = None
         handler = EyesReactionHandler()
-        handler._cached_event = None  # simulate should_handle setting cache to None
+        ctx.state[state_keys.EYES_SCHEDULED_EVENT] = None  # simulate should_handle finding no event
         await handler.handle(ctx)
         ctx.session.add.assert_not_called()
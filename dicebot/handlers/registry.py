@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+
+from dicebot.core.handler_registry import HandlerRegistry, RegisteredHandler
+
+# on_message handlers
+from dicebot.handlers.message.abstract_handler import AbstractHandler
+from dicebot.handlers.message.ban_handler import BanHandler
+from dicebot.handlers.message.birthday_handler import BirthdayHandler
+from dicebot.handlers.message.command_handler import CommandHandler
+from dicebot.handlers.message.fool_handler import FoolHandler
+from dicebot.handlers.message.hbd_handler import HbdHandler
+from dicebot.handlers.message.leeroy_handler import LeeRoyHandler
+from dicebot.handlers.message.pun_handler import PunHandler
+from dicebot.handlers.message.log_message_handler import (
+    LogMessageHandler,
+    LogMessageHandlerSource,
+)
+from dicebot.handlers.message.long_message_handler import LongMessageHandler
+from dicebot.handlers.message.shame_handler import ShameHandler
+from dicebot.handlers.message.tldrwl_handler import TldrwlHandler
+from dicebot.handlers.message.youtube_handler import YoutubeHandler
+from dicebot.handlers.message.repost_handler import RepostHandler
+from dicebot.handlers.message.thanks_nudge_handler import ThanksNudgeHandler
+
+# on_reaction handlers
+from dicebot.handlers.reaction.abstract_reaction_handler import AbstractReactionHandler
+from dicebot.handlers.reaction.ban_handler import BanReactionHandler
+from dicebot.handlers.reaction.eyes_handler import EyesReactionHandler
+from dicebot.handlers.reaction.generic_gif_handler import GenericGifReactionHandler
+from dicebot.handlers.reaction.kekw_handler import KekwReactionHandler
+from dicebot.handlers.reaction.shrek_handler import ShrekReactionHandler
+
+# Handler instances are shared by every message in every guild, so they must
+# not keep per-message state on self -- use ctx.state instead.
+_command_handler = CommandHandler()
+
+MESSAGE_HANDLERS: HandlerRegistry[AbstractHandler] = HandlerRegistry(
+    [
+        # NOTE: Explicitly run the LogMessageHandler first
+        RegisteredHandler("log_message", LogMessageHandler(), required=True),
+        RegisteredHandler("ban", BanHandler()),
+        RegisteredHandler("birthday", BirthdayHandler()),
+        RegisteredHandler("command", _command_handler, required=True),
+        RegisteredHandler("hbd", HbdHandler()),
+        RegisteredHandler("leeroy", LeeRoyHandler()),
+        RegisteredHandler("long_message", LongMessageHandler()),
+        RegisteredHandler("fool", FoolHandler()),
+        RegisteredHandler("shame", ShameHandler()),
+        RegisteredHandler("youtube", YoutubeHandler()),
+        RegisteredHandler("thanks_nudge", ThanksNudgeHandler()),
+        # These can be slow, so keep them at the end of the list
+        RegisteredHandler("tldrwl", TldrwlHandler()),
+        RegisteredHandler("pun", PunHandler()),
+        RegisteredHandler("repost", RepostHandler()),
+    ]
+)
+
+REACTION_HANDLERS: HandlerRegistry[AbstractReactionHandler] = HandlerRegistry(
+    [
+        RegisteredHandler("eyes_reaction", EyesReactionHandler()),
+        RegisteredHandler("ban_reaction", BanReactionHandler()),
+        RegisteredHandler("generic_gif_reaction", GenericGifReactionHandler()),
+        RegisteredHandler("kekw_reaction", KekwReactionHandler()),
+        RegisteredHandler("shrek_reaction", ShrekReactionHandler()),
+    ]
+)
+
+DM_HANDLERS: HandlerRegistry[AbstractHandler] = HandlerRegistry(
+    [
+        # NOTE: Explicitly run the LogMessageHandler first
+        RegisteredHandler(
+            "log_message",
+            LogMessageHandler(source=LogMessageHandlerSource.DM),
+            required=True,
+        ),
+        RegisteredHandler("command", _command_handler, required=True),
+    ]
+)
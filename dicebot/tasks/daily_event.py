@@ -2,75 +2,112 @@
 
 import asyncio
 import datetime
+import logging
 import random
+from typing import Iterable
 
 import discord
 import pytz
 
-from dicebot.app import app_sessionmaker, celery_app
-
-# NOTE: Client is imported here (not lazy) so tests can patch it easily.
-# The circular-import risk is acceptable since tasks are only imported by workers.
-from dicebot.core.client import Client
+from dicebot.app import app_sessionmaker
+from dicebot.core.event_cache import event_cache
 from dicebot.data.db.active_event import ActiveEvent, EventType
 from dicebot.data.db.guild import Guild
+from dicebot.tasks.runtime import async_task
+from dicebot.tasks.worker_client import worker_client
 
+# Daily events start at this hour in each guild's own timezone
+EVENT_START_HOUR = 5
+# How many announcements go out at once
+MAX_CONCURRENT_ANNOUNCEMENTS = 8
 
-@celery_app.task(ignore_result=True)
-def check_daily_event() -> None:
-    loop = asyncio.get_event_loop()
-    loop.run_until_complete(check_daily_event_async())
 
+@async_task(ignore_result=True)
+async def check_daily_event() -> None:
+    await check_daily_event_async()
 
-async def check_daily_event_async() -> None:
-    client = await Client.get_and_login()
 
-    async with app_sessionmaker() as session:
-        guilds = await Guild.get_all(session)
-        for guild in guilds:
-            if guild.events_probability is None:
-                continue
-            if guild.events_channel_id is None:
-                continue
+def timezones_at_hour(
+    timezones: Iterable[str], hour: int, now: datetime.datetime
+) -> list[str]:
+    """The timezones among `timezones` where it's currently `hour` o'clock.
+    `now` is an aware datetime."""
+    res = []
+    for tz_name in timezones:
+        try:
+            tz = pytz.timezone(tz_name)
+        except pytz.UnknownTimeZoneError:
+            logging.warning(f"Skipping daily events for unknown timezone {tz_name}")
+            continue
+        if now.astimezone(tz).hour == hour:
+            res.append(tz_name)
+    return res
 
-            # Check if it's 5am in this guild's timezone
-            tz = pytz.timezone(guild.timezone)
-            local_now = datetime.datetime.now(tz)
-            if local_now.hour != 5:
-                continue
 
-            # Idempotent: skip if an event already fired today
-            existing = await ActiveEvent.get_current(session, guild.id)
-            if existing is not None:
-                continue
+async def check_daily_event_async() -> None:
+    client = await worker_client.get()
 
-            # Roll the dice
+    async with app_sessionmaker() as session:
+        # Work out which timezones just hit 5am once, rather than per guild
+        timezones = timezones_at_hour(
+            await Guild.get_event_timezones(session),
+            EVENT_START_HOUR,
+            datetime.datetime.now(datetime.timezone.utc),
+        )
+        guilds = await Guild.get_all_for_events(
+            session, timezones, datetime.datetime.now()
+        )
+
+        # Roll the dice
+        event_types = {}
+        channel_ids = {}
+        for guild in guilds:
+            assert guild.events_probability is not None
+            assert guild.events_channel_id is not None
             if random.random() > guild.events_probability:
                 continue
-
-            # Pick a random event and create it
-            event_type = random.choice(list(EventType))
-            now = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
-            active_event = ActiveEvent(
-                guild_id=guild.id,
-                event_type=event_type.value,
-                started_at=now,
-                expires_at=now + datetime.timedelta(hours=24),
-            )
-            session.add(active_event)
-            await session.commit()
-
-            # Announce it
-            channel = await client.fetch_channel(guild.events_channel_id)
-            if isinstance(channel, discord.TextChannel):
-                title, description = _event_announcement(event_type)
-                embed = discord.Embed(
-                    title=f"🎲 Today's Event: {title}",
-                    description=description,
-                    color=discord.Color.gold(),
-                )
-                embed.set_footer(text="This event lasts 24 hours.")
-                await channel.send(embed=embed)
+            # Pick a random event for this guild
+            event_types[guild.id] = random.choice(list(EventType))
+            channel_ids[guild.id] = guild.events_channel_id
+
+        if len(event_types) == 0:
+            return
+
+        now = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+        await ActiveEvent.start_many(
+            session, event_types, now, now + datetime.timedelta(hours=24)
+        )
+        await session.commit()
+
+    # The bot has these guilds cached as having no event
+    await event_cache.publish_started(event_types.keys())
+
+    # Announce them
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_ANNOUNCEMENTS)
+
+    async def announce(guild_id: int) -> None:
+        async with semaphore:
+            try:
+                await _announce(client, channel_ids[guild_id], event_types[guild_id])
+            except Exception:
+                logging.exception(f"Failed to announce daily event in {guild_id=}")
+
+    await asyncio.gather(*(announce(guild_id) for guild_id in event_types))
+
+
+async def _announce(
+    client: discord.Client, channel_id: int, event_type: EventType
+) -> None:
+    channel = await client.fetch_channel(channel_id)
+    if isinstance(channel, discord.TextChannel):
+        title, description = _event_announcement(event_type)
+        embed = discord.Embed(
+            title=f"🎲 Today's Event: {title}",
+            description=description,
+            color=discord.Color.gold(),
+        )
+        embed.set_footer(text="This event lasts 24 hours.")
+        await channel.send(embed=embed)
 
 
 def _event_announcement(event_type: EventType) -> tuple[str, str]:
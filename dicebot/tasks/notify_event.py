@@ -1,23 +1,21 @@
 #!/usr/bin/env python3
 
-import asyncio
-
 import discord
 
-from dicebot.app import app_sessionmaker, celery_app
+from dicebot.app import app_sessionmaker
+from dicebot.tasks.runtime import async_task
+from dicebot.tasks.worker_client import worker_client
 
 
-@celery_app.task(ignore_result=True)
-def notify_event(event_id: int, channel_id: int) -> None:
-    # NOTE: unban.py and remind.py still use get_event_loop() — pre-existing debt
-    asyncio.run(_notify_event_async(event_id, channel_id))
+@async_task(ignore_result=True)
+async def notify_event(event_id: int, channel_id: int) -> None:
+    await _notify_event_async(event_id, channel_id)
 
 
 async def _notify_event_async(event_id: int, channel_id: int) -> None:
-    from dicebot.core.client import Client
     from dicebot.data.db.scheduled_event import ScheduledEvent, ScheduledEventSignup
 
-    client = await Client.get_and_login()
+    client = await worker_client.get()
     channel = await client.fetch_channel(channel_id)
     if not isinstance(channel, discord.TextChannel):
         return
@@ -1,24 +1,18 @@
 #!/usr/bin/env python3
 
-import asyncio
-
 import discord
 
-from dicebot.app import celery_app
+from dicebot.tasks.runtime import async_task
+from dicebot.tasks.worker_client import worker_client
 
 
-@celery_app.task(ignore_result=True)
-def send_reminder(channel_id: int, author_id: int, reminder: str) -> None:
-    loop = asyncio.get_event_loop()
-    loop.run_until_complete(send_reminder_async(channel_id, author_id, reminder))
+@async_task(ignore_result=True)
+async def send_reminder(channel_id: int, author_id: int, reminder: str) -> None:
+    await send_reminder_async(channel_id, author_id, reminder)
 
 
 async def send_reminder_async(channel_id: int, author_id: int, reminder: str) -> None:
-    # To avoid circular imports, we put this import here
-    # Unfortunately how the tasks are setup, we can't import Client at the top level
-    from dicebot.core.client import Client
-
-    client = await Client.get_and_login()
+    client = await worker_client.get()
 
     channel = await client.fetch_channel(channel_id)
     assert isinstance(channel, discord.TextChannel)
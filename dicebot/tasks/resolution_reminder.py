@@ -1,25 +1,49 @@
 #!/usr/bin/env python3
 
-import asyncio
+import datetime
+import logging
 
 import discord
 
-from dicebot.app import app_sessionmaker, celery_app
+from dicebot.app import app_sessionmaker
 from dicebot.data.db.resolution import Resolution
+from dicebot.tasks.runtime import async_task
+from dicebot.tasks.worker_client import worker_client
 
 
-@celery_app.task(ignore_result=True)
-def remind(resolution_id: int) -> None:
-    loop = asyncio.get_event_loop()
-    loop.run_until_complete(remind_async(resolution_id))
+@async_task(ignore_result=True)
+async def send_due_reminders() -> None:
+    await send_due_reminders_async()
 
 
-async def remind_async(resolution_id: int) -> None:
-    # To avoid circular imports, we put this import here
-    # Unfortunately how the tasks are setup, we can't import Client at the top level
-    from dicebot.core.client import Client
+async def send_due_reminders_async() -> None:
+    client = await worker_client.get()
+    now = datetime.datetime.now()
+
+    async with app_sessionmaker() as session:
+        resolutions = await Resolution.get_due(session, now)
+        for resolution in resolutions:
+            # Move on to the next reminder before sending this one, so a
+            # failure can't get the same reminder sent over and over. If
+            # another run of this task got there first, it's sending it.
+            if not await resolution.claim_reminder(session, now):
+                continue
+            await session.commit()
+            try:
+                await _send_reminder(client, resolution)
+            except Exception:
+                logging.exception(f"Failed to send reminder for {resolution.id=}")
+
+
+# Resolutions made before reminders were scheduled from the resolution table
+# still have a year of these queued up
+@async_task(ignore_result=True)
+async def remind(resolution_id: int) -> None:
+    await remind_async(resolution_id)
 
-    client = await Client.get_and_login()
+
+async def remind_async(resolution_id: int) -> None:
+    client = await worker_client.get()
 
     async with app_sessionmaker() as session:
         resolution = await Resolution.get_or_none(session, resolution_id)
@@ -27,6 +51,10 @@ async def remind_async(resolution_id: int) -> None:
     if resolution is None or not resolution.active:
         return
 
+    await _send_reminder(client, resolution)
+
+
+async def _send_reminder(client: discord.Client, resolution: Resolution) -> None:
     channel = await client.fetch_channel(resolution.channel_id)
     if not (
         isinstance(channel, discord.TextChannel)
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+from celery.signals import (
+    worker_process_init,
+    worker_process_shutdown,
+    worker_shutdown,
+)
+
+from dicebot.app import celery_app, engine
+from dicebot.core.http_client import http_client
+from dicebot.tasks.worker_client import worker_client
+
+T = TypeVar("T")
+
+
+class WorkerRuntime:
+    """The one event loop a worker process runs all of its async tasks on.
+
+    Everything async that outlives a task -- the engine's connection pool,
+    the shared aiohttp session, the logged-in Discord client -- is bound to
+    the loop it was first used on. Running every task on the same loop is
+    what lets them be reused instead of reconnected each time."""
+
+    def __init__(self) -> None:
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        if self._loop is None or self._loop.is_closed():
+            self._loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self._loop)
+        return self._loop
+
+    def start(self) -> None:
+        self.loop
+
+    def run(self, coro: Awaitable[T]) -> T:
+        return self.loop.run_until_complete(coro)
+
+    def shutdown(self) -> None:
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        try:
+            loop.run_until_complete(self._close_resources())
+            loop.run_until_complete(loop.shutdown_asyncgens())
+        finally:
+            loop.close()
+            asyncio.set_event_loop(None)
+            self._loop = None
+
+    async def _close_resources(self) -> None:
+        for close in (worker_client.close, http_client.close, engine.dispose):
+            try:
+                await close()
+            except Exception:
+                logging.exception(f"Failed to clean up {close} on shutdown")
+
+
+worker_runtime = WorkerRuntime()
+
+
+def async_task(
+    *task_args: Any, **task_kwargs: Any
+) -> Callable[[Callable[..., Awaitable[T]]], Any]:
+    """Like celery_app.task, but for coroutine functions: the task runs on
+    the worker's long-lived loop rather than one made just for it"""
+
+    def decorator(f: Callable[..., Awaitable[T]]) -> Any:
+        @functools.wraps(f)
+        def run(*args: Any, **kwargs: Any) -> T:
+            return worker_runtime.run(f(*args, **kwargs))
+
+        return celery_app.task(*task_args, **task_kwargs)(run)
+
+    return decorator
+
+
+@worker_process_init.connect
+def _start_runtime(**kwargs: Any) -> None:
+    # Connections in the pool were inherited from the parent process on fork,
+    # so leave them for the parent and start a fresh pool for this process
+    engine.sync_engine.dispose(close=False)
+    worker_runtime.start()
+
+
+# prefork children get worker_process_shutdown; solo/threads pools only get
+# worker_shutdown. Shutting down twice is harmless.
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def _shutdown_runtime(**kwargs: Any) -> None:
+    worker_runtime.shutdown()
@@ -7,7 +7,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import discord
 
 from dicebot.data.db.active_event import EventType
-from dicebot.tasks.daily_event import check_daily_event_async
+from dicebot.tasks.daily_event import check_daily_event_async, timezones_at_hour
 from dicebot.test.utils import DicebotTestCase
 
 
@@ -27,160 +27,115 @@ def _make_guild_mock(events_probability=0.25, events_channel_id=12345, timezone=
     return mock_guild
 
 
-class TestCheckDailyEventSkips(DicebotTestCase):
-    @patch("dicebot.tasks.daily_event.Guild.get_all", new_callable=AsyncMock)
-    @patch("dicebot.tasks.daily_event.Client.get_and_login", new_callable=AsyncMock)
-    async def test_skips_guild_with_no_probability(self, mock_login, mock_get_all):
-        """Guild with events_probability=None is skipped, no event created."""
-        mock_client = AsyncMock()
-        mock_login.return_value = mock_client
-
-        mock_guild = _make_guild_mock(events_probability=None)
-        mock_get_all.return_value = [mock_guild]
-
+class TestTimezonesAtHour(unittest.TestCase):
+    def test_timezones_at_hour(self) -> None:
+        # 12:00 UTC is 5am in Los Angeles during daylight saving time
+        now = datetime.datetime(2026, 4, 16, 12, 0, tzinfo=datetime.timezone.utc)
+        self.assertEqual(
+            ["US/Pacific", "America/Los_Angeles"],
+            timezones_at_hour(
+                ["US/Pacific", "America/Los_Angeles", "Europe/London", "Not/AZone"],
+                5,
+                now,
+            ),
+        )
+        # ...and 4am once it's over
+        winter = datetime.datetime(2026, 12, 16, 12, 0, tzinfo=datetime.timezone.utc)
+        self.assertEqual([], timezones_at_hour(["US/Pacific"], 5, winter))
+
+
+@patch("dicebot.tasks.daily_event.event_cache.publish_started", new_callable=AsyncMock)
+@patch("dicebot.tasks.daily_event.ActiveEvent.start_many", new_callable=AsyncMock)
+@patch("dicebot.tasks.daily_event.Guild.get_all_for_events", new_callable=AsyncMock)
+@patch("dicebot.tasks.daily_event.Guild.get_event_timezones", new_callable=AsyncMock)
+@patch("dicebot.tasks.daily_event.worker_client.get", new_callable=AsyncMock)
+class TestCheckDailyEvent(DicebotTestCase):
+    async def _run(self) -> AsyncMock:
         with patch("dicebot.tasks.daily_event.app_sessionmaker") as mock_sm:
             mock_session = _make_session_mock()
             mock_sm.return_value = mock_session
             await check_daily_event_async()
+        return mock_session
 
-        mock_session.add.assert_not_called()
-        mock_session.commit.assert_not_awaited()
-
-    @patch("dicebot.tasks.daily_event.Guild.get_all", new_callable=AsyncMock)
-    @patch("dicebot.tasks.daily_event.Client.get_and_login", new_callable=AsyncMock)
-    async def test_skips_guild_with_no_channel(self, mock_login, mock_get_all):
-        """Guild with events_channel_id=None is skipped, no event created."""
-        mock_client = AsyncMock()
-        mock_login.return_value = mock_client
-
-        mock_guild = _make_guild_mock(events_probability=0.5, events_channel_id=None)
-        mock_get_all.return_value = [mock_guild]
-
-        with patch("dicebot.tasks.daily_event.app_sessionmaker") as mock_sm:
-            mock_session = _make_session_mock()
-            mock_sm.return_value = mock_session
-            await check_daily_event_async()
-
-        mock_session.add.assert_not_called()
-        mock_session.commit.assert_not_awaited()
-
-    @patch("dicebot.tasks.daily_event.Guild.get_all", new_callable=AsyncMock)
-    @patch("dicebot.tasks.daily_event.Client.get_and_login", new_callable=AsyncMock)
-    async def test_skips_wrong_hour(self, mock_login, mock_get_all):
-        """When the local time is not 5am, no event is created."""
-        mock_client = AsyncMock()
-        mock_login.return_value = mock_client
-
-        mock_guild = _make_guild_mock()
-        mock_get_all.return_value = [mock_guild]
-
-        with patch("dicebot.tasks.daily_event.datetime") as mock_dt:
-            mock_now = MagicMock()
-            mock_now.hour = 12  # not 5am
-            mock_dt.datetime.now.return_value = mock_now
-            mock_dt.timedelta = datetime.timedelta
-
-            with patch("dicebot.tasks.daily_event.app_sessionmaker") as mock_sm:
-                mock_session = _make_session_mock()
-                mock_sm.return_value = mock_session
-                await check_daily_event_async()
-
-        mock_session.add.assert_not_called()
-        mock_session.commit.assert_not_awaited()
-
-    @patch("dicebot.tasks.daily_event.ActiveEvent.get_current", new_callable=AsyncMock)
-    @patch("dicebot.tasks.daily_event.Guild.get_all", new_callable=AsyncMock)
-    @patch("dicebot.tasks.daily_event.Client.get_and_login", new_callable=AsyncMock)
-    async def test_skips_if_event_already_exists(self, mock_login, mock_get_all, mock_get_current):
-        """If an active event already exists for the guild today, no new event is created."""
-        mock_client = AsyncMock()
-        mock_login.return_value = mock_client
-
-        mock_guild = _make_guild_mock()
-        mock_get_all.return_value = [mock_guild]
-        mock_get_current.return_value = MagicMock()  # existing event
-
-        with patch("dicebot.tasks.daily_event.datetime") as mock_dt:
-            mock_now = MagicMock()
-            mock_now.hour = 5
-            mock_dt.datetime.now.return_value = mock_now
-            mock_dt.timedelta = datetime.timedelta
+    async def test_skips_when_no_guilds_are_due(self, mock_login, mock_get_timezones, mock_get_guilds, mock_start_many, mock_publish):
+        """When no guild's timezone is at 5am (or they all have events going), no event is created."""
+        mock_get_timezones.return_value = ["US/Pacific"]
+        mock_get_guilds.return_value = []
 
-            with patch("dicebot.tasks.daily_event.app_sessionmaker") as mock_sm:
-                mock_session = _make_session_mock()
-                mock_sm.return_value = mock_session
-                await check_daily_event_async()
+        with patch("dicebot.tasks.daily_event.timezones_at_hour", return_value=[]):
+            mock_session = await self._run()
 
-        mock_session.add.assert_not_called()
+        mock_get_guilds.assert_awaited_once()
+        self.assertEqual([], mock_get_guilds.await_args.args[1])
+        mock_start_many.assert_not_awaited()
         mock_session.commit.assert_not_awaited()
+        mock_publish.assert_not_awaited()
 
     @patch("dicebot.tasks.daily_event.random")
-    @patch("dicebot.tasks.daily_event.ActiveEvent.get_current", new_callable=AsyncMock)
-    @patch("dicebot.tasks.daily_event.Guild.get_all", new_callable=AsyncMock)
-    @patch("dicebot.tasks.daily_event.Client.get_and_login", new_callable=AsyncMock)
-    async def test_skips_on_failed_roll(self, mock_login, mock_get_all, mock_get_current, mock_random):
+    async def test_skips_on_failed_roll(self, mock_random, mock_login, mock_get_timezones, mock_get_guilds, mock_start_many, mock_publish):
         """When random roll exceeds guild probability, no event is created."""
-        mock_client = AsyncMock()
-        mock_login.return_value = mock_client
-
-        mock_guild = _make_guild_mock(events_probability=0.25)
-        mock_get_all.return_value = [mock_guild]
-        mock_get_current.return_value = None  # no existing event
+        mock_get_guilds.return_value = [_make_guild_mock(events_probability=0.25)]
         mock_random.random.return_value = 0.99  # 0.99 > 0.25, so roll fails
 
-        with patch("dicebot.tasks.daily_event.datetime") as mock_dt:
-            mock_now = MagicMock()
-            mock_now.hour = 5
-            mock_dt.datetime.now.return_value = mock_now
-            mock_dt.timedelta = datetime.timedelta
+        mock_session = await self._run()
 
-            with patch("dicebot.tasks.daily_event.app_sessionmaker") as mock_sm:
-                mock_session = _make_session_mock()
-                mock_sm.return_value = mock_session
-                await check_daily_event_async()
-
-        mock_session.add.assert_not_called()
+        mock_start_many.assert_not_awaited()
         mock_session.commit.assert_not_awaited()
+        mock_publish.assert_not_awaited()
 
-
-class TestCheckDailyEventCreates(DicebotTestCase):
     @patch("dicebot.tasks.daily_event.random")
-    @patch("dicebot.tasks.daily_event.ActiveEvent.get_current", new_callable=AsyncMock)
-    @patch("dicebot.tasks.daily_event.Guild.get_all", new_callable=AsyncMock)
-    @patch("dicebot.tasks.daily_event.Client.get_and_login", new_callable=AsyncMock)
-    async def test_creates_event_and_announces(self, mock_login, mock_get_all, mock_get_current, mock_random):
-        """When all conditions pass, an ActiveEvent is created and channel.send is called."""
+    async def test_creates_events_and_announces(self, mock_random, mock_login, mock_get_timezones, mock_get_guilds, mock_start_many, mock_publish):
+        """Every guild that passes its roll gets an event from one bulk insert, and an announcement."""
         mock_client = AsyncMock()
         mock_login.return_value = mock_client
-
         mock_channel = AsyncMock(spec=discord.TextChannel)
         mock_client.fetch_channel = AsyncMock(return_value=mock_channel)
 
-        mock_guild = _make_guild_mock(events_probability=0.25, events_channel_id=12345)
-        mock_get_all.return_value = [mock_guild]
-        mock_get_current.return_value = None  # no existing event
-        mock_random.random.return_value = 0.1  # 0.1 < 0.25 → fires
+        mock_get_guilds.return_value = [
+            _make_guild_mock(events_probability=0.25, events_channel_id=12345, guild_id=1),
+            _make_guild_mock(events_probability=0.5, events_channel_id=67890, guild_id=2),
+            _make_guild_mock(events_probability=0.05, events_channel_id=11111, guild_id=3),
+        ]
+        mock_random.random.return_value = 0.1  # fires for the first two guilds only
         mock_random.choice.return_value = EventType.DOUBLE_BAN
 
-        with patch("dicebot.tasks.daily_event.datetime") as mock_dt:
-            mock_now = MagicMock()
-            mock_now.hour = 5
-            mock_dt.datetime.now.return_value = mock_now
-            mock_dt.datetime.utcnow.return_value = datetime.datetime(2026, 4, 16, 13, 0, 0)
-            mock_dt.timedelta = datetime.timedelta
+        mock_session = await self._run()
 
-            with patch("dicebot.tasks.daily_event.app_sessionmaker") as mock_sm:
-                mock_session = _make_session_mock()
-                mock_sm.return_value = mock_session
-                await check_daily_event_async()
-
-        mock_session.add.assert_called_once()
+        mock_start_many.assert_awaited_once()
+        event_types = mock_start_many.await_args.args[1]
+        self.assertEqual({1: EventType.DOUBLE_BAN, 2: EventType.DOUBLE_BAN}, event_types)
         mock_session.commit.assert_awaited_once()
-        mock_channel.send.assert_awaited_once()
+        # ...and the bot is told to stop caching "no event" for them
+        self.assertEqual([1, 2], list(mock_publish.await_args.args[0]))
+        self.assertEqual(
+            {12345, 67890},
+            {c.args[0] for c in mock_client.fetch_channel.await_args_list},
+        )
+        self.assertEqual(2, mock_channel.send.await_count)
         # Verify an embed was passed
         call_kwargs = mock_channel.send.call_args[1]
         self.assertIn("embed", call_kwargs)
 
+    @patch("dicebot.tasks.daily_event.random")
+    async def test_one_failed_announcement_does_not_stop_the_rest(self, mock_random, mock_login, mock_get_timezones, mock_get_guilds, mock_start_many, mock_publish):
+        mock_client = AsyncMock()
+        mock_login.return_value = mock_client
+        mock_channel = AsyncMock(spec=discord.TextChannel)
+        mock_client.fetch_channel = AsyncMock(
+            side_effect=[discord.DiscordException("gone"), mock_channel]
+        )
+
+        mock_get_guilds.return_value = [
+            _make_guild_mock(events_channel_id=12345, guild_id=1),
+            _make_guild_mock(events_channel_id=67890, guild_id=2),
+        ]
+        mock_random.random.return_value = 0.1
+        mock_random.choice.return_value = EventType.TURBO_DAY
+
+        await self._run()
+
+        mock_channel.send.assert_awaited_once()
+
 
 if __name__ == "__main__":
     unittest.main()
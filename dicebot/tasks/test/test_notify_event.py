@@ -15,6 +15,8 @@ class TestNotifyEvent(DicebotTestCase):
     @patch("dicebot.tasks.notify_event.app_sessionmaker")
     async def test_notify_no_signups(self, mock_sm, mock_signups, mock_get_event, mock_login):
         mock_client = AsyncMock()
+        # The worker keeps this client around and checks it synchronously
+        mock_client.is_closed = MagicMock(return_value=False)
         mock_login.return_value = mock_client
         mock_channel = AsyncMock(spec=discord.TextChannel)
         mock_client.fetch_channel = AsyncMock(return_value=mock_channel)
@@ -38,6 +40,8 @@ class TestNotifyEvent(DicebotTestCase):
     @patch("dicebot.tasks.notify_event.app_sessionmaker")
     async def test_notify_with_signups(self, mock_sm, mock_signups, mock_get_event, mock_login):
         mock_client = AsyncMock()
+        # The worker keeps this client around and checks it synchronously
+        mock_client.is_closed = MagicMock(return_value=False)
         mock_login.return_value = mock_client
         mock_channel = AsyncMock(spec=discord.TextChannel)
         mock_client.fetch_channel = AsyncMock(return_value=mock_channel)
@@ -62,6 +66,8 @@ class TestNotifyEvent(DicebotTestCase):
     @patch("dicebot.tasks.notify_event.app_sessionmaker")
     async def test_notify_cancelled_event(self, mock_sm, mock_get_event, mock_login):
         mock_client = AsyncMock()
+        # The worker keeps this client around and checks it synchronously
+        mock_client.is_closed = MagicMock(return_value=False)
         mock_login.return_value = mock_client
         mock_channel = AsyncMock(spec=discord.TextChannel)
         mock_client.fetch_channel = AsyncMock(return_value=mock_channel)
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+
+import asyncio
+import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import discord
+
+from dicebot.data.db.resolution import Resolution
+from dicebot.tasks.resolution_reminder import send_due_reminders_async
+from dicebot.test.utils import DatabaseTestCase
+
+
+class TestSendDueReminders(DatabaseTestCase):
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+        self.start = datetime.datetime.now() - datetime.timedelta(days=1, minutes=5)
+        async with self.sessionmaker() as session:
+            resolution = Resolution.new(
+                guild_id=1,
+                author_id=2,
+                channel_id=3,
+                msg="Run",
+                frequency="daily",
+                now=self.start,
+            )
+            session.add(resolution)
+            await session.commit()
+            self.resolution_id = resolution.id
+
+        self.mock_channel = MagicMock(spec=discord.TextChannel)
+        self.mock_channel.send = AsyncMock()
+        self.mock_client = AsyncMock()
+        self.mock_client.fetch_channel.return_value = self.mock_channel
+        for patcher in [
+            patch(
+                "dicebot.tasks.resolution_reminder.worker_client.get",
+                new=AsyncMock(return_value=self.mock_client),
+            ),
+            patch(
+                "dicebot.tasks.resolution_reminder.app_sessionmaker",
+                new=self.sessionmaker,
+            ),
+        ]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    async def test_sends_and_advances(self) -> None:
+        await send_due_reminders_async()
+
+        self.mock_client.fetch_channel.assert_awaited_once_with(3)
+        self.mock_channel.send.assert_awaited_once()
+        self.assertIn("<@2>", self.mock_channel.send.await_args.args[0])
+        # Tomorrow's reminder is next
+        async with self.sessionmaker() as session:
+            resolution = await Resolution.get_or_none(session, self.resolution_id)
+            assert resolution is not None
+            tomorrow = self.start + datetime.timedelta(days=2)
+            self.assertEqual(tomorrow, resolution.next_reminder_at)
+
+    async def test_overlapping_runs_send_once(self) -> None:
+        # A slow run is still going when the next one starts
+        await asyncio.gather(send_due_reminders_async(), send_due_reminders_async())
+        self.mock_channel.send.assert_awaited_once()
+
+    async def test_nothing_due(self) -> None:
+        async with self.sessionmaker() as session:
+            resolution = await Resolution.get_or_none(session, self.resolution_id)
+            assert resolution is not None
+            resolution.active = False
+            await session.commit()
+
+        await send_due_reminders_async()
+        self.mock_client.fetch_channel.assert_not_awaited()
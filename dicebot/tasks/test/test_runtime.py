@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, patch
+
+from dicebot.tasks.runtime import async_task, worker_runtime
+
+
+@async_task(name="dicebot.tasks.test.test_runtime.get_loop")
+async def get_loop() -> asyncio.AbstractEventLoop:
+    return asyncio.get_running_loop()
+
+
+class TestWorkerRuntime(unittest.TestCase):
+    def tearDown(self) -> None:
+        worker_runtime.shutdown()
+
+    def test_tasks_share_one_loop(self) -> None:
+        first = get_loop()
+        second = get_loop.apply().get()
+        self.assertIs(first, second)
+        self.assertIs(worker_runtime.loop, first)
+        self.assertFalse(first.is_closed())
+
+    def test_shutdown_closes_resources(self) -> None:
+        loop = get_loop()
+        with patch(
+            "dicebot.tasks.runtime.worker_client.close", new=AsyncMock()
+        ) as mock_client_close, patch(
+            "dicebot.tasks.runtime.http_client.close", new=AsyncMock()
+        ) as mock_http_close, patch(
+            "dicebot.tasks.runtime.engine"
+        ) as mock_engine:
+            mock_engine.dispose = AsyncMock(side_effect=RuntimeError)
+            # One failing cleanup doesn't stop the others
+            worker_runtime.shutdown()
+        mock_client_close.assert_awaited_once()
+        mock_http_close.assert_awaited_once()
+        mock_engine.dispose.assert_awaited_once()
+        self.assertTrue(loop.is_closed())
+
+        # Shutting down again is a no-op, and the next task gets a new loop
+        worker_runtime.shutdown()
+        self.assertIsNot(loop, get_loop())
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+
+import asyncio
+import datetime
+from unittest.mock import AsyncMock, MagicMock
+
+import discord
+
+from dicebot.data.db.ban import Ban
+from dicebot.data.db.guild import Guild
+from dicebot.data.db.user import User
+from dicebot.tasks.unban import send_unban
+from dicebot.test.utils import DatabaseTestCase
+
+CHANNEL_ID = 10
+GUILD_ID = 1
+OWNER_ID = 101
+USER_ID = 102
+
+
+class TestSendUnban(DatabaseTestCase):
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+        async with self.sessionmaker() as session:
+            await Guild.get_or_create(session, GUILD_ID, OWNER_ID, False)
+            await User.get_or_create(session, USER_ID)
+            ban = Ban(
+                guild_id=GUILD_ID,
+                bannee_id=USER_ID,
+                banner_id=OWNER_ID,
+                reason="test",
+                banned_until=datetime.datetime.now() - datetime.timedelta(seconds=1),
+                channel_id=CHANNEL_ID,
+            )
+            session.add(ban)
+            await session.commit()
+            self.ban_id = ban.id
+
+        self.channel = MagicMock(spec=discord.TextChannel)
+        self.channel.send = AsyncMock()
+        self.client = AsyncMock()
+        self.client.fetch_channel.return_value = self.channel
+
+    async def _send_unban(self) -> None:
+        async with self.sessionmaker() as session:
+            await send_unban(
+                self.client, session, CHANNEL_ID, GUILD_ID, USER_ID, self.ban_id
+            )
+
+    async def test_sends_once(self) -> None:
+        # The scheduler and Celery both get to a long ban
+        await asyncio.gather(self._send_unban(), self._send_unban())
+        self.channel.send.assert_awaited_once()
+        async with self.sessionmaker() as session:
+            ban = await session.get(Ban, self.ban_id)
+            assert ban is not None
+            self.assertTrue(ban.acknowledged)
+
+        # ...or one of them comes along later
+        await self._send_unban()
+        self.channel.send.assert_awaited_once()
+
+    async def test_acknowledge(self) -> None:
+        async with self.sessionmaker() as session:
+            self.assertTrue(await Ban.acknowledge(session, self.ban_id))
+            self.assertFalse(await Ban.acknowledge(session, self.ban_id))
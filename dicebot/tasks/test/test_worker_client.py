@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from dicebot.tasks.worker_client import WorkerClient
+
+
+def _mock_client() -> MagicMock:
+    client = MagicMock()
+    client.is_closed.return_value = False
+    client.close = AsyncMock()
+    return client
+
+
+class TestWorkerClient(unittest.TestCase):
+    def test_logs_in_once_per_loop(self) -> None:
+        worker_client = WorkerClient()
+        first, second = _mock_client(), _mock_client()
+        loop = asyncio.new_event_loop()
+        with patch(
+            "dicebot.core.client.Client.get_and_login",
+            new=AsyncMock(side_effect=[first, second]),
+        ) as mock_login:
+
+            async def many_tasks():
+                return await asyncio.gather(*(worker_client.get() for _ in range(5)))
+
+            # Concurrent and sequential tasks on the same loop share one login
+            self.assertEqual([first] * 5, loop.run_until_complete(many_tasks()))
+            self.assertIs(first, loop.run_until_complete(worker_client.get()))
+            mock_login.assert_awaited_once()
+
+            # A different loop can't use a client bound to the first one
+            other_loop = asyncio.new_event_loop()
+            self.assertIs(second, other_loop.run_until_complete(worker_client.get()))
+            self.assertEqual(2, mock_login.await_count)
+
+            other_loop.run_until_complete(worker_client.close())
+            second.close.assert_awaited_once()
+            other_loop.close()
+        loop.close()
+
+    def test_relogin_after_close(self) -> None:
+        worker_client = WorkerClient()
+        first, second = _mock_client(), _mock_client()
+        loop = asyncio.new_event_loop()
+        with patch(
+            "dicebot.core.client.Client.get_and_login",
+            new=AsyncMock(side_effect=[first, second]),
+        ):
+            self.assertIs(first, loop.run_until_complete(worker_client.get()))
+            first.is_closed.return_value = True
+            self.assertIs(second, loop.run_until_complete(worker_client.get()))
+        loop.close()
+
+    def test_close_without_client(self) -> None:
+        # Shutting down a worker that never ran a task is fine
+        asyncio.run(WorkerClient().close())
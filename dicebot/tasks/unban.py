@@ -1,56 +1,64 @@
 #!/usr/bin/env python3
 
-import asyncio
 import datetime
 from typing import Optional
 
 import discord
+from sqlalchemy.ext.asyncio import AsyncSession
 
 # TODO: Put this initialization in a common folder
-from dicebot.app import app_sessionmaker, celery_app
+from dicebot.app import app_sessionmaker
 from dicebot.data.db.ban import Ban
 from dicebot.data.db.guild import Guild
 from dicebot.data.db.user import User
+from dicebot.tasks.runtime import async_task
+from dicebot.tasks.worker_client import worker_client
 
 
-@celery_app.task(ignore_result=True)
-def unban(
+@async_task(ignore_result=True)
+async def unban(
     channel_id: int, guild_id: int, target_id: int, ban_id: Optional[int] = None
 ) -> None:
-    loop = asyncio.get_event_loop()
-    loop.run_until_complete(unban_async(channel_id, guild_id, target_id, ban_id))
+    await unban_async(channel_id, guild_id, target_id, ban_id)
 
 
 async def unban_async(
     channel_id: int, guild_id: int, target_id: int, ban_id: Optional[int] = None
 ) -> None:
-    # To avoid circular imports, we put this import here
-    # Unfortunately how the tasks are setup, we can't import Client at the top level
-    from dicebot.core.client import Client
+    client = await worker_client.get()
+    async with app_sessionmaker() as session:
+        await send_unban(client, session, channel_id, guild_id, target_id, ban_id)
 
-    client = await Client.get_and_login()
 
+async def send_unban(
+    client: discord.Client,
+    session: AsyncSession,
+    channel_id: int,
+    guild_id: int,
+    target_id: int,
+    ban_id: Optional[int] = None,
+) -> None:
+    """Tell the target their ban is over, if it really is. Shared by the
+    Celery task and the bot's own unban scheduler."""
     channel = await client.fetch_channel(channel_id)
     assert isinstance(channel, discord.TextChannel)
 
-    async with app_sessionmaker() as session:
-        guild = await Guild.get_or_none(session, guild_id)
-        target = await User.get_or_none(session, target_id)
+    guild = await Guild.get_or_none(session, guild_id)
+    target = await User.get_or_none(session, target_id)
 
-        if guild is None or target is None:
-            return
+    if guild is None or target is None:
+        return
 
-        current_ban = await Ban.get_latest_unvoided_ban(session, guild, target)
+    current_ban = await Ban.get_latest_unvoided_ban(session, guild, target)
 
-        if (
-            current_ban is not None
-            and current_ban.banned_until < datetime.datetime.now()
-        ):
-            # If ban_id is provided, check that the latest ban *is* this ban
-            if ban_id is not None and current_ban.id != ban_id:
-                return
+    if current_ban is not None and current_ban.banned_until < datetime.datetime.now():
+        # If ban_id is provided, check that the latest ban *is* this ban
+        if ban_id is not None and current_ban.id != ban_id:
+            return
 
-            await channel.send(f"<@{target_id}>: You have been unbanned.", silent=True)
-            # Remember to set this ban as now being acknowledged!
-            current_ban.acknowledged = True
-            await session.commit()
+        # A long ban goes to both the scheduler's rescan and Celery, so claim
+        # it before sending and let whoever loses stay quiet
+        if not await Ban.acknowledge(session, current_ban.id):
+            return
+        await session.commit()
+        await channel.send(f"<@{target_id}>: You have been unbanned.", silent=True)
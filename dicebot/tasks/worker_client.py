@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from dicebot.core.client import Client
+
+
+class WorkerClient:
+    """One logged-in Discord client per worker process, shared by every task
+    it runs. Tasks only ever need the REST API (fetch a channel, send a
+    message), so the client logs in but never connects to the gateway.
+
+    Like any discord.py client it's bound to the loop it logged in on, so
+    it's only reused while tasks keep running on that same loop (which the
+    worker runtime takes care of, and closes it on shutdown)."""
+
+    def __init__(self) -> None:
+        self._client: Optional[Client] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def get(self) -> Client:
+        loop = asyncio.get_running_loop()
+        if self._is_usable(loop):
+            assert self._client is not None
+            return self._client
+
+        if self._lock is None or self._loop is not loop:
+            self._lock = asyncio.Lock()
+            self._loop = loop
+            self._client = None
+
+        async with self._lock:
+            if not self._is_usable(loop):
+                # To avoid circular imports, we put this import here
+                # Unfortunately how the tasks are setup, we can't import
+                # Client at the top level
+                from dicebot.core.client import Client
+
+                logging.info("Logging in worker Discord client")
+                self._client = await Client.get_and_login()
+        assert self._client is not None
+        return self._client
+
+    async def close(self) -> None:
+        if self._client is not None and not self._client.is_closed():
+            await self._client.close()
+        self._client = None
+        self._loop = None
+        self._lock = None
+
+    def _is_usable(self, loop: asyncio.AbstractEventLoop) -> bool:
+        return (
+            self._client is not None
+            and self._loop is loop
+            and not self._client.is_closed()
+        )
+
+
+worker_client = WorkerClient()
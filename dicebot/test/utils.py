@@ -10,8 +10,15 @@ from typing import Optional
 from unittest.mock import AsyncMock, create_autospec
 
 import discord
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import BigInteger, Connection, Integer
+from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 
+from dicebot.data.db.base import Base
 from dicebot.data.db.guild import Guild
 from dicebot.data.db.user import User
 from dicebot.data.types.message_context import MessageContext
@@ -24,6 +31,45 @@ class DicebotTestCase(unittest.IsolatedAsyncioTestCase):
         asyncio.get_running_loop().set_debug(False)
 
 
+async def create_tables(conn: AsyncConnection) -> None:
+    """Create all tables, replacing BigInteger with Integer for SQLite compatibility."""
+
+    def _create(connection: Connection) -> None:
+        for table in Base.metadata.sorted_tables:
+            # Replace BigInteger with Integer for SQLite (needed for PK autoincrement)
+            cols_to_fix = [
+                col for col in table.columns if isinstance(col.type, BigInteger)
+            ]
+            original_types = {col.name: col.type for col in cols_to_fix}
+            for col in cols_to_fix:
+                col.type = Integer()
+            try:
+                table.create(connection, checkfirst=True)
+            finally:
+                for col in cols_to_fix:
+                    col.type = original_types[col.name]
+
+    await conn.run_sync(_create)
+
+
+class DatabaseTestCase(unittest.IsolatedAsyncioTestCase):
+    """Each test gets its own in-memory SQLite database with every table in
+    it. self.session is open on it, and self.sessionmaker makes more."""
+
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+        self.engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with self.engine.begin() as conn:
+            await create_tables(conn)
+        self.sessionmaker = async_sessionmaker(self.engine, expire_on_commit=False)
+        self.session = self.sessionmaker()
+
+    async def asyncTearDown(self) -> None:
+        await self.session.close()
+        await self.engine.dispose()
+        await super().asyncTearDown()
+
+
 class TestMessageContext(MessageContext):
     @property
     def channel(self):